@@ -4,36 +4,92 @@ Comprehensive Survey Data Analysis
 Analyzes survey responses from primariata.work and generates actionable insights
 """
 
+import argparse
 import json
 import sys
 from collections import Counter, defaultdict
 from datetime import datetime
-from typing import Dict, List, Any
+from string import Template
+from typing import Dict, List, Any, Optional, Tuple
 import re
 
-def load_survey_data(filepath: str) -> Dict:
-    """Load survey data from JSON file"""
-    with open(filepath, 'r', encoding='utf-8') as f:
-        return json.load(f)
+from survey_batch import GROUP_KEYS, partition_dataset, write_summaries
+from survey_cooccurrence import analyze_cooccurrence
+from survey_metrics import VALIDATION_METRICS, evaluate_metrics, load_metric_definitions, merge_definitions
+from survey_preview import estimate_errors, load_preview
+from survey_sentiment import analyze_sentiment
+from survey_text import matches_any
+from survey_waves import compute_wave_deltas, load_export, load_waves
+from survey_weighting import load_population_margins, rake_weights, weighted_tally
+
+WAVE_SECTIONS = ['demographics', 'citizen_insights', 'official_insights', 'validation_metrics']
+
+def load_survey_data(filepath: str, sample_fraction: Optional[float] = None, seed: int = 42) -> Dict:
+    """Load survey data from JSON file (grouped export or raw DB snapshot), optionally as a stratified preview sample"""
+    if sample_fraction is not None:
+        return load_preview(filepath, sample_fraction, seed)
+    return load_export(filepath)
+
+def _top(distribution: Dict, n: int) -> Dict:
+    """Top-n entries of a distribution (same ordering as Counter.most_common)"""
+    return dict(sorted(distribution.items(), key=lambda x: x[1], reverse=True)[:n])
+
+def _choice_distribution(responses: List[Dict], respondent_ids: set, weights: Optional[Dict[str, float]], first_only: bool = True) -> Dict:
+    """Distribution of answer_choices (first choice or all choices) for the given respondents"""
+    pairs = []
+    for r in responses:
+        if r['respondent_id'] in respondent_ids and r['answer_choices']:
+            choices = r['answer_choices'][:1] if first_only else r['answer_choices']
+            pairs.extend((r['respondent_id'], choice) for choice in choices)
+    return weighted_tally(pairs, weights)
+
+def _rating_summary(responses: List[Dict], respondent_ids: set, weights: Optional[Dict[str, float]]) -> Optional[Dict]:
+    """Average and distribution of answer_rating for the given respondents"""
+    rated = [(r['respondent_id'], r['answer_rating']) for r in responses
+             if r['respondent_id'] in respondent_ids and r['answer_rating'] is not None]
+    if not rated:
+        return None
+    if weights is None:
+        average = sum(rating for _, rating in rated) / len(rated)
+    else:
+        total_weight = sum(weights.get(rid, 1.0) for rid, _ in rated)
+        average = sum(weights.get(rid, 1.0) * rating for rid, rating in rated) / total_weight
+    return {
+        'average': round(average, 2),
+        'distribution': weighted_tally(rated, weights),
+        'total_responses': len(rated)
+    }
+
+def _theme_counts(texts: List[tuple], themes: Dict[str, List[str]], weights: Optional[Dict[str, float]]) -> Dict:
+    """Count (respondent_id, text) pairs matching any keyword of each theme"""
+    counts = {}
+    for theme, keywords in themes.items():
+        matching = [(rid, theme) for rid, text in texts if matches_any(text, keywords)]
+        counts[theme] = weighted_tally(matching, weights).get(theme, 0)
+    return {k: v for k, v in counts.items() if v > 0}
 
-def analyze_demographics(respondents: List[Dict]) -> Dict:
+def analyze_demographics(respondents: List[Dict], weights: Optional[Dict[str, float]] = None) -> Dict:
     """Analyze demographic distribution"""
-    age_dist = Counter(r.get('age_category') for r in respondents if r.get('age_category'))
-    county_dist = Counter(r['county'] for r in respondents)
-    locality_dist = Counter(f"{r['locality']}, {r['county']}" for r in respondents)
-    respondent_type_dist = Counter(r['respondent_type'] for r in respondents)
+    age_dist = weighted_tally(((r['id'], r.get('age_category')) for r in respondents if r.get('age_category')), weights)
+    county_dist = weighted_tally(((r['id'], r['county']) for r in respondents), weights)
+    locality_dist = weighted_tally(((r['id'], f"{r['locality']}, {r['county']}") for r in respondents), weights)
+    respondent_type_dist = weighted_tally(((r['id'], r['respondent_type']) for r in respondents), weights)
+
+    completed = weighted_tally(((r['id'], True) for r in respondents if r['is_completed']), weights).get(True, 0)
+    total_weight = sum(weights.get(r['id'], 1.0) for r in respondents) if weights is not None else len(respondents)
 
     return {
-        'age_distribution': dict(age_dist),
-        'county_distribution': dict(county_dist.most_common(10)),
-        'locality_distribution': dict(locality_dist.most_common(10)),
-        'respondent_type_distribution': dict(respondent_type_dist),
+        'age_distribution': age_dist,
+        'county_distribution': _top(county_dist, 10),
+        'locality_distribution': _top(locality_dist, 10),
+        'unique_localities': len(locality_dist),
+        'respondent_type_distribution': respondent_type_dist,
         'total_respondents': len(respondents),
-        'completed_surveys': sum(1 for r in respondents if r['is_completed']),
-        'completion_rate': f"{(sum(1 for r in respondents if r['is_completed']) / len(respondents) * 100):.1f}%" if respondents else "0%"
+        'completed_surveys': completed,
+        'completion_rate': f"{(completed / total_weight * 100):.1f}%" if respondents else "0%"
     }
 
-def analyze_citizen_responses(responses_by_question: Dict, respondents: List[Dict]) -> Dict:
+def analyze_citizen_responses(responses_by_question: Dict, respondents: List[Dict], weights: Optional[Dict[str, float]] = None) -> Dict:
     """Analyze citizen-specific responses"""
     insights = {}
 
@@ -42,92 +98,66 @@ def analyze_citizen_responses(responses_by_question: Dict, respondents: List[Dic
 
     # Q1: Interaction frequency
     if 'q1_frequency' in responses_by_question:
-        freq_responses = [r for r in responses_by_question['q1_frequency']['responses']
-                         if r['respondent_id'] in citizen_ids and r['answer_choices']]
-        freq_dist = Counter(r['answer_choices'][0] for r in freq_responses if r['answer_choices'])
-        insights['interaction_frequency'] = dict(freq_dist)
+        insights['interaction_frequency'] = _choice_distribution(responses_by_question['q1_frequency']['responses'], citizen_ids, weights)
 
     # Q2: Online platform usage
     if 'q2_online_usage' in responses_by_question:
-        online_responses = [r for r in responses_by_question['q2_online_usage']['responses']
-                           if r['respondent_id'] in citizen_ids and r['answer_choices']]
-        online_dist = Counter(r['answer_choices'][0] for r in online_responses if r['answer_choices'])
-        insights['online_usage'] = dict(online_dist)
+        insights['online_usage'] = _choice_distribution(responses_by_question['q2_online_usage']['responses'], citizen_ids, weights)
 
     # Q3: Problems and pain points (text analysis)
     if 'q3_problems' in responses_by_question:
-        problem_responses = [r['answer_text'] for r in responses_by_question['q3_problems']['responses']
+        problem_responses = [(r['respondent_id'], r['answer_text']) for r in responses_by_question['q3_problems']['responses']
                             if r['respondent_id'] in citizen_ids and r['answer_text']]
-        insights['pain_points'] = problem_responses
+        insights['pain_points'] = [text for _, text in problem_responses]
 
         # Extract common themes
         themes = {
-            'Timpul de așteptare': sum(1 for p in problem_responses if any(k in p.lower() for k in ['așteptare', 'coadă', 'timp', 'aglomera'])),
-            'Program limitat': sum(1 for p in problem_responses if any(k in p.lower() for k in ['program', 'orar', 'disponibil'])),
-            'Birocrație': sum(1 for p in problem_responses if any(k in p.lower() for k in ['birocr', 'formular', 'documente', 'acte'])),
-            'Lipsa digitalizării': sum(1 for p in problem_responses if any(k in p.lower() for k in ['online', 'digital', 'electronic', 'internet'])),
-            'Deplasare fizică': sum(1 for p in problem_responses if any(k in p.lower() for k in ['deplasa', 'distanță', 'drum'])),
-            'Comunicare dificilă': sum(1 for p in problem_responses if any(k in p.lower() for k in ['comunic', 'contact', 'informație', 'răspuns'])),
+            'Timpul de așteptare': ['așteptare', 'coadă', 'timp', 'aglomera'],
+            'Program limitat': ['program', 'orar', 'disponibil'],
+            'Birocrație': ['birocr', 'formular', 'documente', 'acte'],
+            'Lipsa digitalizării': ['online', 'digital', 'electronic', 'internet'],
+            'Deplasare fizică': ['deplasa', 'distanță', 'drum'],
+            'Comunicare dificilă': ['comunic', 'contact', 'informație', 'răspuns'],
         }
-        insights['pain_point_themes'] = {k: v for k, v in themes.items() if v > 0}
+        insights['pain_point_themes'] = _theme_counts(problem_responses, themes, weights)
 
     # Q4: Desired features
     if 'q4_features' in responses_by_question:
-        feature_responses = [r for r in responses_by_question['q4_features']['responses']
-                            if r['respondent_id'] in citizen_ids and r['answer_choices']]
-        all_features = []
-        for r in feature_responses:
-            if r['answer_choices']:
-                all_features.extend(r['answer_choices'])
-        feature_dist = Counter(all_features)
-        insights['desired_features'] = dict(feature_dist)
+        insights['desired_features'] = _choice_distribution(responses_by_question['q4_features']['responses'], citizen_ids, weights, first_only=False)
 
     # Q7: Identity verification willingness
     if 'q7_identity' in responses_by_question:
-        identity_responses = [r for r in responses_by_question['q7_identity']['responses']
-                             if r['respondent_id'] in citizen_ids and r['answer_choices']]
-        identity_dist = Counter(r['answer_choices'][0] for r in identity_responses if r['answer_choices'])
-        insights['identity_verification_willingness'] = dict(identity_dist)
+        insights['identity_verification_willingness'] = _choice_distribution(responses_by_question['q7_identity']['responses'], citizen_ids, weights)
 
     # Q8: Usefulness rating
     if 'q8_usefulness' in responses_by_question:
-        rating_responses = [r['answer_rating'] for r in responses_by_question['q8_usefulness']['responses']
-                           if r['respondent_id'] in citizen_ids and r['answer_rating'] is not None]
-        if rating_responses:
-            avg_rating = sum(rating_responses) / len(rating_responses)
-            rating_dist = Counter(rating_responses)
-            insights['usefulness_rating'] = {
-                'average': round(avg_rating, 2),
-                'distribution': dict(rating_dist),
-                'total_responses': len(rating_responses)
-            }
+        usefulness = _rating_summary(responses_by_question['q8_usefulness']['responses'], citizen_ids, weights)
+        if usefulness:
+            insights['usefulness_rating'] = usefulness
 
     # Q9: Recommendation
     if 'q9_recommend' in responses_by_question:
-        recommend_responses = [r for r in responses_by_question['q9_recommend']['responses']
-                              if r['respondent_id'] in citizen_ids and r['answer_choices']]
-        recommend_dist = Counter(r['answer_choices'][0] for r in recommend_responses if r['answer_choices'])
-        insights['recommendation'] = dict(recommend_dist)
+        insights['recommendation'] = _choice_distribution(responses_by_question['q9_recommend']['responses'], citizen_ids, weights)
 
     # Q10: Suggestions (text analysis)
     if 'q10_suggestions' in responses_by_question:
-        suggestion_responses = [r['answer_text'] for r in responses_by_question['q10_suggestions']['responses']
+        suggestion_responses = [(r['respondent_id'], r['answer_text']) for r in responses_by_question['q10_suggestions']['responses']
                                if r['respondent_id'] in citizen_ids and r['answer_text']]
-        insights['suggestions'] = suggestion_responses
+        insights['suggestions'] = [text for _, text in suggestion_responses]
 
         # Extract common feature requests
         feature_requests = {
-            'Notificări': sum(1 for s in suggestion_responses if 'notific' in s.lower()),
-            'Aplicație mobilă': sum(1 for s in suggestion_responses if any(k in s.lower() for k in ['aplicație', 'mobil', 'app'])),
-            'Plăți online': sum(1 for s in suggestion_responses if any(k in s.lower() for k in ['plat', 'ghise', 'taxa'])),
-            'Chat/Mesagerie': sum(1 for s in suggestion_responses if any(k in s.lower() for k in ['chat', 'mesaj', 'comunicare'])),
-            'Programare online': sum(1 for s in suggestion_responses if any(k in s.lower() for k in ['program', 'întâlnire', 'agenda'])),
+            'Notificări': ['notific'],
+            'Aplicație mobilă': ['aplicație', 'mobil', 'app'],
+            'Plăți online': ['plat', 'ghise', 'taxa'],
+            'Chat/Mesagerie': ['chat', 'mesaj', 'comunicare'],
+            'Programare online': ['program', 'întâlnire', 'agenda'],
         }
-        insights['feature_requests'] = {k: v for k, v in feature_requests.items() if v > 0}
+        insights['feature_requests'] = _theme_counts(suggestion_responses, feature_requests, weights)
 
     return insights
 
-def analyze_official_responses(responses_by_question: Dict, respondents: List[Dict]) -> Dict:
+def analyze_official_responses(responses_by_question: Dict, respondents: List[Dict], weights: Optional[Dict[str, float]] = None) -> Dict:
     """Analyze official-specific responses"""
     insights = {}
 
@@ -142,10 +172,7 @@ def analyze_official_responses(responses_by_question: Dict, respondents: List[Di
 
     # Q2: Citizen interaction frequency
     if 'q2_citizen_interaction' in responses_by_question:
-        interaction_responses = [r for r in responses_by_question['q2_citizen_interaction']['responses']
-                                if r['respondent_id'] in official_ids and r['answer_choices']]
-        interaction_dist = Counter(r['answer_choices'][0] for r in interaction_responses if r['answer_choices'])
-        insights['citizen_interaction_frequency'] = dict(interaction_dist)
+        insights['citizen_interaction_frequency'] = _choice_distribution(responses_by_question['q2_citizen_interaction']['responses'], official_ids, weights)
 
     # Q3: Time-consuming tasks
     if 'q3_time_consuming' in responses_by_question:
@@ -161,149 +188,78 @@ def analyze_official_responses(responses_by_question: Dict, respondents: List[Di
 
     # Q5: IT system usage
     if 'q5_it_usage' in responses_by_question:
-        it_responses = [r for r in responses_by_question['q5_it_usage']['responses']
-                       if r['respondent_id'] in official_ids and r['answer_choices']]
-        it_dist = Counter(r['answer_choices'][0] for r in it_responses if r['answer_choices'])
-        insights['it_system_usage'] = dict(it_dist)
+        insights['it_system_usage'] = _choice_distribution(responses_by_question['q5_it_usage']['responses'], official_ids, weights)
 
     # Q7: Digitalization improvement belief
     if 'q7_digitalization_improvement' in responses_by_question:
-        improvement_responses = [r for r in responses_by_question['q7_digitalization_improvement']['responses']
-                                if r['respondent_id'] in official_ids and r['answer_choices']]
-        improvement_dist = Counter(r['answer_choices'][0] for r in improvement_responses if r['answer_choices'])
-        insights['digitalization_improvement_belief'] = dict(improvement_dist)
+        insights['digitalization_improvement_belief'] = _choice_distribution(responses_by_question['q7_digitalization_improvement']['responses'], official_ids, weights)
 
     # Q8: Useful features for officials
     if 'q8_useful_features' in responses_by_question:
-        feature_responses = [r for r in responses_by_question['q8_useful_features']['responses']
-                            if r['respondent_id'] in official_ids and r['answer_choices']]
-        all_features = []
-        for r in feature_responses:
-            if r['answer_choices']:
-                all_features.extend(r['answer_choices'])
-        feature_dist = Counter(all_features)
-        insights['desired_features'] = dict(feature_dist)
+        insights['desired_features'] = _choice_distribution(responses_by_question['q8_useful_features']['responses'], official_ids, weights, first_only=False)
 
     # Q9: Concerns
     if 'q9_concerns' in responses_by_question:
-        concerns_responses = [r for r in responses_by_question['q9_concerns']['responses']
-                             if r['respondent_id'] in official_ids and r['answer_choices']]
-        all_concerns = []
-        for r in concerns_responses:
-            if r['answer_choices']:
-                all_concerns.extend(r['answer_choices'])
-        concerns_dist = Counter(all_concerns)
-        insights['concerns'] = dict(concerns_dist)
+        insights['concerns'] = _choice_distribution(responses_by_question['q9_concerns']['responses'], official_ids, weights, first_only=False)
 
     # Q10: Readiness rating
     if 'q10_readiness' in responses_by_question:
-        readiness_responses = [r['answer_rating'] for r in responses_by_question['q10_readiness']['responses']
-                              if r['respondent_id'] in official_ids and r['answer_rating'] is not None]
-        if readiness_responses:
-            avg_readiness = sum(readiness_responses) / len(readiness_responses)
-            readiness_dist = Counter(readiness_responses)
-            insights['readiness_rating'] = {
-                'average': round(avg_readiness, 2),
-                'distribution': dict(readiness_dist),
-                'total_responses': len(readiness_responses)
-            }
+        readiness = _rating_summary(responses_by_question['q10_readiness']['responses'], official_ids, weights)
+        if readiness:
+            insights['readiness_rating'] = readiness
 
     return insights
 
-def calculate_market_validation_metrics(data: Dict, demographics: Dict, citizen_insights: Dict, official_insights: Dict) -> Dict:
-    """Calculate key market validation metrics"""
+def calculate_market_validation_metrics(data: Dict, demographics: Dict, weights: Optional[Dict[str, float]] = None,
+                                        definitions: Optional[List[Dict]] = None) -> Dict:
+    """Calculate key market validation metrics (declared in survey_metrics.VALIDATION_METRICS)"""
 
     total_respondents = demographics['total_respondents']
-    citizen_count = demographics['respondent_type_distribution'].get('citizen', 0)
-    official_count = demographics['respondent_type_distribution'].get('official', 0)
-
-    # Digital adoption willingness (Q2 online usage)
-    online_usage = citizen_insights.get('online_usage', {})
-    digital_adopters = online_usage.get('Da, frecvent', 0) + online_usage.get('Da, uneori', 0)
-    digital_adoption_rate = (digital_adopters / citizen_count * 100) if citizen_count > 0 else 0
-
-    # Platform usefulness rating
-    usefulness = citizen_insights.get('usefulness_rating', {})
-    avg_usefulness = usefulness.get('average', 0)
-    high_satisfaction = sum(v for k, v in usefulness.get('distribution', {}).items() if k >= 4)
-    satisfaction_rate = (high_satisfaction / usefulness.get('total_responses', 1) * 100) if usefulness.get('total_responses') else 0
-
-    # Recommendation rate
-    recommendations = citizen_insights.get('recommendation', {})
-    yes_recommendations = recommendations.get('Da', 0)
-    recommendation_rate = (yes_recommendations / citizen_count * 100) if citizen_count > 0 else 0
-
-    # Official readiness
-    official_readiness = official_insights.get('readiness_rating', {})
-    avg_official_readiness = official_readiness.get('average', 0)
-
-    # Identity verification willingness
-    identity_willingness = citizen_insights.get('identity_verification_willingness', {})
-    willing_identity = identity_willingness.get('Da, dacă este securizată', 0) + identity_willingness.get('Da, fără probleme', 0)
-    identity_acceptance_rate = (willing_identity / citizen_count * 100) if citizen_count > 0 else 0
+    metrics = evaluate_metrics(data, definitions or VALIDATION_METRICS, weights)
+    # Headcounts stay raw integers; weighted estimates are only reported as rates and scores
+    respondent_types = Counter(r['respondent_type'] for r in data['respondents'])
+    citizen_respondents = respondent_types.get('citizen', 0)
+    official_respondents = respondent_types.get('official', 0)
 
     return {
         'total_respondents': total_respondents,
-        'citizen_count': citizen_count,
-        'official_count': official_count,
-        'digital_adoption_rate': round(digital_adoption_rate, 1),
-        'platform_usefulness_score': avg_usefulness,
-        'satisfaction_rate': round(satisfaction_rate, 1),
-        'recommendation_rate': round(recommendation_rate, 1),
-        'official_readiness_score': avg_official_readiness,
-        'identity_acceptance_rate': round(identity_acceptance_rate, 1),
+        **metrics,
+        'citizen_respondents': citizen_respondents,
+        'official_respondents': official_respondents,
         'sample_adequacy': 'Sufficient (>15 required)' if total_respondents >= 15 else 'Insufficient (<15)',
-        'citizen_official_ratio': f"{citizen_count}:{official_count}",
+        'citizen_official_ratio': f"{citizen_respondents}:{official_respondents}",
     }
 
-def generate_executive_summary(validation_metrics: Dict, citizen_insights: Dict, official_insights: Dict) -> str:
-    """Generate executive summary"""
-    summary = f"""
-# EXECUTIVE SUMMARY - Survey Analysis primariata.work
+EXECUTIVE_SUMMARY_TEMPLATE = Template("""
+# EXECUTIVE SUMMARY - Survey Analysis primariata.work$scope_title
 
 ## Response Overview
-- **Total Responses**: {validation_metrics['total_respondents']} (25 citizens, 3 officials)
-- **Completion Rate**: 100%
-- **Sample Adequacy**: {validation_metrics['sample_adequacy']}
-- **Geographic Coverage**: {len(citizen_insights.get('localities', []))} unique localities
+- **Total Responses**: $total_respondents ($citizen_respondents citizens, $official_respondents officials)
+- **Completion Rate**: $completion_rate
+- **Sample Adequacy**: $sample_adequacy
+- **Geographic Coverage**: $unique_localities unique localities
 
 ## Key Findings
 
 ### 1. Strong Market Validation ✅
-- **Digital Adoption**: {validation_metrics['digital_adoption_rate']}% of citizens already use online services
-- **Platform Usefulness**: {validation_metrics['platform_usefulness_score']}/5 average rating
-- **Satisfaction**: {validation_metrics['satisfaction_rate']}% rate platform as highly useful (4-5 stars)
-- **Recommendation**: {validation_metrics['recommendation_rate']}% would recommend to others
+- **Digital Adoption**: $digital_adoption_rate% of citizens already use online services
+- **Platform Usefulness**: $platform_usefulness_score/5 average rating
+- **Satisfaction**: $satisfaction_rate% rate platform as highly useful (4-5 stars)
+- **Recommendation**: $recommendation_rate% would recommend to others
 
 ### 2. Critical Pain Points Identified
 Top citizen pain points:
-"""
-
-    # Add pain point themes
-    pain_themes = citizen_insights.get('pain_point_themes', {})
-    sorted_themes = sorted(pain_themes.items(), key=lambda x: x[1], reverse=True)
-    for theme, count in sorted_themes[:5]:
-        summary += f"- **{theme}**: {count} mentions\n"
-
-    summary += f"""
+$pain_points
 ### 3. Feature Prioritization
 Most requested citizen features:
-"""
-
-    # Add desired features
-    desired_features = citizen_insights.get('desired_features', {})
-    sorted_features = sorted(desired_features.items(), key=lambda x: x[1], reverse=True)
-    for feature, count in sorted_features[:5]:
-        summary += f"- **{feature}**: {count} requests\n"
-
-    summary += f"""
+$desired_features
 ### 4. Official Readiness
-- **Readiness Score**: {validation_metrics['official_readiness_score']}/5
-- **Digitalization Belief**: {list(official_insights.get('digitalization_improvement_belief', {}).keys())[0] if official_insights.get('digitalization_improvement_belief') else 'N/A'}
-- **IT System Usage**: {list(official_insights.get('it_system_usage', {}).keys())[0] if official_insights.get('it_system_usage') else 'N/A'}
+- **Readiness Score**: $official_readiness_score/5
+- **Digitalization Belief**: $digitalization_belief
+- **IT System Usage**: $it_system_usage
 
 ### 5. Security & Trust
-- **Identity Verification Acceptance**: {validation_metrics['identity_acceptance_rate']}% willing if secure
+- **Identity Verification Acceptance**: $identity_acceptance_rate% willing if secure
 - **Main Concerns**: Security, data protection, learning curve
 
 ## Strategic Recommendations
@@ -327,9 +283,9 @@ Most requested citizen features:
 
 **Cross-reference with RAPORT_CERCETARE_PIATA_2025-11-11.md findings:**
 
-✅ **Confirms**: Low digital adoption (16% national average) → Our sample shows higher adoption ({validation_metrics['digital_adoption_rate']}%), indicating early adopter segment
+✅ **Confirms**: Low digital adoption (16% national average) → Our sample shows higher adoption ($digital_adoption_rate%), indicating early adopter segment
 ✅ **Confirms**: Time/bureaucracy pain points align with national trends
-✅ **Confirms**: High satisfaction ({validation_metrics['satisfaction_rate']}%) validates product-market fit hypothesis
+✅ **Confirms**: High satisfaction ($satisfaction_rate%) validates product-market fit hypothesis
 ✅ **Confirms**: Security concerns match national privacy sensitivity patterns
 
 ⚠️ **Consideration**: Sample skewed toward digitally-savvy citizens (higher online usage than national average)
@@ -340,71 +296,257 @@ Most requested citizen features:
 **Confidence Level**: 88% (up from 85% in initial validation report)
 
 **Rationale**:
-1. Strong satisfaction scores (avg {validation_metrics['platform_usefulness_score']}/5)
-2. High recommendation rate ({validation_metrics['recommendation_rate']}%)
+1. Strong satisfaction scores (avg $platform_usefulness_score/5)
+2. High recommendation rate ($recommendation_rate%)
 3. Clear feature prioritization from real users
-4. Official buy-in demonstrated (avg readiness {validation_metrics['official_readiness_score']}/5)
+4. Official buy-in demonstrated (avg readiness $official_readiness_score/5)
 5. Pain points align with solution capabilities
 
 **Next Steps**:
 1. Develop MVP with top 3 prioritized features
 2. Recruit 2-3 pilot municipalities from respondent localities
-3. Beta testing with survey respondents (25 citizens ready for early access)
+3. Beta testing with survey respondents ($citizen_respondents citizens ready for early access)
 4. Iterate based on pilot feedback before broader launch
-"""
-
-    return summary
-
-def main():
-    print("🔬 Starting comprehensive survey analysis...\n")
-
-    # Load data
-    data = load_survey_data('/tmp/survey-full-data.json')
+""")
+
+def _format_count(value) -> str:
+    """Counts are floats once weighting is applied; print them without a trailing .0"""
+    return f"{value:.2f}".rstrip('0').rstrip('.') if isinstance(value, float) else str(value)
+
+def _estimated_count(value, unit: str) -> str:
+    """A count for prose: weighted (float) counts become whole estimates labelled as weighted"""
+    return f"~{round(value):,} weighted {unit}" if isinstance(value, float) else f"{value:,} {unit}"
+
+def _top_list(distribution: Dict, unit: str, n: int = 5) -> str:
+    """Markdown bullet list of the n largest entries of a distribution"""
+    return "".join(f"- **{k}**: {_estimated_count(v, unit)}\n" for k, v in _top(distribution, n).items())
+
+def generate_executive_summary(validation_metrics: Dict, citizen_insights: Dict, official_insights: Dict,
+                               demographics: Optional[Dict] = None, scope: Optional[str] = None) -> str:
+    """Generate executive summary (national, or for a single county/locality when scope is given)"""
+    demographics = demographics or {}
+    digitalization_belief = official_insights.get('digitalization_improvement_belief')
+    it_system_usage = official_insights.get('it_system_usage')
+
+    return EXECUTIVE_SUMMARY_TEMPLATE.substitute(
+        validation_metrics,
+        scope_title=f" — {scope}" if scope else "",
+        completion_rate=demographics.get('completion_rate', 'N/A'),
+        unique_localities=demographics.get('unique_localities', 0),
+        pain_points=_top_list(citizen_insights.get('pain_point_themes', {}), 'mentions'),
+        desired_features=_top_list(citizen_insights.get('desired_features', {}), 'requests'),
+        digitalization_belief=next(iter(digitalization_belief)) if digitalization_belief else 'N/A',
+        it_system_usage=next(iter(it_system_usage)) if it_system_usage else 'N/A',
+    )
+
+def respondent_weights(data: Dict, margins: Optional[Dict[str, Dict[str, float]]] = None,
+                       log=lambda *args: None) -> Tuple[Optional[Dict[str, float]], Optional[Dict]]:
+    """Preview design weights (if any), raked against the population margins when given"""
+    weights = data.get('design_weights')
+    weighting_summary = None
+    if margins:
+        log("⚖️ Raking weights against population margins...")
+        weights, weighting_summary = rake_weights(data['respondents'], margins, base_weights=weights)
+        for dimension, missing in weighting_summary['missing_by_dimension'].items():
+            if missing:
+                log(f"  ⚠️ {missing} respondents without a known {dimension} are not raked on it")
+    return weights, weighting_summary
+
+def analyze_dataset(data: Dict, margins: Optional[Dict[str, Dict[str, float]]] = None, verbose: bool = True,
+                    metric_definitions: Optional[List[Dict]] = None,
+                    weighting: Optional[Tuple[Optional[Dict[str, float]], Optional[Dict]]] = None) -> Dict:
+    """
+    Run every analysis stage over one dataset and return the report sections.
+    `weighting` is a precomputed (weights, summary) pair from respondent_weights, e.g. the national
+    weights restricted to one group; without it the dataset is weighted against `margins` here.
+    """
+    log = print if verbose else (lambda *args: None)
+
+    # Post-stratification weights
+    weights, weighting_summary = weighting if weighting is not None else respondent_weights(data, margins, log)
 
     # Analyze demographics
-    print("📊 Analyzing demographics...")
-    demographics = analyze_demographics(data['respondents'])
+    log("📊 Analyzing demographics...")
+    demographics = analyze_demographics(data['respondents'], weights)
 
     # Analyze citizen responses
-    print("👥 Analyzing citizen responses...")
-    citizen_insights = analyze_citizen_responses(data['responses_by_question'], data['respondents'])
+    log("👥 Analyzing citizen responses...")
+    citizen_insights = analyze_citizen_responses(data['responses_by_question'], data['respondents'], weights)
 
     # Analyze official responses
-    print("🏛️ Analyzing official responses...")
-    official_insights = analyze_official_responses(data['responses_by_question'], data['respondents'])
+    log("🏛️ Analyzing official responses...")
+    official_insights = analyze_official_responses(data['responses_by_question'], data['respondents'], weights)
 
     # Calculate market validation metrics
-    print("📈 Calculating market validation metrics...")
-    validation_metrics = calculate_market_validation_metrics(data, demographics, citizen_insights, official_insights)
+    log("📈 Calculating market validation metrics...")
+    validation_metrics = calculate_market_validation_metrics(data, demographics, weights, metric_definitions)
 
-    # Generate executive summary
-    print("📄 Generating executive summary...\n")
-    executive_summary = generate_executive_summary(validation_metrics, citizen_insights, official_insights)
+    # Multiple-choice co-occurrence
+    log("🔗 Computing choice co-occurrence...")
+    choice_cooccurrence = analyze_cooccurrence(data['responses_by_question'], data['respondents'], weights=weights)
 
-    # Compile full analysis report
-    full_report = {
-        'executive_summary': executive_summary,
+    # Free-text sentiment (reuses the theme matcher's normalized texts)
+    log("💬 Scoring free-text sentiment...")
+    sentiment = analyze_sentiment(data['responses_by_question'], data['respondents'], weights)
+
+    return {
         'demographics': demographics,
         'citizen_insights': citizen_insights,
         'official_insights': official_insights,
         'validation_metrics': validation_metrics,
+        'choice_cooccurrence': choice_cooccurrence,
+        'sentiment': sentiment,
+        'weighting': weighting_summary,
+    }
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description='Comprehensive survey analysis for primariata.work')
+    parser.add_argument('inputs', nargs='*', default=['/tmp/survey-full-data.json'],
+                        help='Survey export JSON(s) or DB snapshots; several inputs run a wave comparison (default: /tmp/survey-full-data.json)')
+    parser.add_argument('--output', default='/tmp/survey-analysis-report.json',
+                        help='Report JSON path (default: /tmp/survey-analysis-report.json)')
+    parser.add_argument('--margins', help='Population margins CSV (dimension,category,population) for raking weights')
+    parser.add_argument('--metrics', help='JSON list of extra validation metric definitions (see survey_metrics.py)')
+    parser.add_argument('--wave-labels', help='Comma-separated wave labels, one per input (default: file names)')
+    parser.add_argument('--preview', type=float, metavar='FRACTION',
+                        help='Analyze a stratified sample (county x respondent_type) of this fraction and report error margins')
+    parser.add_argument('--seed', type=int, default=42, help='Preview sample seed (default: 42)')
+    parser.add_argument('--summaries-dir', help='Also write one executive summary per group into this directory')
+    parser.add_argument('--group-by', choices=sorted(GROUP_KEYS), default='county',
+                        help='Grouping for --summaries-dir (default: county)')
+    parser.add_argument('--pdf', metavar='PATH', help='Also render the report (with charts) to this PDF in the same process')
+    return parser.parse_args(argv)
+
+def run_wave_comparison(args: argparse.Namespace, margins: Optional[Dict], metric_definitions: List[Dict]) -> Dict:
+    """Analyze several survey waves and compute wave-over-wave deltas"""
+    labels = args.wave_labels.split(',') if args.wave_labels else None
+    print(f"🌊 Loading {len(args.inputs)} survey waves...")
+    data = load_waves(args.inputs, labels)
+    for label, wave in data['metadata']['waves'].items():
+        if wave['repeat_respondents']:
+            print(f"  🔁 {label}: {wave['repeat_respondents']} respondents already seen in an earlier wave")
+
+    wave_reports = {}
+    for label, wave_data in data['waves'].items():
+        print(f"\n🌊 Wave {label} ({wave_data['metadata']['total_respondents']} respondents)")
+        wave_reports[label] = analyze_dataset(wave_data, margins, metric_definitions=metric_definitions)
+
+    print("\n🔀 Computing wave-over-wave deltas...")
+    return {
+        'waves': wave_reports,
+        'wave_deltas': compute_wave_deltas(wave_reports, WAVE_SECTIONS),
         'analysis_metadata': {
             'analysis_date': datetime.now().isoformat(),
             'data_fetched_at': data['metadata']['fetched_at'],
             'total_respondents_analyzed': data['metadata']['total_respondents'],
             'total_responses_analyzed': data['metadata']['total_responses'],
+            'waves': data['metadata']['waves'],
         }
     }
 
-    # Print executive summary
-    print(executive_summary)
+def run_group_summaries(data: Dict, weights: Optional[Dict[str, float]], group_by: str, output_dir: str,
+                        metric_definitions: List[Dict]) -> Dict:
+    """
+    Analyze every county/locality from one partitioning pass and write their executive summaries.
+    Groups are partitions of the already weighted national dataset: each keeps its respondents'
+    national weights (a single county re-raked on national margins would be meaningless).
+    """
+    print(f"\n🗺️ Grouping respondents by {group_by}...")
+    groups = {}
+    for group, group_data in sorted(partition_dataset(data, GROUP_KEYS[group_by]).items()):
+        group_weights = {r['id']: weights[r['id']] for r in group_data['respondents']} if weights is not None else None
+        groups[group] = analyze_dataset(group_data, verbose=False, metric_definitions=metric_definitions,
+                                        weighting=(group_weights, None))
+
+    summaries = {
+        group: (lambda s=sections, g=group: generate_executive_summary(
+            s['validation_metrics'], s['citizen_insights'], s['official_insights'], s['demographics'], scope=g))
+        for group, sections in groups.items()
+    }
+    written = write_summaries(summaries, output_dir)
+    print(f"📝 {len(written)} {group_by} summaries written to: {output_dir}")
+    return groups
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    if args.preview is not None and len(args.inputs) > 1:
+        sys.exit("❌ --preview works on a single export, not on a wave comparison")
+    if args.pdf and len(args.inputs) > 1:
+        sys.exit("❌ --pdf works on a single export, not on a wave comparison")
+    print("🔬 Starting comprehensive survey analysis...\n")
+
+    margins = load_population_margins(args.margins) if args.margins else None
+    try:
+        metric_definitions = merge_definitions(VALIDATION_METRICS, load_metric_definitions(args.metrics) if args.metrics else [])
+    except ValueError as e:
+        sys.exit(f"❌ {e}")
+
+    if len(args.inputs) > 1:
+        full_report = run_wave_comparison(args, margins, metric_definitions)
+        for transition, deltas in full_report['wave_deltas'].items():
+            print(f"  {transition}: " + ", ".join(f"{k} {v:+}" for k, v in deltas['validation_metrics'].items() if isinstance(v, (int, float))))
+    else:
+        # Load data
+        data = load_survey_data(args.inputs[0], args.preview, args.seed)
+        if args.preview is not None:
+            sampling = data['metadata']['sampling']
+            print(f"🔎 Preview mode: {sampling['sampled_respondents']}/{sampling['population_respondents']} respondents "
+                  f"({sampling['strata']} strata, seed {sampling['seed']})")
+        weighting = respondent_weights(data, margins, print)
+        sections = analyze_dataset(data, metric_definitions=metric_definitions, weighting=weighting)
+
+        # Generate executive summary
+        print("📄 Generating executive summary...\n")
+        executive_summary = generate_executive_summary(sections['validation_metrics'], sections['citizen_insights'],
+                                                       sections['official_insights'], sections['demographics'])
+
+        # Compile full analysis report
+        full_report = {
+            'executive_summary': executive_summary,
+            'demographics': sections['demographics'],
+            'citizen_insights': sections['citizen_insights'],
+            'official_insights': sections['official_insights'],
+            'validation_metrics': sections['validation_metrics'],
+            'choice_cooccurrence': sections['choice_cooccurrence'],
+            'sentiment': sections['sentiment'],
+            'analysis_metadata': {
+                'analysis_date': datetime.now().isoformat(),
+                'data_fetched_at': data['metadata']['fetched_at'],
+                'total_respondents_analyzed': data['metadata']['total_respondents'],
+                'total_responses_analyzed': data['metadata']['total_responses'],
+                'weighting': sections['weighting'],
+            }
+        }
+
+        if args.preview is not None:
+            full_report['preview'] = {
+                'sampling': data['metadata']['sampling'],
+                'error_estimates': estimate_errors(sections, data, weighting[0]),
+            }
+            for name, estimate in full_report['preview']['error_estimates']['validation_metrics'].items():
+                margin = f"±{estimate['margin_pp']} pp" if 'margin_pp' in estimate else f"±{estimate['margin']}"
+                print(f"  🎯 {name}: {estimate['value']} {margin} (n={_format_count(estimate['n'])})")
+
+        if args.summaries_dir:
+            full_report['groups'] = {'group_by': args.group_by,
+                                     'sections': run_group_summaries(data, weighting[0], args.group_by, args.summaries_dir, metric_definitions)}
+
+        # Print executive summary
+        print(executive_summary)
 
     # Save full report
-    output_file = '/tmp/survey-analysis-report.json'
+    output_file = args.output
     with open(output_file, 'w', encoding='utf-8') as f:
         json.dump(full_report, f, ensure_ascii=False, indent=2)
 
     print(f"\n✅ Full analysis saved to: {output_file}")
+
+    if args.pdf:
+        # Imported on demand: the PDF stage needs markdown + WeasyPrint, the analysis does not
+        from survey_report_pdf import write_report_pdf
+        print("📄 Rendering report PDF...")
+        print(f"✅ PDF saved to: {write_report_pdf(full_report, args.pdf)}")
+
     print("\n" + "="*80)
     print("ANALYSIS COMPLETE")
     print("="*80)
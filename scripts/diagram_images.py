@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Optimizarea PNG-urilor Mermaid înainte de a fi incluse în PDF
+Folosit de mermaid_markdown.py (MermaidExtension) și pdf_build.py
+
+mmdc produce imagini la 1px CSS = 1 pixel, iar CSS-ul le micșorează (ex.
+max-width: 70% pentru .diagram-small), deci PDF-ul ar conține mult mai mulți
+pixeli decât se tipăresc. Pentru fiecare diagramă:
+    - lățimea fizică afișată = min(lățimea imaginii, procentul clasei × lățimea
+      zonei de conținut a paginii, citită din @page size/margin)
+    - imaginea este redimensionată la DIAGRAM_DPI pentru lățimea respectivă
+      (doar micșorată, niciodată mărită)
+    - cuantizare la o paletă de DIAGRAM_PNG_COLORS culori (diagramele au câteva
+      culori plate, deci fără dithering)
+    - recompresie PNG fără pierderi (optimize); dacă rezultatul nu e mai mic,
+      rămâne imaginea originală
+Imaginile identice (același hash) devin un singur fișier, deci un singur URL
+diagram: și o singură imagine în PDF. Rezultatele sunt păstrate într-un cache
+pe disc, lângă cache-ul de randare (același director privat per utilizator,
+0700, cu sufixul -optimized; vezi RenderCache.usable).
+
+Layout-ul nu se schimbă: <img> primește lățimea originală (style width), iar
+max-width din CSS o limitează exact ca înainte.
+
+Variabile de mediu:
+    DIAGRAM_DPI         rezoluția țintă la tipar (implicit 200; 0 = fără optimizare)
+    DIAGRAM_PNG_COLORS  culori în paletă (implicit 256; 0 = fără cuantizare)
+
+Dependență opțională: pip install pillow (fără Pillow imaginile rămân neschimbate)
+"""
+
+import hashlib
+import json
+import os
+import re
+import shutil
+from pathlib import Path
+
+from mermaid_render import CACHE_DIR, RenderCache
+
+DIAGRAM_DPI = int(os.environ.get('DIAGRAM_DPI', 200))
+DIAGRAM_PNG_COLORS = int(os.environ.get('DIAGRAM_PNG_COLORS', 256))
+CSS_PX_PER_INCH = 96
+
+# max-width din pdf_styles/*.css pentru .diagram-large/medium/small img
+SIZE_CLASS_WIDTH = {'large': 1.0, 'medium': 0.95, 'small': 0.70}
+
+PAGE_SIZES_MM = {'A3': (297, 420), 'A4': (210, 297), 'A5': (148, 210), 'LETTER': (215.9, 279.4),
+                 'LEGAL': (215.9, 355.6)}
+UNIT_TO_PX = {'px': 1, 'pt': 4 / 3, 'pc': 16, 'in': 96, 'cm': 96 / 2.54, 'mm': 96 / 25.4}
+PAGE_RULE_PATTERN = re.compile(r'@page\s*\{([^{}]*)', re.DOTALL)
+LENGTH_PATTERN = re.compile(r'(-?[\d.]+)(px|pt|pc|in|cm|mm)?')
+
+# Zona de conținut A4 cu margini de 2cm, dacă stylesheet-ul nu are @page
+DEFAULT_CONTENT_WIDTH = (210 - 40) / 25.4 * CSS_PX_PER_INCH
+
+# Lângă cache-ul de randare, deci tot per utilizator; RenderCache verifică la rândul lui că directorul e privat
+optimized_cache = RenderCache(CACHE_DIR.parent / f'{CACHE_DIR.name}-optimized')
+_pillow_warning_shown = False
+
+def _length_px(value):
+    match = LENGTH_PATTERN.fullmatch(value)
+    if not match:
+        return None
+    return float(match.group(1)) * UNIT_TO_PX[match.group(2) or 'px']
+
+def page_content_width(css_text):
+    """Lățimea zonei de conținut (px CSS) din ultimele declarații @page size / margin; None dacă lipsesc"""
+    width, margins = None, None
+    for rule in PAGE_RULE_PATTERN.findall(css_text):
+        size = re.search(r'(?<![-\w])size\s*:\s*([^;]+)', rule)
+        if size:
+            values = size.group(1).split()
+            named = [v.upper() for v in values if v.upper() in PAGE_SIZES_MM]
+            lengths = [_length_px(v) for v in values if _length_px(v) is not None]
+            if named:
+                width_mm, height_mm = PAGE_SIZES_MM[named[0]]
+                width = (height_mm if 'landscape' in values else width_mm) / 25.4 * CSS_PX_PER_INCH
+            elif lengths:
+                width = lengths[0]
+        margin = re.search(r'(?<![-\w])margin\s*:\s*([^;]+)', rule)
+        if margin:
+            values = [_length_px(v) for v in margin.group(1).split()]
+            if None not in values and 1 <= len(values) <= 4:
+                # Ordinea CSS: sus, dreapta, jos, stânga
+                right = values[1] if len(values) > 1 else values[0]
+                left = values[3] if len(values) == 4 else right
+                margins = left + right
+    if width is None and margins is None:
+        return None
+    return (width or PAGE_SIZES_MM['A4'][0] / 25.4 * CSS_PX_PER_INCH) - (margins or 0)
+
+def stylesheets_content_width(paths):
+    """Lățimea zonei de conținut pentru o listă de fișiere CSS (ultimul @page câștigă)"""
+    content_width = None
+    for path in paths:
+        content_width = page_content_width(Path(path).read_text(encoding='utf-8')) or content_width
+    return content_width or DEFAULT_CONTENT_WIDTH
+
+def target_pixel_width(image_width, size, content_width=DEFAULT_CONTENT_WIDTH, dpi=DIAGRAM_DPI):
+    """Lățimea în pixeli necesară pentru dpi la dimensiunea afișată în PDF (niciodată peste original)"""
+    display_px = min(image_width, SIZE_CLASS_WIDTH.get(size, 1.0) * content_width)
+    return min(image_width, max(1, round(display_px / CSS_PX_PER_INCH * dpi)))
+
+def _load_pillow():
+    global _pillow_warning_shown
+    try:
+        from PIL import Image
+    except ImportError:
+        if not _pillow_warning_shown:
+            print("⚠️ Pillow nu este instalat, diagramele PNG nu sunt optimizate (pip install pillow)")
+            _pillow_warning_shown = True
+        return None
+    return Image
+
+def _optimize(source_path, output_path, size, content_width, dpi, colors):
+    Image = _load_pillow()
+    with Image.open(source_path) as image:
+        image.load()
+        image = image.convert('RGBA')
+    width = target_pixel_width(image.width, size, content_width, dpi)
+    if width < image.width:
+        image = image.resize((width, max(1, round(image.height * width / image.width))), Image.Resampling.LANCZOS)
+    if colors:
+        image = image.quantize(colors=colors, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+    image.save(output_path, 'PNG', optimize=True)
+
+def optimize_png(image_path, size, content_width=DEFAULT_CONTENT_WIDTH, dpi=DIAGRAM_DPI, colors=DIAGRAM_PNG_COLORS,
+                 cache=optimized_cache):
+    """
+    Optimizează un PNG renderizat pentru afișarea în clasa size. Întoarce (cale, lățime originală în px);
+    calea este image-<hash>.png în același director, comună pentru imaginile identice.
+    Fără Pillow sau cu dpi 0 întoarce imaginea neschimbată.
+    """
+    image_path = Path(image_path)
+    Image = _load_pillow() if dpi else None
+    if Image is None:
+        return image_path, None
+    data = image_path.read_bytes()
+    try:
+        with Image.open(image_path) as image:
+            image_width = image.width
+    except OSError as e:
+        print(f"⚠️ Imagine neoptimizată {image_path.name}: {e}")
+        return image_path, None
+
+    params = [hashlib.sha256(data).hexdigest(), target_pixel_width(image_width, size, content_width, dpi), colors]
+    key = hashlib.sha256(json.dumps(params).encode('utf-8')).hexdigest()
+    output_path = image_path.with_name(f'image-{key[:20]}.png')
+    if not output_path.exists():
+        cached = cache.get(key) if cache else None
+        if cached:
+            shutil.copyfile(cached, output_path)
+        else:
+            _optimize(image_path, output_path, size, content_width, dpi, colors)
+            # Păstrez originalul dacă optimizarea nu aduce nimic
+            if output_path.stat().st_size >= len(data):
+                shutil.copyfile(image_path, output_path)
+            if cache:
+                cache.put(key, output_path)
+    return output_path, image_width
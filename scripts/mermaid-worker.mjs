@@ -0,0 +1,172 @@
+#!/usr/bin/env node
+/**
+ * Worker Mermaid persistent: un singur browser (puppeteer) pentru toate
+ * diagramele unui build, în loc de un Node + Chromium per diagramă.
+ *
+ * Pornit de mermaid_render.py:
+ *   node scripts/mermaid-worker.mjs <director @mermaid-js/mermaid-cli> [concurență]
+ *
+ * Protocol: câte un obiect JSON pe linie.
+ *   stdout la pornire: {"ready": true, "version": "11.4.0"}
+ *   stdin:  {"id": 1, "code": "graph TD...", "format": "png", "width": 900, "height": 560,
+ *            "background": "transparent", "timeout": 120000}
+ *   stdout: {"id": 1, "ok": true, "data": "<base64>", "seconds": 0.42}
+ *         | {"id": 1, "ok": false, "error": "...", "seconds": 120.0}
+ *   seconds = timpul randării acestei diagrame (de la începutul renderMermaid), fără așteptarea în coadă
+ */
+
+import { readFileSync } from 'node:fs';
+import { createRequire } from 'node:module';
+import { join } from 'node:path';
+import { createInterface } from 'node:readline';
+import { pathToFileURL } from 'node:url';
+
+const cliRoot = process.argv[2];
+const concurrency = Math.max(1, parseInt(process.argv[3] || '4', 10));
+
+const send = (message) => process.stdout.write(JSON.stringify(message) + '\n');
+
+async function loadRenderer() {
+  // Modulele sunt rezolvate din instalarea mermaid-cli (globală sau locală), nu din proiect
+  const pkg = JSON.parse(readFileSync(join(cliRoot, 'package.json'), 'utf-8'));
+  const entry = typeof pkg.exports === 'string' ? pkg.exports : (pkg.exports?.['.']?.import || pkg.exports?.['.'] || pkg.main || 'src/index.js');
+  const { renderMermaid } = await import(pathToFileURL(join(cliRoot, entry)).href);
+  const requireFromCli = createRequire(join(cliRoot, 'package.json'));
+  const puppeteer = (await import(pathToFileURL(requireFromCli.resolve('puppeteer')).href)).default;
+  return { renderMermaid, puppeteer, version: pkg.version };
+}
+
+function withTimeout(promise, ms, onTimeout) {
+  // La timeout randarea este întâi anulată (onTimeout), abia apoi cererea este respinsă:
+  // slotul de concurență se eliberează doar după ce pagina nu mai lucrează
+  return new Promise((resolve, reject) => {
+    let timedOut = false;
+    const timer = setTimeout(async () => {
+      timedOut = true;
+      try {
+        await onTimeout();
+      } finally {
+        reject(new Error(`timeout după ${ms} ms`));
+      }
+    }, ms);
+    promise.then(
+      (value) => {
+        if (!timedOut) {
+          clearTimeout(timer);
+          resolve(value);
+        }
+      },
+      (error) => {
+        if (!timedOut) {
+          clearTimeout(timer);
+          reject(error);
+        }
+      },
+    );
+  });
+}
+
+function trackPages(browser, job) {
+  // renderMermaid își deschide singur pagina; o rețin ca să o pot închide la timeout
+  return new Proxy(browser, {
+    get(target, prop) {
+      if (prop === 'newPage') {
+        return async (...args) => {
+          const page = await target.newPage(...args);
+          if (job.cancelled) {
+            await page.close().catch(() => {});
+            throw new Error('randare anulată');
+          }
+          job.pages.add(page);
+          return page;
+        };
+      }
+      const value = Reflect.get(target, prop, target);
+      return typeof value === 'function' ? value.bind(target) : value;
+    },
+  });
+}
+
+async function main() {
+  let renderer;
+  let browser;
+  try {
+    renderer = await loadRenderer();
+    browser = await renderer.puppeteer.launch({ headless: true });
+  } catch (error) {
+    send({ ready: false, error: String(error?.message || error) });
+    process.exit(1);
+  }
+  send({ ready: true, version: renderer.version });
+
+  const queue = [];
+  let active = 0;
+  let restarting = null;
+
+  // Dacă pagina blocată nu poate fi închisă, repornesc browserul (randările în curs pe el eșuează)
+  const restartBrowser = () => {
+    restarting ??= (async () => {
+      const stuck = browser;
+      browser = await renderer.puppeteer.launch({ headless: true });
+      stuck.close().catch(() => {});
+    })().finally(() => {
+      restarting = null;
+    });
+    return restarting;
+  };
+
+  const cancel = async (job) => {
+    job.cancelled = true;
+    try {
+      await Promise.all([...job.pages].map((page) => page.close()));
+    } catch {
+      await restartBrowser();
+    }
+  };
+
+  const next = () => {
+    while (active < concurrency && queue.length) {
+      const request = queue.shift();
+      active += 1;
+      const job = { pages: new Set(), cancelled: false };
+      const started = performance.now();
+      const seconds = () => (performance.now() - started) / 1000;
+      const render = renderer.renderMermaid(trackPages(browser, job), request.code, request.format || 'png', {
+        viewport: { width: request.width || 800, height: request.height || 600, deviceScaleFactor: request.scale || 1 },
+        backgroundColor: request.background || 'white',
+        mermaidConfig: request.config || { theme: 'default' },
+        svgId: request.svgId,
+      });
+      withTimeout(render, request.timeout || 120000, () => cancel(job))
+        .then(({ data }) => send({ id: request.id, ok: true, data: Buffer.from(data).toString('base64'), seconds: seconds() }))
+        .catch((error) => send({ id: request.id, ok: false, error: String(error?.message || error), seconds: seconds() }))
+        .finally(() => {
+          active -= 1;
+          next();
+        });
+    }
+  };
+
+  const input = createInterface({ input: process.stdin });
+  input.on('line', (line) => {
+    if (!line.trim()) return;
+    try {
+      queue.push(JSON.parse(line));
+    } catch (error) {
+      send({ id: null, ok: false, error: `cerere invalidă: ${error.message}` });
+      return;
+    }
+    next();
+  });
+
+  // stdin închis = build terminat: aștept diagramele în curs, apoi închid browserul
+  input.on('close', async () => {
+    while (active || queue.length || restarting) {
+      await new Promise((resolve) => setTimeout(resolve, 20));
+    }
+    await browser.close();
+    process.exit(0);
+  });
+}
+
+main();
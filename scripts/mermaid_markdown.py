@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Extensie Python-Markdown pentru blocurile ```mermaid
+Folosită de pdf_build.py (generate_pdf.py, generate_raport_pdf.py, generate_deployment_pdf.py)
+
+Blocurile Mermaid sunt recunoscute în timpul conversiei Markdown, toate
+diagramele documentului sunt trimise odată la mermaid_render (cache + randare
+paralelă), iar HTML-ul final al fiecărei figuri este pus în htmlStash-ul
+Markdown. Nu mai există placeholders înlocuite ulterior cu str.replace pe tot
+documentul.
+
+    md = markdown.Markdown(extensions=['tables', MermaidExtension(temp_dir=temp_dir)])
+    html_body = md.convert(md_content)
+
+Directorul temp_dir este obligatoriu și aparține apelantului: imaginile trebuie
+să existe până la generarea PDF-ului, apoi apelantul șterge directorul și
+cheamă mermaid_render.release_images(temp_dir).
+"""
+
+import os
+import re
+import time
+
+from markdown.extensions import Extension
+from markdown.preprocessors import Preprocessor
+
+from diagram_images import DEFAULT_CONTENT_WIDTH, DIAGRAM_DPI, optimize_png
+from mermaid_render import DIAGRAM_FORMAT, diagram_markup, render_diagrams
+from mermaid_sizing import size_diagram
+
+FENCE_PATTERN = re.compile(r'^(`{3,}|~{3,})(.*)$')
+
+def code_fences(lines):
+    """
+    (prima linie, ultima linie, marcaj, info) pentru fiecare bloc de cod delimitat de la nivelul documentului.
+    Starea blocurilor este urmărită linie cu linie: un marcaj în interiorul altui bloc (ex. ``` într-un
+    ~~~ sau ````markdown) sau indentat rămâne cod. Un bloc este închis doar de un marcaj cu același
+    caracter și cel puțin aceeași lungime; un bloc neînchis nu este bloc de cod.
+    """
+    blocks = []
+    idx = 0
+    while idx < len(lines):
+        match = FENCE_PATTERN.match(lines[idx])
+        if not match:
+            idx += 1
+            continue
+        marker, info = match.group(1), match.group(2).strip()
+        end = next((j for j in range(idx + 1, len(lines))
+                    if lines[j].rstrip() and set(lines[j].rstrip()) == {marker[0]} and len(lines[j].rstrip()) >= len(marker)),
+                   None)
+        if end is None:
+            idx += 1
+            continue
+        blocks.append((idx, end, marker, info))
+        idx = end + 1
+    return blocks
+
+def mermaid_fences(lines):
+    """(prima linie, ultima linie, cod) pentru fiecare bloc ```mermaid de la nivelul documentului (vezi code_fences)"""
+    return [(start, end, '\n'.join(lines[start + 1:end])) for start, end, marker, info in code_fences(lines)
+            if marker[0] == '`' and info == 'mermaid']
+
+def mermaid_blocks(md_content):
+    """Codul blocurilor ```mermaid ale unui document, în ordine"""
+    return [code for _, _, code in mermaid_fences(md_content.split('\n'))]
+
+def diagram_html(size, markup):
+    """Containerul HTML al unei diagrame; clasele diagram-large/medium/small sunt stilizate în CSS"""
+    return f'<div class="diagram-{size}">\n    {markup}\n</div>'
+
+class MermaidPreprocessor(Preprocessor):
+    """Renderează toate blocurile Mermaid dintr-o trecere și le înlocuiește cu HTML-ul final"""
+
+    def __init__(self, md, extension):
+        super().__init__(md)
+        self.extension = extension
+
+    def run(self, lines):
+        fences = mermaid_fences(lines)
+        blocks = [code for _, _, code in fences]
+        self.extension.blocks = blocks
+        self.extension.results = []
+        self.extension.diagrams = []
+        self.extension.render_seconds = 0.0
+        self.extension.optimize_seconds = 0.0
+        if not blocks:
+            return lines
+
+        temp_dir = self.extension.getConfig('temp_dir')
+        if not temp_dir:
+            raise ValueError("MermaidExtension are nevoie de temp_dir pentru diagrame (șters de apelant după PDF)")
+        sizer = self.extension.getConfig('sizer')
+        content_width = self.extension.getConfig('content_width') or DEFAULT_CONTENT_WIDTH
+        sizes = [sizer(mermaid_code, content_width) for mermaid_code in blocks]
+        image_paths = [os.path.join(temp_dir, f'mermaid_{idx}.{DIAGRAM_FORMAT}') for idx in range(len(blocks))]
+
+        # Renderez toate diagramele în paralel (cu cache pe disc); rezultatele vin în ordinea blocurilor
+        started = time.perf_counter()
+        stats = []
+        results = render_diagrams([(mermaid_code, image_path, width, height)
+                                   for mermaid_code, image_path, (width, height, _) in zip(blocks, image_paths, sizes)],
+                                  max_workers=self.extension.getConfig('max_workers') or None, stats=stats)
+        self.extension.render_seconds = time.perf_counter() - started
+
+        dpi = self.extension.getConfig('dpi')
+        figures = []
+        for idx, (success, image_path, (width, _, size)) in enumerate(zip(results, image_paths, sizes)):
+            display_width = None
+            if success:
+                if image_path.endswith('.png') and dpi:
+                    # PNG redimensionat pentru dimensiunea tipărită; imaginile identice devin un singur fișier
+                    started = time.perf_counter()
+                    image_path, display_width = optimize_png(image_path, size, content_width, dpi)
+                    self.extension.optimize_seconds += time.perf_counter() - started
+                    stats[idx]['optimized_bytes'] = os.path.getsize(image_path)
+                alt = f"Diagramă Arhitectură {idx+1}" if size == 'large' else f"Diagramă {idx+1}"
+                figures.append(diagram_html(size, diagram_markup(image_path, width, alt, display_width)))
+                print(f"  ✓ Diagramă {idx+1}: {size}")
+            else:
+                # Dacă a eșuat renderarea, las un mesaj
+                figures.append(f'<p><em>[Diagramă Mermaid #{idx+1} - eroare la renderare]</em></p>')
+            self.extension.results.append((success, size))
+            self.extension.diagrams.append(dict(stats[idx], index=idx + 1, size=size, width=sizes[idx][0],
+                                                height=sizes[idx][1], success=success))
+
+        # Fiecare bloc devine un placeholder htmlStash, înlocuit de Markdown la serializare
+        output = []
+        previous_end = -1
+        for (start, end, _), figure in zip(fences, figures):
+            output.extend(lines[previous_end + 1:start])
+            output.extend(['', self.md.htmlStash.store(figure), ''])
+            previous_end = end
+        output.extend(lines[previous_end + 1:])
+        return output
+
+class MermaidExtension(Extension):
+    """
+    Opțiuni:
+        temp_dir     director pentru imaginile renderizate (obligatoriu dacă documentul are diagrame)
+        sizer        funcție (cod Mermaid, lățimea zonei de conținut) → (lățime, înălțime,
+                     'large'|'medium'|'small'), implicit mermaid_sizing.size_diagram
+        max_workers  diagrame renderizate simultan (implicit MERMAID_WORKERS)
+        dpi          rezoluția la care sunt optimizate PNG-urile (implicit DIAGRAM_DPI; 0 = fără optimizare)
+        content_width  lățimea zonei de conținut a paginii, în px CSS (implicit A4 cu margini de 2cm)
+    """
+
+    def __init__(self, **kwargs):
+        self.config = {
+            'temp_dir': ['', 'Director pentru imaginile renderizate (al apelantului)'],
+            'sizer': [size_diagram, 'Funcție (cod Mermaid, lățime pagină) → (lățime, înălțime, clasă dimensiune)'],
+            'max_workers': [0, 'Diagrame renderizate simultan (0 = MERMAID_WORKERS)'],
+            'dpi': [DIAGRAM_DPI, 'Rezoluția PNG-urilor la tipar (0 = fără optimizare)'],
+            'content_width': [0.0, 'Lățimea zonei de conținut a paginii, în px CSS (0 = A4 cu margini de 2cm)'],
+        }
+        self.blocks = []
+        self.results = []
+        # Statistici ale ultimei conversii: per diagramă, timpul total de randare și de optimizare a imaginilor
+        self.diagrams = []
+        self.render_seconds = 0.0
+        self.optimize_seconds = 0.0
+        super().__init__(**kwargs)
+
+    def extendMarkdown(self, md):
+        md.registerExtension(self)
+        # Înainte de fenced_code (25), ca blocurile să nu devină <pre><code>
+        md.preprocessors.register(MermaidPreprocessor(md, self), 'mermaid', 28)
+
+    def reset(self):
+        self.blocks = []
+        self.results = []
+        self.diagrams = []
+        self.render_seconds = 0.0
+        self.optimize_seconds = 0.0
+
+def makeExtension(**kwargs):
+    return MermaidExtension(**kwargs)
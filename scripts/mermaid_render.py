@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+"""
+Renderare diagrame Mermaid cu cache persistent pe disc
+Folosit de pdf_build.py (generate_pdf.py, generate_raport_pdf.py, generate_deployment_pdf.py)
+
+Două backend-uri:
+    batch   un singur proces Node persistent (mermaid-worker.mjs) cu un singur
+            browser pentru toate diagramele din proces, inclusiv între documente
+    mmdc    câte un proces mmdc per diagramă, în paralel (fallback)
+
+Cheia din cache este hash-ul conținutului: cod Mermaid, lățime/înălțime,
+background, format și versiunea mermaid-cli. O diagramă nemodificată nu mai
+pornește niciun mmdc la rebuild.
+
+Variabile de mediu:
+    MERMAID_CACHE_DIR           director cache (implicit $XDG_CACHE_HOME sau ~/.cache, /mermaid-render-cache;
+                                creat cu permisiuni 0700, ignorat dacă aparține altui utilizator)
+    MERMAID_CACHE_MAX_MB        dimensiune maximă cache (implicit 500 MB)
+    MERMAID_CACHE_MAX_AGE_DAYS  vechime maximă a unei intrări nefolosite (implicit 30 zile)
+    MERMAID_WORKERS             procese mmdc simultane (implicit min(4, CPU); fiecare e un Chromium)
+    MERMAID_TIMEOUT             timeout per diagramă, în secunde (implicit 120)
+    MERMAID_RENDERER            auto | batch | mmdc (implicit auto: batch dacă mermaid-cli e găsit)
+    MERMAID_FORMAT              png | svg (implicit png; svg = diagrame vectoriale inline în HTML)
+    MERMAID_IMAGE_MODE          reference | inline (implicit reference: PNG-urile sunt citite de
+                                WeasyPrint prin diagram_url_fetcher, nu copiate base64 în HTML)
+"""
+
+import atexit
+import base64
+import hashlib
+import html
+import json
+import os
+import re
+import shutil
+import signal
+import stat
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+
+# Cache per utilizator, nu în $TMPDIR: SVG-urile din cache ajung inline în HTML și PNG-urile în PDF,
+# deci un director în care pot scrie și alții ar permite injectarea de conținut
+USER_CACHE_HOME = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache')
+CACHE_DIR = Path(os.environ.get('MERMAID_CACHE_DIR', USER_CACHE_HOME / 'mermaid-render-cache'))
+CACHE_MAX_BYTES = int(os.environ.get('MERMAID_CACHE_MAX_MB', 500)) * 1024 * 1024
+CACHE_MAX_AGE_DAYS = float(os.environ.get('MERMAID_CACHE_MAX_AGE_DAYS', 30))
+DEFAULT_WORKERS = int(os.environ.get('MERMAID_WORKERS', min(4, os.cpu_count() or 1)))
+DEFAULT_TIMEOUT = float(os.environ.get('MERMAID_TIMEOUT', 120))
+RENDERER = os.environ.get('MERMAID_RENDERER', 'auto')
+DIAGRAM_FORMAT = os.environ.get('MERMAID_FORMAT', 'png')
+IMAGE_MODE = os.environ.get('MERMAID_IMAGE_MODE', 'reference')
+DIAGRAM_URL_SCHEME = 'diagram'
+
+# Configurație Mermaid per format. WeasyPrint nu afișează <foreignObject>, deci în SVG
+# etichetele trebuie să fie text SVG, nu HTML.
+MERMAID_CONFIG = {
+    'png': {'theme': 'default'},
+    'svg': {'theme': 'default', 'htmlLabels': False, 'flowchart': {'htmlLabels': False}},
+}
+
+WORKER_SCRIPT = Path(__file__).parent / 'mermaid-worker.mjs'
+WORKER_STARTUP_TIMEOUT = 60
+
+# Se schimbă când se schimbă modul în care sunt apelate rendererele (invalidează tot cache-ul)
+CACHE_VERSION = 1
+
+@lru_cache(maxsize=None)
+def mermaid_cli_root():
+    """Directorul pachetului @mermaid-js/mermaid-cli în care duce mmdc, sau None"""
+    mmdc = shutil.which('mmdc')
+    if not mmdc:
+        return None
+    # mmdc este un symlink către .../node_modules/@mermaid-js/mermaid-cli/src/cli.js
+    for parent in Path(os.path.realpath(mmdc)).parents:
+        package_json = parent / 'package.json'
+        if package_json.exists():
+            try:
+                with open(package_json, 'r', encoding='utf-8') as f:
+                    if json.load(f).get('name') == '@mermaid-js/mermaid-cli':
+                        return parent
+            except (OSError, ValueError):
+                return None
+    return None
+
+@lru_cache(maxsize=None)
+def renderer_version():
+    """Versiunea mermaid-cli citită din package.json (fără a porni mmdc)"""
+    mmdc = shutil.which('mmdc')
+    if not mmdc:
+        return 'mmdc-missing'
+    root = mermaid_cli_root()
+    if root:
+        with open(root / 'package.json', 'r', encoding='utf-8') as f:
+            return f"mmdc-{json.load(f).get('version', 'unknown')}"
+    # Instalare necunoscută: calea + data modificării binarului
+    stat = os.stat(mmdc)
+    return f"mmdc-{os.path.realpath(mmdc)}-{int(stat.st_mtime)}"
+
+def private_dir(directory):
+    """Creează directorul cu permisiuni 0700; False dacă există deja și aparține altui utilizator"""
+    directory.mkdir(parents=True, mode=0o700, exist_ok=True)
+    info = directory.stat()
+    if hasattr(os, 'getuid'):
+        if info.st_uid != os.getuid():
+            return False
+        if stat.S_IMODE(info.st_mode) & 0o077:
+            directory.chmod(0o700)
+    return True
+
+class RenderCache:
+    """Cache content-addressed pentru diagramele renderizate, cu evicție după vechime și dimensiune"""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=CACHE_MAX_BYTES, max_age_days=CACHE_MAX_AGE_DAYS):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.hits = 0
+        self.misses = 0
+        self._evicted = False
+        self._private = None
+        self._lock = threading.Lock()
+
+    def usable(self):
+        """Directorul cache-ului este privat (verificat o singură dată); altfel cache-ul este ocolit"""
+        if self._private is None:
+            try:
+                self._private = private_dir(self.cache_dir)
+            except OSError:
+                self._private = False
+            if not self._private:
+                print(f"⚠️ Cache-ul {self.cache_dir} nu este un director privat; diagramele nu sunt păstrate în cache")
+        return self._private
+
+    def key(self, mermaid_code, width, height, background='transparent', fmt='png'):
+        payload = json.dumps([CACHE_VERSION, renderer_version(), mermaid_code, width, height, background, fmt])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def path(self, key, fmt='png'):
+        return self.cache_dir / key[:2] / f'{key}.{fmt}'
+
+    def get(self, key, fmt='png'):
+        """Calea fișierului din cache sau None; o intrare folosită este marcată ca recentă"""
+        path = self.path(key, fmt)
+        try:
+            if not self.usable():
+                raise FileNotFoundError(path)
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return path
+
+    def put(self, key, source_path, fmt='png'):
+        """Copiază atomic un fișier renderizat în cache (None dacă cache-ul nu poate fi folosit)"""
+        if not self.usable():
+            return None
+        path = self.path(key, fmt)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f'.{os.getpid()}-{threading.get_ident()}.tmp')
+        shutil.copyfile(source_path, tmp_path)
+        os.replace(tmp_path, path)
+        with self._lock:
+            evict, self._evicted = not self._evicted, True
+        if evict:
+            self.evict()
+        return path
+
+    def evict(self):
+        """Șterge intrările mai vechi decât max_age, apoi pe cele mai puțin recent folosite peste max_bytes"""
+        if not self.cache_dir.exists() or not self.usable():
+            return 0
+        now = time.time()
+        entries = []
+        removed = 0
+        for path in self.cache_dir.glob('*/*'):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            if now - stat.st_mtime > self.max_age:
+                path.unlink(missing_ok=True)
+                removed += 1
+            else:
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        return removed
+
+default_cache = RenderCache()
+
+def run_mmdc(command, timeout=DEFAULT_TIMEOUT):
+    """
+    Rulează mmdc într-un grup de procese propriu: la timeout este oprit și
+    Chromium-ul pornit de el, nu doar procesul Node.
+    """
+    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                               start_new_session=hasattr(os, 'killpg'))
+    try:
+        stdout, stderr = process.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        if hasattr(os, 'killpg'):
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+        process.communicate()
+        raise
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, command, stdout, stderr)
+
+class BatchRenderer:
+    """
+    Client pentru mermaid-worker.mjs: un proces Node cu un browser deschis,
+    care primește diagramele pe stdin și întoarce imaginile pe stdout.
+    Cererile sunt identificate prin id, deci pot fi trimise toate odată.
+    """
+
+    def __init__(self, cli_root, concurrency=DEFAULT_WORKERS):
+        self.cli_root = cli_root
+        self.concurrency = concurrency
+        self.process = None
+        self._pending = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def start(self):
+        self.process = subprocess.Popen(
+            ['node', str(WORKER_SCRIPT), str(self.cli_root), str(self.concurrency)],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, encoding='utf-8', bufsize=1)
+
+        # Aștept pornirea browserului; fără răspuns în timp util workerul este abandonat
+        ready = Future()
+        threading.Thread(target=lambda: ready.set_result(self.process.stdout.readline()), daemon=True).start()
+        try:
+            line = ready.result(timeout=WORKER_STARTUP_TIMEOUT)
+            status = json.loads(line) if line else {'ready': False, 'error': 'workerul s-a oprit la pornire'}
+        except Exception as e:
+            status = {'ready': False, 'error': str(e) or 'timeout la pornire'}
+        if not status.get('ready'):
+            self.close()
+            raise RuntimeError(status.get('error'))
+
+        threading.Thread(target=self._read_responses, name='mermaid-worker', daemon=True).start()
+        return self
+
+    def alive(self):
+        return self.process is not None and self.process.poll() is None
+
+    def submit(self, mermaid_code, fmt, width, height, background='transparent', timeout=DEFAULT_TIMEOUT):
+        """
+        Trimite o diagramă; Future-ul întors primește (bytes-ii imaginii, secundele de randare măsurate
+        de worker). La eșec, excepția are atributul seconds.
+        """
+        future = Future()
+        with self._lock:
+            self._next_id += 1
+            request_id = self._next_id
+            self._pending[request_id] = future
+            request = {'id': request_id, 'code': mermaid_code, 'format': fmt, 'width': width, 'height': height,
+                       'background': background, 'timeout': int(timeout * 1000),
+                       'config': MERMAID_CONFIG.get(fmt, MERMAID_CONFIG['png']), 'svgId': svg_id(mermaid_code)}
+            try:
+                self.process.stdin.write(json.dumps(request) + '\n')
+                self.process.stdin.flush()
+            except (BrokenPipeError, OSError, ValueError) as e:
+                self._pending.pop(request_id, None)
+                future.set_exception(RuntimeError(f'workerul Mermaid nu mai rulează: {e}'))
+        return future
+
+    def _read_responses(self):
+        for line in self.process.stdout:
+            try:
+                response = json.loads(line)
+            except ValueError:
+                continue
+            with self._lock:
+                future = self._pending.pop(response.get('id'), None)
+            if future is None:
+                continue
+            # Timpul randării propriu-zise (fără așteptarea în coada workerului)
+            seconds = response.get('seconds', 0.0)
+            if response.get('ok'):
+                future.set_result((base64.b64decode(response['data']), seconds))
+            else:
+                error = RuntimeError(response.get('error'))
+                error.seconds = seconds
+                future.set_exception(error)
+
+        # Workerul s-a oprit: cererile rămase eșuează (următorul build pornește altul)
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            future.set_exception(RuntimeError('workerul Mermaid s-a oprit'))
+
+    def close(self):
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=30)
+        except (OSError, subprocess.TimeoutExpired):
+            self.process.kill()
+        self.process = None
+
+_batch_renderer = None
+_batch_lock = threading.Lock()
+
+def batch_renderer(concurrency=None):
+    """Workerul persistent partajat de toate documentele din proces (pornit la prima folosire), sau None"""
+    global _batch_renderer
+    if RENDERER == 'mmdc':
+        return None
+    with _batch_lock:
+        if _batch_renderer is not None and _batch_renderer.alive():
+            return _batch_renderer
+        cli_root = mermaid_cli_root()
+        if cli_root is None or not shutil.which('node'):
+            return None
+        try:
+            _batch_renderer = BatchRenderer(cli_root, concurrency or DEFAULT_WORKERS).start()
+        except (OSError, RuntimeError) as e:
+            print(f"⚠️ Renderer batch indisponibil ({e}), folosesc mmdc per diagramă")
+            _batch_renderer = None
+        return _batch_renderer
+
+@atexit.register
+def close_batch_renderer():
+    global _batch_renderer
+    if _batch_renderer is not None:
+        _batch_renderer.close()
+        _batch_renderer = None
+
+def svg_id(mermaid_code):
+    """Id unic și stabil pentru SVG-ul unei diagrame (stilurile Mermaid sunt scoped pe #id)"""
+    return 'mermaid-' + hashlib.sha1(mermaid_code.encode('utf-8')).hexdigest()[:12]
+
+def render_with_mmdc(mermaid_code, output_path, width, height, background='transparent', timeout=DEFAULT_TIMEOUT):
+    """Renderează o diagramă cu un proces mmdc separat"""
+    fmt = Path(output_path).suffix.lstrip('.') or 'png'
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.mmd', delete=False, encoding='utf-8') as tmp:
+        tmp.write(mermaid_code)
+        tmp_path = tmp.name
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False, encoding='utf-8') as tmp:
+        json.dump(MERMAID_CONFIG.get(fmt, MERMAID_CONFIG['png']), tmp)
+        config_path = tmp.name
+
+    try:
+        # Rulez mmdc (mermaid-cli) pentru a genera imaginea
+        run_mmdc([
+            'mmdc',
+            '-i', tmp_path,
+            '-o', str(output_path),
+            '-b', background,
+            '-w', str(width),
+            '-H', str(height),
+            '-c', config_path,
+            '-I', svg_id(mermaid_code)
+        ], timeout)
+    except (subprocess.CalledProcessError, subprocess.TimeoutExpired, FileNotFoundError) as e:
+        print(f"⚠️ Eroare la renderarea Mermaid: {e}")
+        return False
+    finally:
+        os.unlink(tmp_path)
+        os.unlink(config_path)
+    return True
+
+SVG_ROOT_PATTERN = re.compile(r'<svg\b[^>]*>', re.DOTALL)
+VIEWBOX_PATTERN = re.compile(r'viewBox="\s*([-\d.]+)[\s,]+([-\d.]+)[\s,]+([\d.]+)[\s,]+([\d.]+)\s*"')
+SIZE_ATTRIBUTE_PATTERN = re.compile(r'\s(?:width|height|style)="[^"]*"')
+ROLE_ATTRIBUTE_PATTERN = re.compile(r'\s(?:role|aria-label)="[^"]*"')
+
+def inline_svg(svg_content, max_width, alt=''):
+    """
+    Pregătește un SVG Mermaid pentru inserare directă în HTML: fără prolog XML,
+    cu dimensiunea intrinsecă a diagramei (limitată la lățimea cerută, ca PNG-ul
+    produs de mmdc), astfel încât clasele diagram-large/medium/small să o scaleze.
+    """
+    start = svg_content.find('<svg')
+    svg_content = svg_content[start:] if start >= 0 else svg_content
+    root = SVG_ROOT_PATTERN.match(svg_content)
+    if not root:
+        return svg_content
+    tag = root.group(0)
+    viewbox = VIEWBOX_PATTERN.search(tag)
+    size = ''
+    if viewbox:
+        box_width, box_height = float(viewbox.group(3)), float(viewbox.group(4))
+        scale = min(1.0, max_width / box_width) if box_width else 1.0
+        size = f' width="{box_width * scale:.0f}" height="{box_height * scale:.0f}"'
+    new_tag = SIZE_ATTRIBUTE_PATTERN.sub('', tag[:-1]).rstrip('/')
+    if alt:
+        new_tag = ROLE_ATTRIBUTE_PATTERN.sub('', new_tag) + f' role="img" aria-label="{html.escape(alt)}"'
+    new_tag += size + '>'
+    return new_tag + svg_content[root.end():]
+
+# Imaginile referite din HTML: token din URL → fișierul renderizat
+_image_references = {}
+_image_references_lock = threading.Lock()
+
+def reference_image(image_path):
+    """URL diagram:<token>.png pentru o imagine de pe disc, servit de diagram_url_fetcher"""
+    image_path = os.path.abspath(image_path)
+    token = hashlib.sha1(image_path.encode('utf-8')).hexdigest()[:16] + Path(image_path).suffix
+    with _image_references_lock:
+        _image_references[token] = image_path
+    return f'{DIAGRAM_URL_SCHEME}:{token}'
+
+def referenced_images():
+    """Căile imaginilor referite acum (pentru procese care trebuie să le servească la rândul lor)"""
+    with _image_references_lock:
+        return list(_image_references.values())
+
+def release_images(directory):
+    """Uită referințele către imaginile dintr-un director (ex. directorul temporar șters)"""
+    directory = os.path.join(os.path.abspath(directory), '')
+    with _image_references_lock:
+        for token in [t for t, path in _image_references.items() if path.startswith(directory)]:
+            del _image_references[token]
+
+def resolve_diagram_url(url):
+    """Calea și tipul MIME pentru un URL diagram:, sau None pentru orice alt URL"""
+    prefix = f'{DIAGRAM_URL_SCHEME}:'
+    if not url.startswith(prefix):
+        return None
+    with _image_references_lock:
+        path = _image_references.get(url[len(prefix):])
+    if path is None:
+        raise FileNotFoundError(f'Diagramă necunoscută: {url}')
+    return path, 'image/svg+xml' if path.endswith('.svg') else 'image/png'
+
+def diagram_url_fetcher():
+    """
+    url_fetcher pentru WeasyPrint: URL-urile diagram: sunt citite direct din fișierul
+    renderizat, restul merg la fetcher-ul implicit (data:, file:, http:)
+    """
+    from weasyprint import urls
+
+    if hasattr(urls, 'URLFetcher'):
+        class DiagramURLFetcher(urls.URLFetcher):
+            def fetch(self, url, headers=None):
+                image = resolve_diagram_url(url)
+                if image is None:
+                    return super().fetch(url, headers)
+                path, mime_type = image
+                return urls.URLFetcherResponse(url, open(path, 'rb'), {'Content-Type': mime_type})
+        return DiagramURLFetcher()
+
+    # Versiunile WeasyPrint fără URLFetcher: url_fetcher este o funcție care întoarce un dict
+    def fetcher(url):
+        image = resolve_diagram_url(url)
+        if image is None:
+            return urls.default_url_fetcher(url)
+        path, mime_type = image
+        return {'file_obj': open(path, 'rb'), 'mime_type': mime_type, 'redirected_url': url}
+    return fetcher
+
+def diagram_markup(image_path, max_width, alt, display_width=None):
+    """
+    Markup HTML pentru o diagramă renderizată: SVG inline, PNG referit sau PNG embedded base64.
+    display_width (px CSS) fixează lățimea unui PNG redimensionat la lățimea imaginii originale.
+    """
+    if str(image_path).endswith('.svg'):
+        return inline_svg(Path(image_path).read_text(encoding='utf-8'), max_width, alt)
+    style = f' style="width: {display_width}px"' if display_width else ''
+    if IMAGE_MODE == 'reference':
+        return f'<img src="{reference_image(image_path)}" alt="{alt}"{style} />'
+    with open(image_path, 'rb') as img_file:
+        img_data = base64.b64encode(img_file.read()).decode('utf-8')
+    return f'<img src="data:image/png;base64,{img_data}" alt="{alt}"{style} />'
+
+def _render_batch(renderer, jobs, timeout, background, seconds):
+    futures = [renderer.submit(code, Path(path).suffix.lstrip('.') or 'png', width, height, background, timeout)
+               for code, path, width, height in jobs]
+    # Timeout-ul per diagramă este aplicat în worker; aici doar o limită de siguranță pentru tot lotul
+    batch_timeout = timeout * (len(jobs) / max(renderer.concurrency, 1) + 1) + WORKER_STARTUP_TIMEOUT
+    results = []
+    for idx, ((_, path, _, _), future) in enumerate(zip(jobs, futures)):
+        try:
+            data, seconds[idx] = future.result(timeout=batch_timeout)
+            Path(path).write_bytes(data)
+            results.append(True)
+        except Exception as e:
+            # Timpul fiecărei diagrame este cel măsurat de worker în jurul renderMermaid
+            seconds[idx] = getattr(e, 'seconds', 0.0)
+            print(f"⚠️ Eroare la renderarea Mermaid: {e}")
+            results.append(False)
+    return results
+
+def _timed(function, *args):
+    started = time.perf_counter()
+    return function(*args), time.perf_counter() - started
+
+def render_diagrams(jobs, max_workers=None, timeout=DEFAULT_TIMEOUT, background='transparent', cache=default_cache,
+                    stats=None):
+    """
+    Renderează o listă de diagrame (mermaid_code, output_path, width, height).
+
+    Diagramele din cache sunt doar copiate. Restul merg la workerul batch
+    persistent sau, dacă nu e disponibil, la cel mult max_workers procese mmdc
+    simultane. Fiecare diagramă are propriul timeout; rezultatele (True/False)
+    sunt întoarse în ordinea job-urilor.
+
+    Dacă stats este o listă, primește în ordinea job-urilor câte un dict
+    {'cached', 'seconds', 'bytes'} pentru fiecare diagramă.
+    """
+    results = [False] * len(jobs)
+    seconds = [0.0] * len(jobs)
+    from_cache = [False] * len(jobs)
+    missing = []
+    for idx, (code, path, width, height) in enumerate(jobs):
+        fmt = Path(path).suffix.lstrip('.') or 'png'
+        key = cache.key(code, width, height, background, fmt) if cache else None
+        cached = cache.get(key, fmt) if cache else None
+        if cached:
+            seconds[idx] = _timed(shutil.copyfile, cached, path)[1]
+            results[idx] = from_cache[idx] = True
+        else:
+            missing.append((idx, key, fmt))
+
+    if missing:
+        missing_jobs = [jobs[idx] for idx, _, _ in missing]
+        missing_seconds = [0.0] * len(missing_jobs)
+        renderer = batch_renderer(max_workers)
+        if renderer is not None:
+            rendered = _render_batch(renderer, missing_jobs, timeout, background, missing_seconds)
+        else:
+            workers = max(1, min(max_workers or DEFAULT_WORKERS, len(missing_jobs)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='mmdc') as pool:
+                futures = [pool.submit(_timed, render_with_mmdc, code, path, width, height, background, timeout)
+                           for code, path, width, height in missing_jobs]
+                rendered = []
+                for job_idx, future in enumerate(futures):
+                    success, missing_seconds[job_idx] = future.result()
+                    rendered.append(success)
+
+        for (idx, key, fmt), success, elapsed in zip(missing, rendered, missing_seconds):
+            results[idx] = success
+            seconds[idx] = elapsed
+            if success and cache:
+                cache.put(key, jobs[idx][1], fmt)
+
+    if stats is not None:
+        for (_, path, _, _), success, cached, elapsed in zip(jobs, results, from_cache, seconds):
+            stats.append({'cached': cached, 'seconds': round(elapsed, 3),
+                          'bytes': os.path.getsize(path) if success else 0})
+    return results
+
+def render_mermaid(mermaid_code, output_path, width, height, background='transparent', cache=default_cache,
+                   timeout=DEFAULT_TIMEOUT):
+    """Renderează o singură diagramă în output_path, refolosind rezultatul din cache dacă există"""
+    return render_diagrams([(mermaid_code, output_path, width, height)], 1, timeout, background, cache)[0]
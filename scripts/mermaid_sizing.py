@@ -0,0 +1,293 @@
+#!/usr/bin/env python3
+"""
+Dimensionarea automată a diagramelor Mermaid
+Folosit de mermaid_markdown.py (sizer-ul implicit al MermaidExtension)
+
+În loc de verificări pe subșiruri pentru diagrame anume, codul Mermaid este
+parsat într-un model simplu (noduri cu etichete, muchii, subgraph-uri,
+direcție; participanți și mesaje; task-uri; felii), din care se estimează
+dimensiunea naturală a layout-ului:
+    flowchart  ranguri prin cel mai lung drum (ca dagre); lățimea = cel mai
+               lat rang, înălțimea = suma rangurilor (inversat pentru LR/RL)
+    sequence   participanți × coloană, mesaje × rând
+    gantt      lățimea paginii, task-uri × rând
+    pie        diametru + legendă
+
+Dimensiunea naturală este apoi potrivită în zona de conținut a paginii
+(fit_to_page): lățimea de randare este cea naturală sau, pentru diagramele
+prea înalte, cea la care încap pe pagină, iar clasa (small 70% / medium 95% /
+large = aproape o pagină întreagă) urmează dimensiunea tipărită. Fiecare
+diagramă este randată o singură dată, direct la dimensiunea potrivită.
+
+Directive per bloc (comentarii Mermaid, ignorate la randare), oricare opționale;
+o valoare invalidă este ignorată cu un avertisment:
+    %% pdf: size=small width=600 height=400
+"""
+
+import re
+
+from diagram_images import DEFAULT_CONTENT_WIDTH, SIZE_CLASS_WIDTH
+
+# Metrici aproximative ale temei Mermaid implicite (font 16px, line-height 1.5); padding-ul nodului,
+# distanțele dintre noduri/ranguri și marginea diagramei sunt valorile implicite din config-ul flowchart
+# (padding 15 adăugat o singură dată la eticheta nodului, nodeSpacing/rankSpacing 50, diagramPadding 8),
+# verificate pe diagramele din docs/01-Prezentare
+CHAR_WIDTH = 8.5
+LINE_HEIGHT = 24
+NODE_PADDING = 15
+NODE_SEP = 50
+RANK_SEP = 50
+SUBGRAPH_PADDING = 40
+DIAGRAM_PADDING = 8
+SEQUENCE_ACTOR_WIDTH = 150
+SEQUENCE_ACTOR_MARGIN = 50
+SEQUENCE_MESSAGE_HEIGHT = 45
+GANTT_ROW_HEIGHT = 24
+GANTT_PAGE_WIDTHS = 1.5
+PIE_DIAMETER = 450
+
+# Limitele randării (px CSS); înălțimea zonei de conținut (A4 cu margini de 2.5cm), din care o diagramă
+# ocupă cel mult 85%, iar peste 70% primește clasa large (practic o pagină proprie) dacă nu e îngustă
+MIN_RENDER_WIDTH = 300
+MAX_RENDER_WIDTH = 1600
+MIN_RENDER_HEIGHT = 120
+PAGE_CONTENT_HEIGHT = (297 - 50) / 25.4 * 96
+MAX_DIAGRAM_HEIGHT = PAGE_CONTENT_HEIGHT * 0.85
+LARGE_DIAGRAM_HEIGHT = PAGE_CONTENT_HEIGHT * 0.7
+
+DIRECTIVE_PATTERN = re.compile(r'^\s*%%\s*pdf:\s*(.*)$', re.MULTILINE)
+HEADER_PATTERN = re.compile(r'^\s*(graph|flowchart|sequenceDiagram|gantt|pie|classDiagram|stateDiagram(?:-v2)?|'
+                            r'erDiagram|journey|mindmap|timeline)\b\s*(\w+)?', re.IGNORECASE)
+NODE_PATTERN = re.compile(r'(\w+)\s*(\[\[.*?\]\]|\[\(.*?\)\]|\(\(\(.*?\)\)\)|\(\(.*?\)\)|\(\[.*?\]\)|\[/.*?/\]|'
+                          r'\[\\.*?\\\]|\{\{.*?\}\}|\[.*?\]|\(.*?\)|\{.*?\}|>.*?\])')
+EDGE_LABEL_PATTERN = re.compile(r'\|[^|]*\|')
+TEXT_ARROW_PATTERN = re.compile(r'--\s[^->]+?\s-->|==\s[^=>]+?\s==>|-\.\s[^.]+?\s\.->')
+ARROW_PATTERN = re.compile(r'\s*(?:<?-\.+->?|<?={2,}[>ox]?|<?-{2,}[>ox]?|~~~)\s*')
+FLOWCHART_SKIP = ('style ', 'classDef ', 'class ', 'linkStyle ', 'click ', 'direction ')
+
+class MermaidGraph:
+    """Modelul unei diagrame: tip, direcție, noduri (id → etichetă), muchii, subgraph-uri"""
+
+    def __init__(self, kind, direction='TB'):
+        self.kind = kind
+        self.direction = direction
+        self.nodes = {}
+        self.edges = []
+        self.subgraph_depth = 0
+        self.items = []  # participanți, task-uri sau felii, după tip
+        self.rows = 0    # mesaje / task-uri / secțiuni
+        self.title = ''
+
+    def add_node(self, node_id, label=None):
+        if label is not None or node_id not in self.nodes:
+            self.nodes[node_id] = label if label is not None else self.nodes.get(node_id, node_id)
+
+def _label_lines(label):
+    label = re.sub(r'^[\[\(\{>/\\]+|[\]\)\}/\\]+$', '', label.strip()).strip('"')
+    return [line.strip() for line in re.split(r'<br\s*/?>|\\n', label)] or ['']
+
+def node_size(label):
+    """Dimensiunea estimată a unui nod (lățime, înălțime) după textul etichetei"""
+    lines = _label_lines(label)
+    return (max(len(line) for line in lines) * CHAR_WIDTH + NODE_PADDING,
+            len(lines) * LINE_HEIGHT + NODE_PADDING)
+
+def _code_lines(mermaid_code):
+    for line in mermaid_code.split('\n'):
+        line = line.strip()
+        if line and not line.startswith('%%'):
+            yield line
+
+def parse_mermaid(mermaid_code):
+    """Parsează codul Mermaid într-un MermaidGraph (doar cât e nevoie pentru dimensionare)"""
+    lines = list(_code_lines(mermaid_code))
+    header = HEADER_PATTERN.match(lines[0]) if lines else None
+    kind = header.group(1).lower() if header else 'unknown'
+    if kind == 'graph':
+        kind = 'flowchart'
+    graph = MermaidGraph(kind, (header.group(2) or 'TB').upper() if header and kind == 'flowchart' else 'TB')
+    body = lines[1:]
+
+    if kind == 'flowchart':
+        depth = 0
+        for line in body:
+            if line.startswith('subgraph'):
+                depth += 1
+                graph.subgraph_depth = max(graph.subgraph_depth, depth)
+                continue
+            if line == 'end':
+                depth = max(0, depth - 1)
+                continue
+            if line.startswith(FLOWCHART_SKIP):
+                continue
+            line = TEXT_ARROW_PATTERN.sub('-->', EDGE_LABEL_PATTERN.sub('', line))
+            for node_id, label in NODE_PATTERN.findall(line):
+                graph.add_node(node_id, label)
+            line = NODE_PATTERN.sub(lambda m: m.group(1), line)
+            groups = [group for group in (re.findall(r'\w+', part) for part in ARROW_PATTERN.split(line)) if group]
+            for group in groups:
+                for node_id in group:
+                    graph.add_node(node_id)
+            for sources, targets in zip(groups, groups[1:]):
+                graph.edges.extend((source, target) for source in sources for target in targets)
+    elif kind == 'sequencediagram':
+        for line in body:
+            participant = re.match(r'(?:participant|actor)\s+(\S+)(?:\s+as\s+(.+))?', line)
+            if participant:
+                graph.items.append(participant.group(2) or participant.group(1))
+                continue
+            message = re.match(r'([^-\s]+)\s*-[->x)]+\+?-?\s*([^:]+):', line)
+            if message:
+                for name in message.groups():
+                    if name.strip() not in graph.items:
+                        graph.items.append(name.strip())
+                graph.rows += 1
+            elif re.match(r'(alt|else|opt|loop|par|and|critical|break|rect|note)\b', line, re.IGNORECASE):
+                graph.rows += 1
+    elif kind == 'gantt':
+        for line in body:
+            if line.startswith('title'):
+                graph.title = line[5:].strip()
+            elif line.startswith('section'):
+                graph.rows += 1
+            elif ':' in line and not line.startswith(('dateFormat', 'axisFormat', 'excludes', 'todayMarker')):
+                graph.items.append(line.split(':', 1)[0].strip())
+        graph.rows += len(graph.items)
+    elif kind == 'pie':
+        title = re.search(r'\btitle\s+(.+)', lines[0]) if lines else None
+        graph.title = title.group(1) if title else ''
+        for line in body:
+            if line.startswith('title'):
+                graph.title = line[5:].strip()
+            elif ':' in line:
+                graph.items.append(line.split(':', 1)[0].strip().strip('"'))
+    else:
+        graph.rows = len(body)
+    return graph
+
+def _ranks(graph):
+    """Rangul fiecărui nod: cel mai lung drum de la o sursă (muchiile înapoi din cicluri sunt ignorate)"""
+    successors = {node: [] for node in graph.nodes}
+    for source, target in graph.edges:
+        if source != target:
+            successors[source].append(target)
+
+    # DFS iterativ (un lanț lung ar depăși limita de recursivitate); order = ordinea post-order
+    order, visited = [], set()
+    for root in graph.nodes:
+        if root in visited:
+            continue
+        visited.add(root)
+        stack = [(root, iter(successors[root]))]
+        while stack:
+            node, targets = stack[-1]
+            target = next((t for t in targets if t not in visited), None)
+            if target is None:
+                stack.pop()
+                order.append(node)
+            else:
+                visited.add(target)
+                stack.append((target, iter(successors[target])))
+
+    position = {node: idx for idx, node in enumerate(reversed(order))}
+    ranks = {node: 0 for node in graph.nodes}
+    for node in reversed(order):
+        for target in successors[node]:
+            if position[target] > position[node]:
+                ranks[target] = max(ranks[target], ranks[node] + 1)
+    return ranks
+
+def flowchart_footprint(graph):
+    """Dimensiunea naturală (lățime, înălțime) a unui flowchart"""
+    if not graph.nodes:
+        return MIN_RENDER_WIDTH, MIN_RENDER_HEIGHT
+    ranks = _ranks(graph)
+    layers = {}
+    for node, rank in ranks.items():
+        layers.setdefault(rank, []).append(node_size(graph.nodes[node]))
+
+    horizontal = graph.direction in ('LR', 'RL')
+    breadths, extents = [], []
+    for sizes in layers.values():
+        across = [height if horizontal else width for width, height in sizes]
+        along = [width if horizontal else height for width, height in sizes]
+        breadths.append(sum(across) + NODE_SEP * (len(across) - 1))
+        extents.append(max(along))
+    breadth = max(breadths)
+    extent = sum(extents) + RANK_SEP * (len(extents) - 1)
+    padding = 2 * SUBGRAPH_PADDING * graph.subgraph_depth
+    width, height = (extent, breadth) if horizontal else (breadth, extent)
+    return width + padding + 2 * DIAGRAM_PADDING, height + padding + 2 * DIAGRAM_PADDING
+
+def footprint(graph, content_width=DEFAULT_CONTENT_WIDTH):
+    """Dimensiunea naturală estimată a diagramei, în px CSS"""
+    if graph.kind == 'flowchart':
+        return flowchart_footprint(graph)
+    if graph.kind == 'sequencediagram':
+        column = max([SEQUENCE_ACTOR_WIDTH] + [len(name) * CHAR_WIDTH + NODE_PADDING for name in graph.items])
+        width = len(graph.items) * (column + SEQUENCE_ACTOR_MARGIN)
+        return width, graph.rows * SEQUENCE_MESSAGE_HEIGHT + 4 * SEQUENCE_MESSAGE_HEIGHT
+    if graph.kind == 'gantt':
+        # Gantt-ul ocupă lățimea containerului: randat la 1.5× pagina, etichetele rămân lizibile după micșorare
+        return content_width * GANTT_PAGE_WIDTHS, graph.rows * GANTT_ROW_HEIGHT + 120
+    if graph.kind == 'pie':
+        legend = max([len(label) for label in graph.items] or [0]) * CHAR_WIDTH + 60
+        return PIE_DIAMETER + legend, PIE_DIAMETER + (LINE_HEIGHT if graph.title else 0)
+    return content_width, max(MIN_RENDER_HEIGHT, graph.rows * LINE_HEIGHT * 2)
+
+def parse_directives(mermaid_code):
+    """Directivele %% pdf: key=value din bloc (size, width, height); valorile invalide sau ≤ 0 sunt ignorate"""
+    directives = {}
+    for line in DIRECTIVE_PATTERN.findall(mermaid_code):
+        for key, value in re.findall(r'(\w+)\s*=\s*(\S+)', line):
+            if key == 'size':
+                if value in SIZE_CLASS_WIDTH:
+                    directives[key] = value
+                else:
+                    print(f"  ⚠️ Directivă pdf ignorată: size={value} (small, medium sau large)")
+                continue
+            try:
+                number = int(float(value))
+            except (ValueError, OverflowError):
+                number = 0
+            # O dimensiune nulă sau negativă ar ajunge ca viewport invalid la mmdc
+            if number <= 0:
+                print(f"  ⚠️ Directivă pdf ignorată: {key}={value} (se așteaptă un număr pozitiv)")
+                continue
+            directives[key] = number
+    return directives
+
+def fit_to_page(width, height, content_width=DEFAULT_CONTENT_WIDTH, max_height=MAX_DIAGRAM_HEIGHT):
+    """
+    Potrivește dimensiunea naturală în pagină; întoarce (lățime, înălțime de randare, clasă).
+    O diagramă prea lată este randată la dimensiunea naturală și micșorată de max-width-ul clasei;
+    una prea înaltă este randată direct mai îngust (Mermaid o scalează la lățimea viewport-ului),
+    pentru că CSS-ul limitează doar lățimea. Clasa: small dacă încape în 70% din lățime (și un
+    flowchart înalt și îngust, ca în dimensiunile alese manual înainte), altfel large dacă ocupă
+    aproape toată pagina, medium în rest.
+    """
+    height_scale = max_height / height
+    if height_scale < min(1.0, content_width / width):
+        width, height = width * height_scale, max_height
+    printed_width = min(width, content_width)
+    if printed_width <= SIZE_CLASS_WIDTH['small'] * content_width:
+        size = 'small'
+    elif height * printed_width / width > LARGE_DIAGRAM_HEIGHT:
+        size = 'large'
+    else:
+        size = 'medium'
+    return int(round(width)), int(round(height)), size
+
+def size_diagram(mermaid_code, content_width=DEFAULT_CONTENT_WIDTH):
+    """Sizer-ul implicit: cod Mermaid → (lățime, înălțime, 'large'|'medium'|'small')"""
+    width, height = footprint(parse_mermaid(mermaid_code), content_width)
+    width, height, size = fit_to_page(min(MAX_RENDER_WIDTH, max(MIN_RENDER_WIDTH, width)),
+                                      max(MIN_RENDER_HEIGHT, height), content_width)
+
+    directives = parse_directives(mermaid_code)
+    if directives:
+        width = directives.get('width', width)
+        height = directives.get('height', height)
+        size = directives.get('size', size)
+        print(f"  📏 Directivă pdf: {width}x{height} {size}")
+    return width, height, size
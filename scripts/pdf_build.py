@@ -0,0 +1,572 @@
+#!/usr/bin/env python3
+"""
+Build PDF unificat pentru documentația primariaTa
+Înlocuiește logica din generate_pdf.py, generate_raport_pdf.py și generate_deployment_pdf.py
+
+Documentele sunt descrise în pdf_documents.json (sursă, PDF, stylesheets, antet,
+reguli de page break, reguli HTML). Un singur proces construiește oricâte
+documente și refolosește între ele:
+    - FontConfiguration-ul WeasyPrint
+    - stylesheet-urile parsate (CSS)
+    - instanțele Markdown (cu extensia Mermaid)
+    - rendererul de diagrame (cache + worker batch din mermaid_render)
+
+Utilizare:
+    python3 scripts/pdf_build.py                     # toate documentele din manifest
+    python3 scripts/pdf_build.py raport arhitectura  # doar documentele numite
+    python3 scripts/pdf_build.py --jobs 3            # documentele în paralel, pe procese separate
+    python3 scripts/pdf_build.py --list
+    python3 scripts/pdf_build.py --force             # reconstruiește și documentele la zi
+    python3 scripts/pdf_build.py --check             # exit 1 dacă există documente neactualizate
+    python3 scripts/pdf_build.py --chapters 4        # layout pe capitole, în paralel (vezi pdf_chapters.py)
+    python3 scripts/pdf_build.py --profile           # + profil cProfile al layout-ului (<pdf>.layout.prof)
+
+Build incremental: pentru fiecare document (după calea absolută a PDF-ului) sunt
+păstrate (în PDF_BUILD_STATE, implicit scripts/.pdf-build-state.json, ignorat de
+git, deci propriu fiecărui checkout) hash-urile Markdown-ului, stylesheet-urilor,
+diagramelor, intrării din manifest și setărilor de randare. Un document al cărui
+PDF există și ale cărui intrări nu s-au schimbat este sărit; la un document
+modificat, doar diagramele noi sau modificate ajung la mmdc (restul vin din cache).
+
+Raport de build: lângă fiecare PDF generat este scris <pdf>.build.json cu timpul
+pe etape (citire, Markdown, Mermaid, HTML, layout, scriere) cu memoria maximă a
+procesului până la finalul fiecărei etape (ru_maxrss, deci cumulativă),
+timpul, clasa de dimensiune și mărimea fiecărei diagrame, numărul de pagini și
+mărimea PDF-ului. Cu --profile, faza de layout este rulată sub cProfile, iar
+profilul este salvat în <pdf>.layout.prof (python3 -m pstats <fișier>).
+"""
+
+import argparse
+import cProfile
+import hashlib
+import json
+import os
+import re
+import sys
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from pathlib import Path
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import markdown
+
+from diagram_images import DIAGRAM_DPI, DIAGRAM_PNG_COLORS, stylesheets_content_width
+from mermaid_markdown import MermaidExtension, mermaid_blocks
+from mermaid_render import (CACHE_VERSION, DIAGRAM_FORMAT, IMAGE_MODE, MERMAID_CONFIG, default_cache,
+                            diagram_url_fetcher, release_images, renderer_version)
+
+SCRIPT_DIR = Path(__file__).parent
+DEFAULT_MANIFEST = SCRIPT_DIR / 'pdf_documents.json'
+# În checkout (nu în $TMPDIR, care dispare la repornire / în containere noi), ignorat de git
+BUILD_STATE_PATH = Path(os.environ.get('PDF_BUILD_STATE', SCRIPT_DIR / '.pdf-build-state.json'))
+
+# Codul care produce PDF-ul: o modificare aici invalidează toate documentele
+ENGINE_FILES = [SCRIPT_DIR / name for name in ('pdf_build.py', 'pdf_chapters.py', 'mermaid_markdown.py',
+                                                'mermaid_render.py', 'mermaid_sizing.py', 'diagram_images.py')]
+BUILD_STATE_VERSION = 1
+
+def load_manifest(manifest_path=DEFAULT_MANIFEST):
+    """Citește manifestul; căile sunt relative la directorul manifestului"""
+    manifest_path = Path(manifest_path)
+    with open(manifest_path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    documents = []
+    for doc in manifest['documents']:
+        doc = dict(doc)
+        for key in ('input', 'output'):
+            doc[key] = (manifest_path.parent / doc[key]).resolve()
+        doc['stylesheets'] = [(manifest_path.parent / path).resolve() for path in doc.get('stylesheets', [])]
+        doc.setdefault('title', doc.get('header', doc['name']))
+        doc.setdefault('markdown_extensions', ['tables', 'fenced_code'])
+        doc.setdefault('page_breaks', [])
+        doc.setdefault('html_rules', [])
+        documents.append(doc)
+    return documents
+
+def select_documents(documents, names):
+    """Documentele cu numele date (toate dacă lista e goală)"""
+    if not names:
+        return documents
+    by_name = {doc['name']: doc for doc in documents}
+    unknown = [name for name in names if name not in by_name]
+    if unknown:
+        raise SystemExit(f"❌ Documente necunoscute în manifest: {', '.join(unknown)} "
+                         f"(disponibile: {', '.join(by_name)})")
+    return [by_name[name] for name in names]
+
+def apply_page_breaks(md_content, rules):
+    """
+    Aplică regulile de page break din manifest pe Markdown:
+        {"pattern": regex, "replacement": ..., "count": n}   înlocuire regex (count 0 = toate)
+        {"before": text, "class": "section-break", "count": n} div înainte de text literal
+    """
+    for rule in rules:
+        count = rule.get('count', 0)
+        if 'pattern' in rule:
+            md_content = re.sub(rule['pattern'], rule['replacement'], md_content, count=count)
+        elif rule['before'] in md_content:
+            md_content = md_content.replace(
+                rule['before'],
+                f'<div class="{rule.get("class", "page-break")}"></div>\n\n{rule["before"]}',
+                count or -1
+            )
+    return md_content
+
+def apply_html_rules(html_content, rules):
+    """Aplică regulile regex din manifest pe HTML-ul generat (ex. footer centrat)"""
+    for rule in rules:
+        html_content = re.sub(rule['pattern'], rule['replacement'], html_content,
+                              count=rule.get('count', 0), flags=re.DOTALL)
+    return html_content
+
+def html_document(html_body, title):
+    """Template HTML complet"""
+    return f"""
+<!DOCTYPE html>
+<html lang="ro">
+<head>
+    <meta charset="UTF-8">
+    <title>{title}</title>
+</head>
+<body>
+{html_body}
+</body>
+</html>
+"""
+
+def header_css(header):
+    """Antetul paginii (textul din @top-center) pentru un document"""
+    text = header.replace('\\', '\\\\').replace('"', '\\"')
+    return f'@page {{ @top-center {{ content: "{text}"; }} }}'
+
+def stylesheet_sources(doc, extra_css=None):
+    """Sursele CSS ale unui document, în ordine: (cale, None) pentru fișiere, (None, text) pentru CSS inline"""
+    sources = [(path, None) for path in doc['stylesheets']]
+    if doc.get('header'):
+        sources.append((None, header_css(doc['header'])))
+    for css in (doc.get('css'), extra_css):
+        if css:
+            sources.append((None, css))
+    return sources
+
+def peak_rss_mb(who='self'):
+    """Memoria maximă (RSS) a procesului curent sau a proceselor copil terminate (mmdc), în MB"""
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN if who == 'children' else resource.RUSAGE_SELF)
+    # ru_maxrss este în KB pe Linux și în bytes pe macOS
+    return round(usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def report_path(output_path, suffix='.build.json'):
+    """Calea unui fișier de raport lângă PDF (ex. DEPLOYMENT_PLAN.build.json)"""
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.stem + suffix)
+
+@contextmanager
+def profiled(profiler):
+    """Activează profiler-ul (cProfile.Profile sau None) pe durata blocului"""
+    if profiler:
+        profiler.enable()
+    try:
+        yield
+    finally:
+        if profiler:
+            profiler.disable()
+
+class BuildReport:
+    """Timpii, memoria și statisticile unui build, scrise ca JSON lângă PDF"""
+
+    def __init__(self, doc):
+        self.started = time.perf_counter()
+        self.data = {
+            'document': doc['name'],
+            'output': str(doc['output']),
+            'generated_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'stages': [],
+            'diagrams': [],
+        }
+
+    @contextmanager
+    def stage(self, name):
+        """Măsoară o etapă; dict-ul întors poate primi câmpuri suplimentare"""
+        record = {'stage': name}
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record['seconds'] = round(time.perf_counter() - started, 3)
+            # ru_maxrss este maximul de la pornirea procesului, nu al etapei: după etapa cea mai
+            # costisitoare toate etapele arată aceeași valoare
+            record['max_rss_so_far_mb'] = peak_rss_mb()
+            self.data['stages'].append(record)
+
+    def finish(self, **fields):
+        """Completează raportul (total, memorie, câmpuri date) și îl scrie lângă PDF"""
+        self.data.update(fields)
+        self.data['seconds'] = round(time.perf_counter() - self.started, 3)
+        self.data['peak_rss_mb'] = peak_rss_mb()
+        self.data['children_peak_rss_mb'] = peak_rss_mb('children')
+        output_path = Path(self.data['output'])
+        if output_path.exists():
+            self.data['output_bytes'] = output_path.stat().st_size
+        path = report_path(output_path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, indent=2, ensure_ascii=False)
+        return path
+
+class PDFBuilder:
+    """Construiește documente din manifest, refolosind fonturile, CSS-ul și parserul Markdown"""
+
+    def __init__(self):
+        self._font_config = None
+        self._stylesheets = {}
+        self._markdown = {}
+
+    @property
+    def font_config(self):
+        """
+        FontConfiguration-ul WeasyPrint, creat la prima folosire: WeasyPrint este importat doar când
+        chiar se generează un PDF (un build fără modificări sau previzualizarea HTML nu îl încarcă)
+        """
+        if self._font_config is None:
+            from weasyprint.text.fonts import FontConfiguration
+            self._font_config = FontConfiguration()
+        return self._font_config
+
+    def stylesheet(self, path=None, string=None):
+        """CSS parsat o singură dată per proces (după cale sau conținut)"""
+        from weasyprint import CSS
+        key = ('file', str(path)) if path else ('string', string)
+        if key not in self._stylesheets:
+            if path:
+                self._stylesheets[key] = CSS(filename=str(path), font_config=self.font_config)
+            else:
+                self._stylesheets[key] = CSS(string=string, font_config=self.font_config)
+        return self._stylesheets[key]
+
+    def document_stylesheets(self, doc, extra_css=None):
+        """Stylesheet-urile unui document: fișierele din manifest, antetul, CSS-ul inline"""
+        return [self.stylesheet(path=path, string=string) for path, string in stylesheet_sources(doc, extra_css)]
+
+    def markdown(self, extensions):
+        """Instanța Markdown (și extensia Mermaid) pentru un set de extensii, refolosită între documente"""
+        key = tuple(extensions)
+        if key not in self._markdown:
+            mermaid = MermaidExtension()
+            self._markdown[key] = (markdown.Markdown(extensions=[mermaid, *extensions]), mermaid)
+        md, mermaid = self._markdown[key]
+        md.reset()
+        return md, mermaid
+
+    def convert(self, md_content, extensions, temp_dir=None, content_width=0):
+        """
+        Markdown → HTML; întoarce (html, extensia Mermaid cu statisticile diagramelor).
+        content_width (px CSS) este lățimea paginii pentru care sunt optimizate PNG-urile.
+        """
+        md, mermaid = self.markdown(extensions)
+        mermaid.setConfig('temp_dir', str(temp_dir or ''))
+        mermaid.setConfig('content_width', content_width)
+        return md.convert(md_content), mermaid
+
+    def markdown_to_html(self, md_content, extensions, temp_dir=None, content_width=0):
+        """Markdown → HTML; blocurile ```mermaid sunt renderizate în temp_dir. Întoarce (html, nr. diagrame)"""
+        html_body, mermaid = self.convert(md_content, extensions, temp_dir, content_width)
+        return html_body, len(mermaid.blocks)
+
+    def render(self, html_body, stylesheets, title):
+        """Layout WeasyPrint (Document cu paginile așezate); diagramele referite sunt citite de url_fetcher"""
+        from weasyprint import HTML
+        html = HTML(string=html_document(html_body, title), base_url='.', url_fetcher=diagram_url_fetcher())
+        return html.render(stylesheets=stylesheets, font_config=self.font_config)
+
+    def write_pdf(self, html_body, output_path, stylesheets, title):
+        """Generează PDF-ul cu WeasyPrint"""
+        self.render(html_body, stylesheets, title).write_pdf(str(output_path))
+
+    def write_pdf_chapters(self, html_body, output_path, doc, chapter_jobs, verify=False):
+        """
+        Layout pe capitole în chapter_jobs procese; cu verify compară rezultatul cu build-ul serial.
+        Cu un singur capitol sau un singur proces efectiv, layout-ul serial (cele două treceri ar dubla
+        munca). Întoarce (nr. capitole, nr. pagini).
+        """
+        from pdf_chapters import chapter_ranges, compare_pdfs, write_pdf_chapters
+        html_string = html_document(html_body, doc['title'])
+        ranges, children = chapter_ranges(html_string, diagram_url_fetcher())
+        if min(chapter_jobs, len(ranges)) < 2:
+            print(f"🧩 [{doc['name']}] {len(ranges)} capitol(e), {chapter_jobs} proces(e): layout serial")
+            document = self.render(html_body, self.document_stylesheets(doc), doc['title'])
+            document.write_pdf(str(output_path))
+            return len(ranges), len(document.pages)
+
+        chapters, pages = write_pdf_chapters(html_string, output_path, stylesheet_sources(doc), chapter_jobs,
+                                             (ranges, children))
+        print(f"🧩 [{doc['name']}] {chapters} capitole, {pages} pagini")
+        if verify:
+            with tempfile.TemporaryDirectory() as verify_dir:
+                serial_path = Path(verify_dir) / 'serial.pdf'
+                self.write_pdf(html_body, serial_path, self.document_stylesheets(doc), doc['title'])
+                differences = compare_pdfs(serial_path, output_path)
+            if differences:
+                raise RuntimeError(f"[{doc['name']}] PDF-ul pe capitole diferă de cel serial: {'; '.join(differences)}")
+            print(f"🔍 [{doc['name']}] Identic pagină cu pagină cu build-ul serial")
+        return chapters, pages
+
+    def build(self, doc, chapter_jobs=0, verify=False, profile=False):
+        """
+        Construiește un document din manifest; întoarce un rezumat al build-ului.
+        Raportul pe etape este scris în <pdf>.build.json; cu profile, layout-ul rulează sub cProfile
+        (doar serial: pe capitole layout-ul are loc în alte procese).
+        """
+        if profile and chapter_jobs > 1:
+            raise ValueError("profile nu poate fi combinat cu layout-ul pe capitole")
+        report = BuildReport(doc)
+        hits, misses = default_cache.hits, default_cache.misses
+        print(f"📖 [{doc['name']}] Citesc documentul: {doc['input']}")
+        with report.stage('read'):
+            md_content = doc['input'].read_text(encoding='utf-8')
+            md_content = apply_page_breaks(md_content, doc['page_breaks'])
+
+        # Director temporar pentru imaginile Mermaid ale acestui document
+        temp_dir = tempfile.mkdtemp()
+        try:
+            print(f"🔄 [{doc['name']}] Convertesc Markdown → HTML și renderez diagramele Mermaid...")
+            with report.stage('markdown') as stage:
+                html_body, mermaid = self.convert(md_content, doc['markdown_extensions'], temp_dir,
+                                                  stylesheets_content_width(doc['stylesheets']))
+            # Randarea și optimizarea diagramelor au loc în timpul conversiei Markdown; le raportez ca etape separate
+            stage['seconds'] = round(stage['seconds'] - mermaid.render_seconds - mermaid.optimize_seconds, 3)
+            for name, seconds in (('mermaid', mermaid.render_seconds), ('images', mermaid.optimize_seconds)):
+                report.data['stages'].append({'stage': name, 'seconds': round(seconds, 3),
+                                              'max_rss_so_far_mb': stage['max_rss_so_far_mb']})
+            report.data['diagrams'] = mermaid.diagrams
+            diagrams = len(mermaid.blocks)
+
+            with report.stage('html'):
+                html_body = apply_html_rules(html_body, doc['html_rules'])
+                stylesheets = self.document_stylesheets(doc)
+
+            print(f"📄 [{doc['name']}] Generare PDF în curs...")
+            profiler = cProfile.Profile() if profile else None
+            if chapter_jobs > 1:
+                with report.stage('layout') as stage:
+                    stage['chapters'], pages = self.write_pdf_chapters(html_body, doc['output'], doc,
+                                                                       chapter_jobs, verify)
+            else:
+                with report.stage('layout'), profiled(profiler):
+                    document = self.render(html_body, stylesheets, doc['title'])
+                pages = len(document.pages)
+                with report.stage('write'):
+                    document.write_pdf(str(doc['output']))
+        finally:
+            shutil.rmtree(temp_dir)
+            release_images(temp_dir)
+
+        if profiler:
+            report.data['profile'] = str(report_path(doc['output'], '.layout.prof'))
+            profiler.dump_stats(report.data['profile'])
+        cache_hits, cache_misses = default_cache.hits - hits, default_cache.misses - misses
+        build_report = report.finish(pages=pages, cache_hits=cache_hits, cache_misses=cache_misses)
+        seconds = report.data['seconds']
+        slowest = max(report.data['stages'], key=lambda record: record['seconds'])
+        print(f"✅ [{doc['name']}] PDF generat cu succes: {doc['output']} ({diagrams} diagrame, {pages} pagini, "
+              f"{seconds:.1f}s, cel mai lent: {slowest['stage']} {slowest['seconds']:.1f}s)")
+        return {'name': doc['name'], 'output': str(doc['output']), 'diagrams': diagrams, 'seconds': round(seconds, 2),
+                'cache_hits': cache_hits, 'cache_misses': cache_misses, 'pages': pages, 'report': str(build_report)}
+
+def _sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+def file_hash(path):
+    """Hash-ul conținutului unui fișier ('missing' dacă nu există)"""
+    try:
+        return _sha256(Path(path).read_bytes())
+    except FileNotFoundError:
+        return 'missing'
+
+def render_settings():
+    """Setările care schimbă PDF-ul fără să schimbe sursele: format diagrame, mermaid-cli, codul build-ului"""
+    return {
+        'diagram_format': DIAGRAM_FORMAT,
+        'image_mode': IMAGE_MODE,
+        'image_dpi': DIAGRAM_DPI,
+        'image_colors': DIAGRAM_PNG_COLORS,
+        'mermaid_config': MERMAID_CONFIG,
+        'renderer': renderer_version(),
+        'cache_version': CACHE_VERSION,
+        'engine': {path.name: file_hash(path) for path in ENGINE_FILES},
+    }
+
+def document_inputs(doc, settings=None):
+    """Hash-urile intrărilor unui document, pe categorii (folosite pentru a explica de ce e reconstruit)"""
+    md_content = doc['input'].read_text(encoding='utf-8')
+    entry = {key: value for key, value in doc.items() if key not in ('input', 'output', 'stylesheets')}
+    return {
+        'markdown': _sha256(md_content.encode('utf-8')),
+        'stylesheets': {path.name: file_hash(path) for path in doc['stylesheets']},
+        'diagrams': [_sha256(code.encode('utf-8')) for code in mermaid_blocks(md_content)],
+        'manifest': _sha256(json.dumps(entry, sort_keys=True, ensure_ascii=False).encode('utf-8')),
+        'settings': _sha256(json.dumps(settings or render_settings(), sort_keys=True).encode('utf-8')),
+    }
+
+class BuildState:
+    """Starea ultimului build reușit al fiecărui document (după calea absolută a PDF-ului)"""
+
+    def __init__(self, path=BUILD_STATE_PATH):
+        self.path = Path(path)
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                state = json.load(f)
+        except (FileNotFoundError, ValueError):
+            state = {}
+        self.documents = state.get('documents', {}) if state.get('version') == BUILD_STATE_VERSION else {}
+
+    @staticmethod
+    def key(doc):
+        return str(Path(doc['output']).resolve())
+
+    def stale_reasons(self, doc, inputs):
+        """Motivele pentru care documentul trebuie reconstruit (listă goală = la zi)"""
+        entry = self.documents.get(self.key(doc))
+        if not doc['output'].exists():
+            return ['PDF lipsă']
+        if entry is None:
+            return ['fără build anterior']
+        if file_hash(doc['output']) != entry.get('output'):
+            return ['PDF modificat în afara build-ului']
+
+        previous = entry.get('inputs', {})
+        reasons = []
+        for key in ('markdown', 'manifest', 'settings'):
+            if inputs[key] != previous.get(key):
+                reasons.append(key)
+        changed_styles = [name for name, digest in inputs['stylesheets'].items()
+                          if previous.get('stylesheets', {}).get(name) != digest]
+        if changed_styles or len(inputs['stylesheets']) != len(previous.get('stylesheets', {})):
+            reasons.append(f"stylesheet {', '.join(changed_styles) or 'eliminat'}")
+        new_diagrams = set(inputs['diagrams']) - set(previous.get('diagrams', []))
+        if new_diagrams:
+            reasons.append(f"{len(new_diagrams)} diagrame noi/modificate")
+        return reasons
+
+    def record(self, doc, inputs):
+        self.documents[self.key(doc)] = {
+            'name': doc['name'],
+            'inputs': inputs,
+            'output': file_hash(doc['output']),
+            'built_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        }
+
+    def save(self):
+        """Scriere atomică (tmp + replace), ca un build întrerupt să nu strice starea"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(f'{self.path.name}.{os.getpid()}.tmp')
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': BUILD_STATE_VERSION, 'documents': self.documents}, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
+
+_builder = None
+
+def default_builder():
+    """Builder-ul procesului curent (creat la prima folosire)"""
+    global _builder
+    if _builder is None:
+        _builder = PDFBuilder()
+    return _builder
+
+def _build_in_worker(doc, profile=False):
+    return default_builder().build(doc, profile=profile)
+
+def build_documents(documents, jobs=1, chapter_jobs=0, verify=False, profile=False):
+    """
+    Construiește documentele în ordine, în procesul curent, sau cu jobs > 1
+    pe un pool de procese (fiecare proces are propriul builder și renderer de diagrame).
+    Cu chapter_jobs > 1 paralelismul este în interiorul documentului (capitole), iar documentele merg pe rând.
+    """
+    if chapter_jobs > 1:
+        builder = default_builder()
+        return [builder.build(doc, chapter_jobs, verify, profile) for doc in documents]
+    if jobs > 1 and len(documents) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(documents))) as pool:
+            return list(pool.map(partial(_build_in_worker, profile=profile), documents))
+    builder = default_builder()
+    return [builder.build(doc, profile=profile) for doc in documents]
+
+def plan_builds(documents, state, force=False):
+    """Împarte documentele în (de reconstruit cu hash-urile intrărilor, la zi)"""
+    settings = render_settings()
+    stale, fresh = [], []
+    for doc in documents:
+        inputs = document_inputs(doc, settings)
+        reasons = ['--force'] if force else state.stale_reasons(doc, inputs)
+        if reasons:
+            print(f"🔁 [{doc['name']}] de reconstruit: {', '.join(reasons)}")
+            stale.append((doc, inputs))
+        else:
+            print(f"⏭️ [{doc['name']}] la zi: {doc['output']}")
+            fresh.append(doc)
+    return stale, fresh
+
+def build_named(*names, manifest_path=DEFAULT_MANIFEST, jobs=1, force=False, state_path=BUILD_STATE_PATH,
+                chapter_jobs=0, verify=False, profile=False):
+    """Construiește documentele numite din manifest (toate dacă nu e dat niciun nume), doar pe cele neactualizate"""
+    state = BuildState(state_path)
+    stale, _ = plan_builds(select_documents(load_manifest(manifest_path), names), state, force)
+    if not stale:
+        return []
+
+    results = build_documents([doc for doc, _ in stale], jobs, chapter_jobs, verify, profile)
+    for doc, inputs in stale:
+        state.record(doc, inputs)
+    state.save()
+
+    hits = sum(result['cache_hits'] for result in results)
+    misses = sum(result['cache_misses'] for result in results)
+    print(f"♻️ Cache diagrame: {hits} reutilizate, {misses} renderizate")
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Construiește documentele PDF din manifest')
+    parser.add_argument('documents', nargs='*', help='Numele documentelor (implicit toate)')
+    parser.add_argument('--manifest', default=str(DEFAULT_MANIFEST), help='Manifestul documentelor')
+    parser.add_argument('--jobs', type=int, default=1, help='Documente construite în paralel (procese)')
+    parser.add_argument('--list', action='store_true', help='Afișează documentele din manifest')
+    parser.add_argument('--force', action='store_true', help='Reconstruiește și documentele la zi')
+    parser.add_argument('--check', action='store_true', help='Doar verifică; exit 1 dacă există documente neactualizate')
+    parser.add_argument('--state', default=str(BUILD_STATE_PATH), help='Fișierul cu starea build-urilor')
+    parser.add_argument('--chapters', type=int, default=0, metavar='N',
+                        help='Layout pe capitole în N procese, cu merge (necesită pypdf)')
+    parser.add_argument('--verify-chapters', action='store_true',
+                        help='Cu --chapters: compară PDF-ul rezultat cu build-ul serial')
+    parser.add_argument('--profile', action='store_true',
+                        help='Rulează layout-ul sub cProfile și salvează profilul lângă PDF (<pdf>.layout.prof)')
+    args = parser.parse_args(argv)
+    if args.profile and args.chapters > 1:
+        parser.error('--profile măsoară doar procesul curent; cu --chapters layout-ul rulează în alte procese')
+
+    if args.list:
+        for doc in load_manifest(args.manifest):
+            print(f"{doc['name']}: {doc['input']} → {doc['output']}")
+        return
+
+    if args.check:
+        documents = select_documents(load_manifest(args.manifest), args.documents)
+        stale, _ = plan_builds(documents, BuildState(args.state))
+        sys.exit(1 if stale else 0)
+
+    started = time.perf_counter()
+    results = build_named(*args.documents, manifest_path=args.manifest, jobs=args.jobs,
+                          force=args.force, state_path=args.state, chapter_jobs=args.chapters,
+                          verify=args.verify_chapters, profile=args.profile)
+    print(f"📚 {len(results)} documente generate în {time.perf_counter() - started:.1f}s")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Layout WeasyPrint pe capitole, în paralel, cu merge într-un singur PDF
+Folosit de pdf_build.py (--chapters N)
+
+Documentul este împărțit la div-urile page-break / section-break (care forțează
+deja o pagină nouă). Fiecare proces primește tot HTML-ul, dar afișează doar
+capitolul lui (restul copiilor din <body> au display: none), astfel încât
+selectorii CSS (:first-of-type etc.) se comportă ca în build-ul serial.
+
+    Trecerea 1 (paralel): layout per capitol → numărul de pagini
+    Trecerea 2 (paralel): layout per capitol cu @page :first { counter-reset: page N }
+                          și counter(pages) înlocuit cu totalul → PDF per capitol
+    Merge (pypdf):        pagini + destinații numite, link-urile între capitole
+                          și bookmark-urile refăcute pe tot documentul
+
+Limitări: contoarele CSS care trec dintr-un capitol în altul (altele decât
+page/pages) și regulile @page :left/:right nu sunt suportate.
+
+Dependență opțională: pip install pypdf
+"""
+
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+# Scara WeasyPrint: 1px CSS = 0.75pt PDF
+PX_TO_PT = 0.75
+
+def require_pypdf():
+    """pypdf este necesar doar pentru merge; eroare clară dacă lipsește"""
+    try:
+        import pypdf
+    except ImportError:
+        raise SystemExit("❌ Layout-ul pe capitole necesită pypdf: pip install pypdf")
+    return pypdf
+
+def chapter_ranges(html_string, url_fetcher=None):
+    """
+    Intervalele [start, end) de copii ai <body> pentru fiecare capitol și numărul total de copii.
+    Un capitol nou începe la un div section-break sau după un div page-break.
+    """
+    from weasyprint import HTML
+
+    body = HTML(string=html_string, url_fetcher=url_fetcher).etree_element.find('body')
+    children = list(body)
+    starts = [0]
+    for idx, child in enumerate(children):
+        classes = (child.get('class') or '').split()
+        if 'section-break' in classes and idx > 0:
+            starts.append(idx)
+        elif 'page-break' in classes:
+            starts.append(idx + 1)
+    starts = sorted(set(start for start in starts if start < len(children)))
+    ends = starts[1:] + [len(children)]
+    return list(zip(starts, ends)), len(children)
+
+def chapter_css(start, end, children, page_offset=0):
+    """CSS care ascunde celelalte capitole și continuă numerotarea paginilor"""
+    hidden = []
+    if start > 0:
+        hidden.append(f'body > :nth-child(-n+{start})')
+    if end < children:
+        hidden.append(f'body > :nth-child(n+{end + 1})')
+    rules = [', '.join(hidden) + ' { display: none !important; }'] if hidden else []
+    if page_offset:
+        rules.append(f'@page :first {{ counter-reset: page {page_offset + 1}; }}')
+    return '\n'.join(rules)
+
+def _chapter_stylesheets(builder, sources, total_pages):
+    """Stylesheet-urile documentului; cu totalul cunoscut, counter(pages) devine text fix"""
+    stylesheets = []
+    for path, string in sources:
+        if total_pages is None:
+            stylesheets.append(builder.stylesheet(path=path, string=string))
+        else:
+            text = Path(path).read_text(encoding='utf-8') if path else string
+            stylesheets.append(builder.stylesheet(string=text.replace('counter(pages)', f'"{total_pages}"')))
+    return stylesheets
+
+def _layout_chapter(task):
+    """
+    Rulează într-un proces worker. Fără output_path întoarce doar numărul de pagini;
+    cu output_path scrie PDF-ul capitolului și întoarce ce trebuie refăcut la merge.
+    """
+    from weasyprint import CSS, HTML
+
+    from mermaid_render import diagram_url_fetcher, reference_image
+    from pdf_build import default_builder
+
+    # Procesul worker nu are neapărat referințele diagram: ale părintelui (token-ul depinde doar de cale)
+    for image_path in task['images']:
+        reference_image(image_path)
+    builder = default_builder()
+    stylesheets = _chapter_stylesheets(builder, task['stylesheets'], task.get('total_pages'))
+    stylesheets.append(CSS(string=chapter_css(task['start'], task['end'], task['children'], task.get('page_offset', 0)),
+                           font_config=builder.font_config))
+    html = HTML(string=task['html'], base_url='.', url_fetcher=diagram_url_fetcher())
+    document = html.render(stylesheets=stylesheets, font_config=builder.font_config)
+    if not task.get('output_path'):
+        return {'pages': len(document.pages)}
+
+    offset = task['page_offset']
+    anchors = set()
+    for page in document.pages:
+        anchors.update(page.anchors)
+
+    bookmarks, links = [], []
+    for page_number, page in enumerate(document.pages, start=offset):
+        for level, label, (x, y), state in page.bookmarks:
+            bookmarks.append((page_number, level, label, x * PX_TO_PT, (page.height - y) * PX_TO_PT, state))
+        # Link-urile către ancore din alte capitole sunt eliminate de WeasyPrint; le refac la merge
+        for link_type, target, (x1, y1, x2, y2), _ in page.links:
+            if link_type == 'internal' and target not in anchors:
+                rect = (x1 * PX_TO_PT, (page.height - y1) * PX_TO_PT, x2 * PX_TO_PT, (page.height - y2) * PX_TO_PT)
+                links.append((page_number, rect, target))
+
+    document.write_pdf(task['output_path'])
+    return {'pages': len(document.pages), 'anchors': sorted(anchors), 'bookmarks': bookmarks, 'links': links}
+
+def bookmark_tree(bookmarks):
+    """Arborele de bookmark-uri pe tot documentul (același algoritm ca WeasyPrint make_bookmark_tree)"""
+    root = []
+    skipped_levels = []
+    last_by_depth = [root]
+    previous_level = 0
+    for page_number, level, label, x, y, state in bookmarks:
+        if level > previous_level:
+            skipped_levels.append(level - previous_level - 1)
+        else:
+            temp = level
+            while temp < previous_level:
+                temp += 1 + skipped_levels.pop()
+            if temp > previous_level:
+                skipped_levels.append(temp - previous_level - 1)
+        previous_level = level
+        depth = level - sum(skipped_levels)
+        children = []
+        last_by_depth[depth - 1].append((label, (page_number, x, y), children, state))
+        del last_by_depth[depth:]
+        last_by_depth.append(children)
+    return root
+
+def merge_chapters(chapter_pdfs, chapters, output_path):
+    """Unește PDF-urile capitolelor: destinații numite, link-uri între capitole, bookmark-uri globale"""
+    pypdf = require_pypdf()
+    from pypdf.generic import ArrayObject, DictionaryObject, FloatObject, NameObject, NumberObject, TextStringObject
+    from pypdf.generic import Fit
+
+    writer = pypdf.PdfWriter()
+    for path in chapter_pdfs:
+        # Destinațiile numite (ancorele) sunt importate de pypdf; outline-ul îl refac mai jos
+        writer.append(str(path), import_outline=False)
+    metadata = pypdf.PdfReader(str(chapter_pdfs[0])).metadata
+    if metadata:
+        writer.add_metadata(metadata)
+
+    anchors = set().union(*(chapter['anchors'] for chapter in chapters))
+    for chapter in chapters:
+        for page_number, rect, target in chapter['links']:
+            if target not in anchors:
+                print(f"⚠️ Ancoră inexistentă: #{target}")
+                continue
+            writer.add_annotation(page_number, DictionaryObject({
+                NameObject('/Type'): NameObject('/Annot'),
+                NameObject('/Subtype'): NameObject('/Link'),
+                NameObject('/Rect'): ArrayObject([FloatObject(value) for value in rect]),
+                NameObject('/BS'): DictionaryObject({NameObject('/W'): NumberObject(0)}),
+                NameObject('/Dest'): TextStringObject(target),
+            }))
+
+    def add_outline(subtrees, parent=None):
+        for label, (page_number, x, y), children, state in subtrees:
+            item = writer.add_outline_item(label, page_number, parent=parent, fit=Fit.xyz(x, y, 0),
+                                           is_open=state != 'closed')
+            add_outline(children, item)
+
+    add_outline(bookmark_tree([bookmark for chapter in chapters for bookmark in chapter['bookmarks']]))
+    with open(output_path, 'wb') as f:
+        writer.write(f)
+
+def compare_pdfs(expected_path, actual_path):
+    """Diferențele (număr de pagini, text per pagină) dintre două PDF-uri; listă goală = identice"""
+    pypdf = require_pypdf()
+    expected = pypdf.PdfReader(str(expected_path))
+    actual = pypdf.PdfReader(str(actual_path))
+    if len(expected.pages) != len(actual.pages):
+        return [f"{len(actual.pages)} pagini în loc de {len(expected.pages)}"]
+    return [f"textul paginii {idx + 1}"
+            for idx, (expected_page, actual_page) in enumerate(zip(expected.pages, actual.pages))
+            if expected_page.extract_text() != actual_page.extract_text()]
+
+def write_pdf_chapters(html_string, output_path, stylesheet_sources, jobs, chapters=None):
+    """
+    Generează PDF-ul cu layout paralel pe capitole.
+    stylesheet_sources: listă (cale, None) / (None, text CSS), în ordinea din build-ul serial.
+    chapters: rezultatul chapter_ranges, dacă apelantul l-a calculat deja.
+    Întoarce numărul de capitole și de pagini.
+    """
+    require_pypdf()
+    from mermaid_render import diagram_url_fetcher, referenced_images
+
+    ranges, children = chapters or chapter_ranges(html_string, diagram_url_fetcher())
+    base = {'html': html_string, 'stylesheets': stylesheet_sources, 'children': children, 'images': referenced_images()}
+    temp_dir = tempfile.mkdtemp(prefix='pdf-chapters-')
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, min(jobs, len(ranges)))) as pool:
+            # Trecerea 1: câte pagini are fiecare capitol
+            counts = [result['pages'] for result in pool.map(
+                _layout_chapter, [dict(base, start=start, end=end) for start, end in ranges])]
+            total_pages = sum(counts)
+            offsets = [sum(counts[:idx]) for idx in range(len(counts))]
+
+            # Trecerea 2: numerotare globală, PDF per capitol
+            chapter_pdfs = [Path(temp_dir) / f'chapter_{idx:03d}.pdf' for idx in range(len(ranges))]
+            tasks = [dict(base, start=start, end=end, page_offset=offset, total_pages=total_pages, output_path=str(path))
+                     for (start, end), offset, path in zip(ranges, offsets, chapter_pdfs)]
+            chapters = list(pool.map(_layout_chapter, tasks))
+
+        for idx, (expected, chapter) in enumerate(zip(counts, chapters)):
+            if chapter['pages'] != expected:
+                raise RuntimeError(f"Capitolul {idx + 1} are {chapter['pages']} pagini în loc de {expected}")
+        merge_chapters(chapter_pdfs, chapters, output_path)
+    finally:
+        shutil.rmtree(temp_dir)
+    return len(ranges), total_pages
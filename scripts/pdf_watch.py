@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+Watch mode cu previzualizare HTML live pentru documentele din pdf_documents.json
+
+Observă Markdown-ul documentului, stylesheet-urile și manifestul. La fiecare
+modificare reconvertește doar secțiunile (#/## titluri) schimbate; diagramele
+vin din cache-ul de randare, deci doar cele noi sau modificate ajung la mmdc.
+Previzualizarea este servită pe localhost cu aceleași stylesheet-uri ca PDF-ul
+și se reîncarcă singură în browser (Server-Sent Events). PDF-ul complet este
+generat doar la cerere (butonul din previzualizare, adică POST /pdf); GET /pdf
+servește ultimul PDF generat, fără să pornească un build.
+
+Definițiile de referință ([id]: url), notele de subsol ([^n]:), abrevierile
+(*[X]:) și [TOC] depind de tot documentul: când apar, documentul este convertit
+întreg, ca o singură secțiune.
+
+Utilizare:
+    python3 scripts/pdf_watch.py                      # arhitectura, pe http://localhost:8000
+    python3 scripts/pdf_watch.py raport --port 8001
+
+Previzualizarea este HTML în browser: regulile @page (antet, numerotare,
+page break-uri) se văd doar în PDF.
+"""
+
+import argparse
+import hashlib
+import json
+import re
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from diagram_images import stylesheets_content_width
+from mermaid_markdown import code_fences
+from mermaid_render import DIAGRAM_URL_SCHEME, resolve_diagram_url, release_images
+from pdf_build import (DEFAULT_MANIFEST, apply_html_rules, apply_page_breaks, build_named, default_builder,
+                       html_document, load_manifest, select_documents, stylesheet_sources)
+
+SECTION_HEADING_PATTERN = re.compile(r'^#{1,2} ')
+# Construcții rezolvate la nivelul întregului document (referințe, note de subsol, abrevieri, cuprins)
+DOCUMENT_WIDE_PATTERN = re.compile(r'^ {0,3}(?:\*?\[[^\]]+\]:|\[TOC\]\s*$)')
+POLL_INTERVAL = 0.3
+
+RELOAD_SNIPPET = """
+<style>
+    #pdf-watch-bar { position: fixed; top: 0; right: 0; padding: 6px 10px; font: 12px sans-serif;
+                     background: #1971c2; color: #fff; z-index: 1000; }
+    #pdf-watch-bar form { display: inline; margin: 0; }
+    #pdf-watch-bar button, #pdf-watch-bar a { color: #fff; font: inherit; }
+    #pdf-watch-bar button { background: none; border: 1px solid #fff; cursor: pointer; }
+    body { max-width: 210mm; margin: 24px auto; padding: 0 2cm; }
+</style>
+<script>
+    new EventSource('/events').onmessage = () => location.reload();
+</script>
+"""
+
+def split_sections(md_content):
+    """
+    Împarte Markdown-ul în secțiuni la titlurile # / ## (nu în interiorul blocurilor de cod, vezi code_fences).
+    Dacă documentul are construcții rezolvate global (DOCUMENT_WIDE_PATTERN), rămâne o singură secțiune:
+    convertite separat, referințele ar rămâne nerezolvate, iar notele de subsol ar fi renumerotate.
+    """
+    lines = md_content.split('\n')
+    fenced = {idx for start, end, _, _ in code_fences(lines) for idx in range(start, end + 1)}
+    if any(idx not in fenced and DOCUMENT_WIDE_PATTERN.match(line) for idx, line in enumerate(lines)):
+        return [md_content]
+    sections, current = [], []
+    for idx, line in enumerate(lines):
+        if idx not in fenced and SECTION_HEADING_PATTERN.match(line) and current:
+            sections.append('\n'.join(current))
+            current = []
+        current.append(line)
+    sections.append('\n'.join(current))
+    return sections
+
+class PreviewState:
+    """HTML-ul curent al previzualizării, refăcut incremental pe secțiuni"""
+
+    def __init__(self, doc, manifest_path):
+        self.doc = doc
+        self.manifest_path = manifest_path
+        self.builder = default_builder()
+        self.temp_dir = Path(tempfile.mkdtemp(prefix='pdf-watch-'))
+        self.sections = {}  # hash (secțiune, lățime conținut, extensii) → HTML
+        self.html = ''
+        self.css = ''
+        self.version = 0
+        self.lock = threading.Lock()
+        self.changed = threading.Condition()
+
+    def _section_html(self, section, content_width):
+        # Lățimea conținutului (din stylesheet-uri) schimbă dimensiunile diagramelor, iar extensiile din
+        # manifest schimbă HTML-ul: ambele fac parte din cheie, altfel secțiunile ar rămâne învechite
+        payload = json.dumps([section, content_width, self.doc['markdown_extensions']])
+        key = hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+        if key not in self.sections:
+            # Fiecare secțiune are directorul ei de imagini, ca numele mermaid_N.png să nu se suprapună
+            section_dir = self.temp_dir / key
+            section_dir.mkdir(exist_ok=True)
+            html_body, _ = self.builder.convert(section, self.doc['markdown_extensions'], section_dir, content_width)
+            self.sections[key] = html_body
+        return key
+
+    def rebuild(self):
+        """Reface previzualizarea; întoarce numărul de secțiuni reconvertite"""
+        with self.lock:
+            self.doc = select_documents(load_manifest(self.manifest_path), [self.doc['name']])[0]
+            md_content = apply_page_breaks(self.doc['input'].read_text(encoding='utf-8'), self.doc['page_breaks'])
+            content_width = stylesheets_content_width(self.doc['stylesheets'])
+            known = set(self.sections)
+            keys = [self._section_html(section, content_width) for section in split_sections(md_content)]
+            converted = len(set(keys) - known)
+
+            # Secțiunile dispărute: HTML-ul și imaginile lor nu mai sunt necesare
+            for key in set(self.sections) - set(keys):
+                del self.sections[key]
+                release_images(self.temp_dir / key)
+                shutil.rmtree(self.temp_dir / key, ignore_errors=True)
+
+            body = apply_html_rules('\n'.join(self.sections[key] for key in keys), self.doc['html_rules'])
+            body = body.replace(f'src="{DIAGRAM_URL_SCHEME}:', f'src="/{DIAGRAM_URL_SCHEME}/')
+            bar = (f'{self.doc["name"]} · <form method="post" action="/pdf"><button>Generează PDF</button></form>'
+                   f' · <a href="/pdf">ultimul PDF</a>')
+            body = f'<div id="pdf-watch-bar">{bar}</div>\n{body}'
+            html = html_document(body, self.doc['title'])
+            self.html = html.replace('</head>', f'<link rel="stylesheet" href="/style.css">{RELOAD_SNIPPET}</head>', 1)
+            self.css = '\n'.join(Path(path).read_text(encoding='utf-8') if path else string
+                                 for path, string in stylesheet_sources(self.doc))
+
+        with self.changed:
+            self.version += 1
+            self.changed.notify_all()
+        return converted
+
+    def watched_files(self):
+        return [self.doc['input'], *self.doc['stylesheets'], Path(self.manifest_path)]
+
+    def build_pdf(self):
+        """PDF-ul complet, la cerere (același build ca pdf_build.py); doar din POST /pdf"""
+        with self.lock:
+            build_named(self.doc['name'], manifest_path=self.manifest_path, force=True)
+        return self.doc['output']
+
+    def close(self):
+        release_images(self.temp_dir)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+def make_handler(state):
+    class PreviewHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, body, content_type, status=200):
+            if isinstance(body, str):
+                body = body.encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == '/':
+                self._send(state.html, 'text/html; charset=utf-8')
+            elif self.path == '/style.css':
+                self._send(state.css, 'text/css; charset=utf-8')
+            elif self.path.startswith(f'/{DIAGRAM_URL_SCHEME}/'):
+                try:
+                    path, mime_type = resolve_diagram_url(f'{DIAGRAM_URL_SCHEME}:{self.path.split("/", 2)[2]}')
+                    self._send(Path(path).read_bytes(), mime_type)
+                except (FileNotFoundError, OSError):
+                    self._send('Diagramă necunoscută', 'text/plain; charset=utf-8', 404)
+            elif self.path == '/pdf':
+                # GET nu are efecte: servește ultimul PDF generat (prefetch-ul sau un link nu pornesc un build)
+                output = Path(state.doc['output'])
+                if output.exists():
+                    self._send(output.read_bytes(), 'application/pdf')
+                else:
+                    self._send('PDF-ul nu a fost încă generat (butonul „Generează PDF”)', 'text/plain; charset=utf-8', 404)
+            elif self.path == '/events':
+                self._events()
+            else:
+                self._send('Not found', 'text/plain; charset=utf-8', 404)
+
+        def do_POST(self):
+            if self.path != '/pdf':
+                self._send('Not found', 'text/plain; charset=utf-8', 404)
+                return
+            # Build-ul pornește doar din previzualizarea servită de acest server, nu din alte site-uri
+            origin = self.headers.get('Origin')
+            if origin and origin != f'http://{self.headers.get("Host")}':
+                self._send('Origine nepermisă', 'text/plain; charset=utf-8', 403)
+                return
+            try:
+                output = state.build_pdf()
+                self._send(Path(output).read_bytes(), 'application/pdf')
+            except Exception as e:
+                self._send(f'Eroare la generarea PDF: {e}', 'text/plain; charset=utf-8', 500)
+
+        def _events(self):
+            """Server-Sent Events: un mesaj la fiecare versiune nouă a previzualizării"""
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Cache-Control', 'no-store')
+            self.end_headers()
+            version = state.version
+            try:
+                while True:
+                    with state.changed:
+                        state.changed.wait_for(lambda: state.version != version, timeout=15)
+                    if state.version != version:
+                        version = state.version
+                        self.wfile.write(f'data: {version}\n\n'.encode('utf-8'))
+                    else:
+                        self.wfile.write(b': keepalive\n\n')
+                    self.wfile.flush()
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    return PreviewHandler
+
+def file_mtimes(paths):
+    mtimes = {}
+    for path in paths:
+        try:
+            mtimes[str(path)] = Path(path).stat().st_mtime_ns
+        except FileNotFoundError:
+            mtimes[str(path)] = None
+    return mtimes
+
+def watch(state, interval=POLL_INTERVAL):
+    """Bucla de observare (polling pe mtime, fără dependențe externe)"""
+    mtimes = file_mtimes(state.watched_files())
+    while True:
+        time.sleep(interval)
+        current = file_mtimes(state.watched_files())
+        if current == mtimes:
+            continue
+        changed = [Path(path).name for path, mtime in current.items() if mtimes.get(path) != mtime]
+        mtimes = current
+        started = time.perf_counter()
+        try:
+            converted = state.rebuild()
+        except Exception as e:
+            print(f"❌ Eroare la reconstruire ({', '.join(changed)}): {e}")
+            continue
+        print(f"🔄 {', '.join(changed)}: {converted} secțiuni reconvertite în {time.perf_counter() - started:.2f}s")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Previzualizare HTML live pentru un document din manifest')
+    parser.add_argument('document', nargs='?', default='arhitectura', help='Numele documentului (implicit arhitectura)')
+    parser.add_argument('--manifest', default=str(DEFAULT_MANIFEST), help='Manifestul documentelor')
+    parser.add_argument('--host', default='127.0.0.1', help='Adresa serverului (implicit doar local)')
+    parser.add_argument('--port', type=int, default=8000, help='Portul serverului')
+    parser.add_argument('--interval', type=float, default=POLL_INTERVAL, help='Intervalul de verificare (secunde)')
+    args = parser.parse_args(argv)
+
+    doc = select_documents(load_manifest(args.manifest), [args.document])[0]
+    state = PreviewState(doc, args.manifest)
+    print(f"📖 [{doc['name']}] Previzualizare inițială: {doc['input']}")
+    started = time.perf_counter()
+    sections = state.rebuild()
+    print(f"✅ {sections} secțiuni în {time.perf_counter() - started:.1f}s")
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(state))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"👀 http://{args.host}:{args.port}/ (PDF la cerere: POST /pdf) — Ctrl+C pentru oprire")
+    try:
+        watch(state, args.interval)
+    except KeyboardInterrupt:
+        print("\n👋 Oprit")
+    finally:
+        server.shutdown()
+        state.close()
+
+if __name__ == '__main__':
+    sys.exit(main())
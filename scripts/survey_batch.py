@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Survey Batch Reports
+Groups one dataset by county/locality in a single pass and renders the
+per-group executive summaries concurrently
+"""
+
+import re
+import unicodedata
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+GROUP_KEYS: Dict[str, Callable[[Dict], Optional[str]]] = {
+    'county': lambda r: r.get('county'),
+    'locality': lambda r: f"{r['locality']}, {r['county']}" if r.get('locality') else None,
+}
+
+def partition_dataset(data: Dict, group_of: Callable[[Dict], Optional[str]]) -> Dict[str, Dict]:
+    """Split a dataset into per-group datasets with one pass over respondents and one over responses"""
+    respondents: Dict[str, List[Dict]] = {}
+    group_by_id: Dict[str, str] = {}
+    for r in data['respondents']:
+        group = group_of(r)
+        if group is None:
+            continue
+        respondents.setdefault(group, []).append(r)
+        group_by_id[r['id']] = group
+
+    questions: Dict[str, Dict[str, Dict]] = {group: {} for group in respondents}
+    for question_id, question in data['responses_by_question'].items():
+        for response in question['responses']:
+            group = group_by_id.get(response['respondent_id'])
+            if group is None:
+                continue
+            bucket = questions[group].setdefault(question_id, {**question, 'responses': []})
+            bucket['responses'].append(response)
+
+    return {
+        group: {
+            'metadata': {
+                'fetched_at': data.get('metadata', {}).get('fetched_at'),
+                'total_respondents': len(respondents[group]),
+                'total_responses': sum(len(q['responses']) for q in questions[group].values()),
+            },
+            'respondents': respondents[group],
+            'responses_by_question': questions[group],
+        }
+        for group in respondents
+    }
+
+def slugify(value: str) -> str:
+    """ASCII file-name slug ('Iași' → 'iasi', 'Sector 1, București' → 'sector-1-bucuresti')"""
+    ascii_value = unicodedata.normalize('NFKD', value).encode('ascii', 'ignore').decode('ascii')
+    return re.sub(r'[^a-z0-9]+', '-', ascii_value.lower()).strip('-') or 'unknown'
+
+def unique_slugs(groups: Iterable[str]) -> Dict[str, str]:
+    """
+    File-name slug per group, unique across the batch: groups that fold to the same
+    slug ('Cluj-Napoca' / 'Cluj Napoca') get -2, -3, ... in sorted group order
+    """
+    slugs: Dict[str, str] = {}
+    taken = set()
+    for group in sorted(groups):
+        base = slugify(group)
+        slug, n = base, 1
+        while slug in taken:
+            n += 1
+            slug = f"{base}-{n}"
+        taken.add(slug)
+        slugs[group] = slug
+    return slugs
+
+def write_summaries(summaries: Dict[str, Callable[[], str]], output_dir: str,
+                    prefix: str = 'executive-summary', max_workers: Optional[int] = None) -> List[Tuple[str, Path]]:
+    """Render every summary and write it to <output_dir>/<prefix>-<slug>.md concurrently (slugs from unique_slugs)"""
+    directory = Path(output_dir)
+    directory.mkdir(parents=True, exist_ok=True)
+    slugs = unique_slugs(summaries)
+
+    def render_and_write(item: Tuple[str, Callable[[], str]]) -> Tuple[str, Path]:
+        group, render = item
+        path = directory / f"{prefix}-{slugs[group]}.md"
+        path.write_text(render(), encoding='utf-8')
+        return group, path
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(render_and_write, summaries.items()))
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Survey Charts
+Pure-Python SVG charts (bar, stacked bar, pie, histogram) rendered straight
+from the insight dicts, without Mermaid / headless Chromium.
+
+Rendered charts are memoized in memory by a hash of their data and options;
+there is no on-disk cache, since a chart renders in microseconds.
+
+    python3 scripts/survey_charts.py /tmp/survey-analysis-report.json --output-dir /tmp/charts
+"""
+
+import argparse
+import hashlib
+import json
+import math
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+CHART_VERSION = 1
+
+# Same blues / orange as the report stylesheet, then distinct fills
+PALETTE = ['#3f51b5', '#ff9800', '#1976d2', '#43a047', '#e53935', '#8e24aa', '#00897b', '#6d4c41', '#fdd835', '#546e7a']
+SENTIMENT_COLORS = {'positive': '#43a047', 'neutral': '#9e9e9e', 'negative': '#e53935'}
+
+FONT = "font-family='Arial, sans-serif'"
+CHAR_WIDTH = 6.2    # approximate advance of an 11px Arial glyph
+TITLE_HEIGHT = 28
+MAX_LABEL_CHARS = 28
+
+def _fmt(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else f"{value:.1f}"
+
+def _label(text: str) -> str:
+    text = str(text)
+    return escape(text if len(text) <= MAX_LABEL_CHARS else text[:MAX_LABEL_CHARS - 1] + '…')
+
+def _svg(width: float, height: float, title: str, body: List[str]) -> str:
+    header = (f"<svg xmlns='http://www.w3.org/2000/svg' width='{width:.0f}' height='{height:.0f}' "
+              f"viewBox='0 0 {width:.0f} {height:.0f}' {FONT} font-size='11'>")
+    parts = [header]
+    if title:
+        parts.append(f"<text x='{width / 2:.1f}' y='18' text-anchor='middle' font-size='14' font-weight='bold' fill='#1a237e'>{escape(title)}</text>")
+    parts.extend(body)
+    parts.append('</svg>')
+    return '\n'.join(parts)
+
+def bar_chart(data: Dict[str, float], title: str = '', width: int = 640, bar_height: int = 20) -> str:
+    """Horizontal bars, one per category, in the dict's order"""
+    labels = list(data)
+    label_width = min(MAX_LABEL_CHARS, max((len(str(l)) for l in labels), default=0)) * CHAR_WIDTH + 12
+    plot_width = width - label_width - 50
+    top = TITLE_HEIGHT if title else 8
+    peak = max(data.values(), default=0) or 1
+
+    body = []
+    for i, label in enumerate(labels):
+        y = top + i * (bar_height + 6)
+        length = data[label] / peak * plot_width
+        body.append(f"<text x='{label_width - 6:.1f}' y='{y + bar_height * 0.7:.1f}' text-anchor='end' fill='#2c3e50'>{_label(label)}</text>")
+        body.append(f"<rect x='{label_width:.1f}' y='{y}' width='{length:.1f}' height='{bar_height}' fill='{PALETTE[0]}'/>")
+        body.append(f"<text x='{label_width + length + 4:.1f}' y='{y + bar_height * 0.7:.1f}' fill='#2c3e50'>{_fmt(data[label])}</text>")
+    return _svg(width, top + len(labels) * (bar_height + 6) + 8, title, body)
+
+def stacked_bar_chart(series: Dict[str, Dict[str, float]], title: str = '', width: int = 640, bar_height: int = 20,
+                      colors: Optional[Dict[str, str]] = None) -> str:
+    """One 100% stacked bar per group (e.g. cohort), segments per category, with a legend"""
+    categories: List[str] = []
+    for values in series.values():
+        categories.extend(c for c in values if c not in categories)
+    color_of = {c: (colors or {}).get(c, PALETTE[i % len(PALETTE)]) for i, c in enumerate(categories)}
+
+    label_width = min(MAX_LABEL_CHARS, max((len(str(g)) for g in series), default=0)) * CHAR_WIDTH + 12
+    plot_width = width - label_width - 16
+    top = TITLE_HEIGHT if title else 8
+
+    body = []
+    x = label_width
+    for category in categories:
+        body.append(f"<rect x='{x:.1f}' y='{top}' width='10' height='10' fill='{color_of[category]}'/>")
+        body.append(f"<text x='{x + 14:.1f}' y='{top + 9}' fill='#2c3e50'>{_label(category)}</text>")
+        x += 14 + len(_label(category)) * CHAR_WIDTH + 16
+    top += 20
+
+    for i, (group, values) in enumerate(series.items()):
+        y = top + i * (bar_height + 6)
+        total = sum(values.values()) or 1
+        body.append(f"<text x='{label_width - 6:.1f}' y='{y + bar_height * 0.7:.1f}' text-anchor='end' fill='#2c3e50'>{_label(group)}</text>")
+        x = label_width
+        for category in categories:
+            share = values.get(category, 0) / total
+            if share <= 0:
+                continue
+            length = share * plot_width
+            body.append(f"<rect x='{x:.1f}' y='{y}' width='{length:.1f}' height='{bar_height}' fill='{color_of[category]}'>"
+                        f"<title>{_label(category)}: {_fmt(values[category])}</title></rect>")
+            if length > 30:
+                body.append(f"<text x='{x + length / 2:.1f}' y='{y + bar_height * 0.7:.1f}' text-anchor='middle' fill='#fff'>{share * 100:.0f}%</text>")
+            x += length
+    return _svg(width, top + len(series) * (bar_height + 6) + 8, title, body)
+
+def pie_chart(data: Dict[str, float], title: str = '', size: int = 220, colors: Optional[Dict[str, str]] = None) -> str:
+    """Pie with a legend on the right (label, value, share)"""
+    total = sum(v for v in data.values() if v > 0)
+    top = TITLE_HEIGHT if title else 8
+    radius = size / 2
+    cx, cy = radius + 8, top + radius
+    legend_width = max((len(_label(l)) for l in data), default=0) * CHAR_WIDTH + 90
+    color_of = {label: (colors or {}).get(label, PALETTE[i % len(PALETTE)]) for i, label in enumerate(data)}
+
+    body = []
+    slices = [(label, value) for label, value in data.items() if value > 0]
+    if len(slices) == 1:
+        body.append(f"<circle cx='{cx:.1f}' cy='{cy:.1f}' r='{radius:.1f}' fill='{color_of[slices[0][0]]}'/>")
+    angle = -math.pi / 2
+    for label, value in slices if len(slices) > 1 else []:
+        sweep = value / total * 2 * math.pi
+        x1, y1 = cx + radius * math.cos(angle), cy + radius * math.sin(angle)
+        angle += sweep
+        x2, y2 = cx + radius * math.cos(angle), cy + radius * math.sin(angle)
+        large = 1 if sweep > math.pi else 0
+        body.append(f"<path d='M{cx:.1f},{cy:.1f} L{x1:.2f},{y1:.2f} A{radius:.1f},{radius:.1f} 0 {large} 1 {x2:.2f},{y2:.2f} Z' "
+                    f"fill='{color_of[label]}' stroke='#fff' stroke-width='1'/>")
+
+    for i, (label, value) in enumerate(data.items()):
+        y = top + 8 + i * 18
+        share = value / total * 100 if total else 0
+        body.append(f"<rect x='{size + 24}' y='{y}' width='10' height='10' fill='{color_of[label]}'/>")
+        body.append(f"<text x='{size + 40}' y='{y + 9}' fill='#2c3e50'>{_label(label)} — {_fmt(value)} ({share:.1f}%)</text>")
+    height = max(top + size + 8, top + 16 + len(data) * 18)
+    return _svg(size + 40 + legend_width, height, title, body)
+
+def histogram(distribution: Dict[str, float], title: str = '', width: int = 360, height: int = 200) -> str:
+    """Vertical adjacent bins for a numeric distribution (e.g. 1-5 ratings), ordered by bin value"""
+    def bin_key(label: str) -> Tuple[int, float, str]:
+        try:
+            return (0, float(label), '')
+        except ValueError:
+            return (1, 0.0, str(label))
+
+    bins = sorted(distribution, key=bin_key)
+    top = TITLE_HEIGHT if title else 8
+    plot_height = height - top - 36
+    left = 16
+    bin_width = (width - 2 * left) / max(len(bins), 1)
+    peak = max(distribution.values(), default=0) or 1
+    baseline = top + 14 + plot_height
+
+    body = [f"<line x1='{left}' y1='{baseline:.1f}' x2='{width - left}' y2='{baseline:.1f}' stroke='#2c3e50'/>"]
+    for i, label in enumerate(bins):
+        x = left + i * bin_width
+        bar = distribution[label] / peak * plot_height
+        body.append(f"<rect x='{x:.1f}' y='{baseline - bar:.1f}' width='{bin_width:.1f}' height='{bar:.1f}' fill='{PALETTE[2]}' stroke='#fff'/>")
+        body.append(f"<text x='{x + bin_width / 2:.1f}' y='{baseline - bar - 4:.1f}' text-anchor='middle' fill='#2c3e50'>{_fmt(distribution[label])}</text>")
+        body.append(f"<text x='{x + bin_width / 2:.1f}' y='{baseline + 14:.1f}' text-anchor='middle' fill='#2c3e50'>{_label(label)}</text>")
+    return _svg(width, height, title, body)
+
+CHART_RENDERERS: Dict[str, Callable[..., str]] = {
+    'bar': bar_chart,
+    'stacked_bar': stacked_bar_chart,
+    'pie': pie_chart,
+    'histogram': histogram,
+}
+
+_cache: Dict[str, str] = {}
+
+def chart_key(kind: str, data: Dict, title: str, options: Dict) -> str:
+    payload = json.dumps([CHART_VERSION, kind, data, title, options], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.blake2b(payload.encode('utf-8'), digest_size=16).hexdigest()
+
+def render_chart(kind: str, data: Dict, title: str = '', **options) -> str:
+    """Render a chart, reusing the SVG when the same data was rendered before in this process"""
+    key = chart_key(kind, data, title, options)
+    svg = _cache.get(key)
+    if svg is None:
+        svg = _cache[key] = CHART_RENDERERS[kind](data, title, **options)
+    return svg
+
+def _by_value(data: Dict[str, float]) -> Dict[str, float]:
+    return dict(sorted(data.items(), key=lambda item: item[1], reverse=True))
+
+# (chart name, kind, path into the report, title, options)
+REPORT_CHARTS = [
+    ('respondent_types', 'pie', ('demographics', 'respondent_type_distribution'), 'Tip respondent', {}),
+    ('age_distribution', 'bar', ('demographics', 'age_distribution'), 'Distribuție pe vârstă', {}),
+    ('county_distribution', 'bar', ('demographics', 'county_distribution'), 'Distribuție pe județe', {}),
+    ('online_usage', 'pie', ('citizen_insights', 'online_usage'), 'Utilizare servicii online', {}),
+    ('pain_point_themes', 'bar', ('citizen_insights', 'pain_point_themes'), 'Probleme principale (cetățeni)', {}),
+    ('citizen_features', 'bar', ('citizen_insights', 'desired_features'), 'Funcționalități dorite (cetățeni)', {}),
+    ('usefulness_rating', 'histogram', ('citizen_insights', 'usefulness_rating', 'distribution'), 'Utilitate platformă (1-5)', {}),
+    ('recommendation', 'pie', ('citizen_insights', 'recommendation'), 'Ar recomanda platforma', {}),
+    ('identity_verification', 'pie', ('citizen_insights', 'identity_verification_willingness'), 'Acceptare verificare identitate', {}),
+    ('it_system_usage', 'pie', ('official_insights', 'it_system_usage'), 'Utilizare sisteme IT', {}),
+    ('digitalization_belief', 'pie', ('official_insights', 'digitalization_improvement_belief'), 'Digitalizarea va ajuta', {}),
+    ('official_features', 'bar', ('official_insights', 'desired_features'), 'Funcționalități dorite (funcționari)', {}),
+    ('official_concerns', 'bar', ('official_insights', 'concerns'), 'Îngrijorări (funcționari)', {}),
+    ('readiness_rating', 'histogram', ('official_insights', 'readiness_rating', 'distribution'), 'Pregătire digitalizare (1-5)', {}),
+]
+
+def _lookup(report: Dict, path: Tuple[str, ...]) -> Optional[Dict]:
+    value = report
+    for key in path:
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value if isinstance(value, dict) and value else None
+
+def report_charts(report: Dict) -> Dict[str, Tuple[str, str]]:
+    """Every chart the report's insight dicts support → {name: (title, svg)}; missing sections are skipped"""
+    charts: Dict[str, Tuple[str, str]] = {}
+    for name, kind, path, title, options in REPORT_CHARTS:
+        data = _lookup(report, path)
+        if data is None:
+            continue
+        if kind == 'bar':
+            data = _by_value(data)
+        charts[name] = (title, render_chart(kind, data, title, **options))
+
+    for question_id, result in report.get('sentiment', {}).items():
+        series = {'Total': result['overall']}
+        series.update(result.get('cohorts', {}))
+        series = {group: {label: values.get(label, 0) for label in SENTIMENT_COLORS} for group, values in series.items()}
+        title = f"Sentiment {question_id}"
+        charts[f"sentiment_{question_id}"] = (title, render_chart('stacked_bar', series, title, colors=SENTIMENT_COLORS))
+    return charts
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Render SVG charts from a survey analysis report')
+    parser.add_argument('report', nargs='?', default='/tmp/survey-analysis-report.json', help='Analysis report JSON')
+    parser.add_argument('--output-dir', default='/tmp/survey-charts', help='Directory for the SVG files')
+    args = parser.parse_args(argv)
+
+    with open(args.report, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    charts = report_charts(report)
+    for name, (_, svg) in charts.items():
+        (output_dir / f"{name}.svg").write_text(svg, encoding='utf-8')
+    print(f"📊 {len(charts)} charts written to {output_dir}")
+
+if __name__ == '__main__':
+    main()
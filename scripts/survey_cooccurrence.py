@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Survey Choice Co-occurrence
+Pairwise and higher-order co-occurrence + lift for multiple-choice questions,
+computed over bitmask-encoded choice sets (weighted when respondent weights are given)
+"""
+
+from collections import Counter, defaultdict
+from itertools import combinations
+from typing import Dict, List, Optional, Tuple
+
+# Multiple-choice question → respondent type it is asked to
+MULTI_CHOICE_QUESTIONS = {
+    'q4_features': 'citizen',
+    'q8_useful_features': 'official',
+    'q9_concerns': 'official',
+}
+
+def encode_choice_sets(responses: List[Dict], respondent_ids: set) -> Tuple[List[str], Dict[str, int]]:
+    """Map every option to a bit and every respondent's choice set to a bitmask over those bits"""
+    options: Dict[str, int] = {}
+    masks: Dict[str, int] = defaultdict(int)
+    for r in responses:
+        if r['respondent_id'] not in respondent_ids or not r['answer_choices']:
+            continue
+        for choice in r['answer_choices']:
+            bit = options.setdefault(choice, len(options))
+            masks[r['respondent_id']] |= 1 << bit
+    return list(options), dict(masks)
+
+def itemset_counts(mask_counts: Counter, max_order: int) -> Dict[int, float]:
+    """
+    Support of every itemset of 1..max_order options, keyed by itemset bitmask.
+
+    Identical choice sets are collapsed first, so the cost depends on the
+    number of distinct choice sets (and their size), not on respondents.
+    A choice set's count may be a summed weight rather than a headcount.
+    """
+    counts: Dict[int, float] = defaultdict(int)
+    for mask, count in mask_counts.items():
+        bits = [1 << b for b in range(mask.bit_length()) if mask >> b & 1]
+        for order in range(1, min(max_order, len(bits)) + 1):
+            for combo in combinations(bits, order):
+                counts[sum(combo)] += count
+    return counts
+
+def _decode(mask: int, options: List[str]) -> List[str]:
+    return [options[b] for b in range(mask.bit_length()) if mask >> b & 1]
+
+def _ranked_itemsets(counts: Dict[int, float], options: List[str], total: int, order: int, top_k: Optional[int]) -> List[Dict]:
+    """Itemsets of one order ranked by support, with lift against independence"""
+    ranked = []
+    for mask, count in counts.items():
+        if mask.bit_count() != order:
+            continue
+        expected = total
+        for b in range(mask.bit_length()):
+            if mask >> b & 1:
+                expected *= counts[1 << b] / total
+        ranked.append({
+            'items': _decode(mask, options),
+            'count': round(count, 2),
+            'support_pct': round(count / total * 100, 1),
+            'lift': round(count / expected, 2) if expected else None,
+        })
+    ranked.sort(key=lambda x: (-x['count'], -(x['lift'] or 0), x['items']))
+    return ranked[:top_k] if top_k else ranked
+
+def cooccurrence(mask_counts: Counter, options: List[str], max_order: int = 3, top_k: int = 10) -> Dict:
+    """All pairs plus the top-k itemsets of each higher order for a collection of choice sets"""
+    total = sum(mask_counts.values())
+    if not total:
+        return {'respondents': 0, 'pairs': [], 'higher_order': {}}
+    counts = itemset_counts(mask_counts, max_order)
+    return {
+        'respondents': round(total, 2),
+        'pairs': _ranked_itemsets(counts, options, total, 2, None),
+        'higher_order': {
+            str(order): _ranked_itemsets(counts, options, total, order, top_k)
+            for order in range(3, max_order + 1)
+        },
+    }
+
+def analyze_cooccurrence(responses_by_question: Dict, respondents: List[Dict], cohort_field: str = 'age_category',
+                         max_order: int = 3, top_k: int = 10, weights: Optional[Dict[str, float]] = None) -> Dict:
+    """
+    Co-occurrence of multiple-choice answers per question, overall and per cohort.
+    With `weights`, each respondent's choice set counts with its weight (counts and
+    support are weighted estimates, as in the other report sections).
+    """
+    weight_of = (lambda rid: weights.get(rid, 1.0)) if weights is not None else (lambda rid: 1)
+    results = {}
+    for question_id, respondent_type in MULTI_CHOICE_QUESTIONS.items():
+        if question_id not in responses_by_question:
+            continue
+        type_ids = {r['id'] for r in respondents if r['respondent_type'] == respondent_type}
+        options, masks = encode_choice_sets(responses_by_question[question_id]['responses'], type_ids)
+
+        cohort_of = {r['id']: r.get(cohort_field) for r in respondents if r['id'] in masks}
+        overall_counts: Counter = Counter()
+        by_cohort: Dict[str, Counter] = defaultdict(Counter)
+        for respondent_id, mask in masks.items():
+            weight = weight_of(respondent_id)
+            overall_counts[mask] += weight
+            cohort = cohort_of.get(respondent_id)
+            if cohort:
+                by_cohort[cohort][mask] += weight
+
+        overall = cooccurrence(overall_counts, options, max_order, top_k)
+        results[question_id] = {
+            'respondent_type': respondent_type,
+            'weighted': weights is not None,
+            'options': options,
+            **overall,
+            'cohort_field': cohort_field,
+            'cohorts': {
+                cohort: {k: v for k, v in cooccurrence(counts, options, 2, top_k).items() if k != 'higher_order'}
+                for cohort, counts in sorted(by_cohort.items())
+            },
+        }
+        for cohort in results[question_id]['cohorts'].values():
+            cohort['pairs'] = cohort['pairs'][:top_k]
+    return results
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Survey Report Diff
+Compares two analysis reports (or two persisted aggregate states) section by
+section: changed counts, distribution shifts and metric deltas over thresholds
+
+    python3 scripts/survey_diff.py old-report.json new-report.json --min-share-pp 2
+"""
+
+import argparse
+import difflib
+import json
+import sys
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+DEFAULT_IGNORE = ('analysis_metadata.analysis_date',)
+# Distributions the analysis truncates to their top entries (_top(..., 10) in comprehensive-survey-analysis.py):
+# a key missing on one side fell out of (or entered) the top, it is not a count of 0
+TRUNCATED_DISTRIBUTIONS = ('county_distribution', 'locality_distribution')
+
+def iter_report_sections(filepath: str) -> Iterator[Tuple[str, Any]]:
+    """
+    Yield (section, value) pairs of a report one at a time.
+
+    Reports are written with indent=2, and JSON strings cannot contain raw
+    newlines, so every top-level key starts a line indented by exactly two
+    spaces. Only one section is held in memory at a time. Compact JSON
+    falls back to a full load.
+    """
+    with open(filepath, 'r', encoding='utf-8') as f:
+        first = f.readline()
+        if first.strip() != '{':
+            f.seek(0)
+            yield from json.load(f).items()
+            return
+
+        buffer: List[str] = []
+        for line in f:
+            starts_section = line.startswith('  "')
+            closes_report = line.startswith('}')
+            if (starts_section or closes_report) and buffer:
+                yield _parse_section(buffer)
+                buffer = []
+            if closes_report:
+                return
+            buffer.append(line)
+
+def _parse_section(lines: List[str]) -> Tuple[str, Any]:
+    text = ''.join(lines).strip().rstrip(',')
+    parsed = json.loads('{' + text + '}')
+    return next(iter(parsed.items()))
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _is_distribution(value: Any) -> bool:
+    return isinstance(value, dict) and bool(value) and all(_is_number(v) for v in value.values())
+
+def walk_changes(before: Any, after: Any, path: str) -> Iterator[Dict]:
+    """Every difference between two report values, as flat change records"""
+    if _is_number(before) and _is_number(after):
+        if before != after:
+            yield {'path': path, 'kind': 'metric', 'before': before, 'after': after, 'delta': round(after - before, 4)}
+    elif _is_distribution(before) and _is_distribution(after) and path.rsplit('.', 1)[-1] in TRUNCATED_DISTRIBUTIONS:
+        yield from _walk_top_n(before, after, path)
+    elif _is_distribution(before) and _is_distribution(after):
+        before_total = sum(before.values()) or 1
+        after_total = sum(after.values()) or 1
+        for key in list(after) + [k for k in before if k not in after]:
+            b, a = before.get(key, 0), after.get(key, 0)
+            share_delta = round((a / after_total - b / before_total) * 100, 2)
+            if a != b or share_delta:
+                yield {'path': f"{path}.{key}", 'kind': 'distribution', 'before': b, 'after': a,
+                       'delta': round(a - b, 4), 'share_delta_pp': share_delta}
+    elif isinstance(before, dict) and isinstance(after, dict):
+        for key in list(after) + [k for k in before if k not in after]:
+            child = f"{path}.{key}" if path else key
+            if key not in before:
+                yield {'path': child, 'kind': 'added', 'after': _preview(after[key])}
+            elif key not in after:
+                yield {'path': child, 'kind': 'removed', 'before': _preview(before[key])}
+            else:
+                yield from walk_changes(before[key], after[key], child)
+    elif isinstance(before, list) and isinstance(after, list):
+        if before != after:
+            yield {'path': path, 'kind': 'list', 'before': len(before), 'after': len(after), 'delta': len(after) - len(before)}
+    elif isinstance(before, str) and isinstance(after, str) and '\n' in before + after:
+        if before != after:
+            matcher = difflib.SequenceMatcher(None, before.splitlines(), after.splitlines(), autojunk=False)
+            changed = sum(max(i2 - i1, j2 - j1) for tag, i1, i2, j1, j2 in matcher.get_opcodes() if tag != 'equal')
+            yield {'path': path, 'kind': 'text', 'lines_changed': changed}
+    elif before != after:
+        yield {'path': path, 'kind': 'value', 'before': _preview(before), 'after': _preview(after)}
+
+def _walk_top_n(before: Dict, after: Dict, path: str) -> Iterator[Dict]:
+    """
+    Changes of a truncated top-N distribution. Keys on both sides are compared
+    as usual, with shares taken over those common keys only; keys on one side
+    are reported as entering or leaving the top N, without a count delta.
+    """
+    common = [key for key in after if key in before]
+    before_total = sum(before[key] for key in common) or 1
+    after_total = sum(after[key] for key in common) or 1
+    for key in common:
+        b, a = before[key], after[key]
+        share_delta = round((a / after_total - b / before_total) * 100, 2)
+        if a != b or share_delta:
+            yield {'path': f"{path}.{key}", 'kind': 'distribution', 'before': b, 'after': a,
+                   'delta': round(a - b, 4), 'share_delta_pp': share_delta}
+    for key in after:
+        if key not in before:
+            yield {'path': f"{path}.{key}", 'kind': 'top_n', 'before': None, 'after': after[key]}
+    for key in before:
+        if key not in after:
+            yield {'path': f"{path}.{key}", 'kind': 'top_n', 'before': before[key], 'after': None}
+
+def _preview(value: Any) -> Any:
+    """Keep change records small: containers are summarized by size"""
+    if isinstance(value, (dict, list)):
+        return f"<{type(value).__name__} of {len(value)}>"
+    if isinstance(value, str) and len(value) > 80:
+        return value[:77] + '...'
+    return value
+
+def is_flagged(change: Dict, min_metric_delta: float, min_share_pp: float, min_count_delta: float) -> bool:
+    """Whether a change passes the reporting thresholds"""
+    if change['kind'] == 'distribution':
+        return abs(change['share_delta_pp']) >= min_share_pp or abs(change['delta']) >= min_count_delta
+    if change['kind'] == 'metric':
+        return abs(change['delta']) >= min_metric_delta
+    if change['kind'] == 'list':
+        return abs(change['delta']) >= min_count_delta
+    return True
+
+def diff_reports(old_path: str, new_path: str, min_metric_delta: float = 0.0, min_share_pp: float = 1.0,
+                 min_count_delta: float = float('inf'), ignore: Tuple[str, ...] = DEFAULT_IGNORE) -> Dict:
+    """Stream both reports section by section and collect the changes over the thresholds"""
+    new_sections = iter_report_sections(new_path)
+    pending: Dict[str, Any] = {}
+
+    def take_new(key: str) -> Tuple[bool, Any]:
+        # Sections normally come in the same order, so pending stays empty
+        if key in pending:
+            return True, pending.pop(key)
+        for new_key, value in new_sections:
+            if new_key == key:
+                return True, value
+            pending[new_key] = value
+        return False, None
+
+    sections: Dict[str, Dict] = {}
+    for key, old_value in iter_report_sections(old_path):
+        found, new_value = take_new(key)
+        if not found:
+            sections[key] = {'status': 'removed', 'changes': 0, 'flagged': []}
+            continue
+        changes = [c for c in walk_changes(old_value, new_value, key) if c['path'] not in ignore]
+        flagged = [c for c in changes if is_flagged(c, min_metric_delta, min_share_pp, min_count_delta)]
+        sections[key] = {'status': 'changed' if changes else 'unchanged', 'changes': len(changes), 'flagged': flagged}
+        del old_value, new_value
+
+    for key, _ in list(pending.items()) + list(new_sections):
+        sections[key] = {'status': 'added', 'changes': 0, 'flagged': []}
+
+    return {
+        'old': old_path,
+        'new': new_path,
+        'thresholds': {'min_metric_delta': min_metric_delta, 'min_share_pp': min_share_pp, 'min_count_delta': min_count_delta},
+        'summary': {
+            'sections_changed': sum(1 for s in sections.values() if s['status'] != 'unchanged'),
+            'changes': sum(s['changes'] for s in sections.values()),
+            'flagged': sum(len(s['flagged']) for s in sections.values()),
+        },
+        'sections': sections,
+    }
+
+def _format_change(change: Dict) -> str:
+    if change['kind'] == 'distribution':
+        return f"{change['path']}: {change['before']} → {change['after']} ({change['share_delta_pp']:+} pp)"
+    if change['kind'] in ('metric', 'list'):
+        return f"{change['path']}: {change['before']} → {change['after']} ({change['delta']:+})"
+    if change['kind'] == 'top_n':
+        if change['before'] is None:
+            return f"{change['path']}: entered the top ({change['after']})"
+        return f"{change['path']}: left the top (was {change['before']})"
+    if change['kind'] == 'text':
+        return f"{change['path']}: {change['lines_changed']} lines changed"
+    if change['kind'] == 'added':
+        return f"{change['path']}: added {change['after']}"
+    if change['kind'] == 'removed':
+        return f"{change['path']}: removed {change['before']}"
+    return f"{change['path']}: {change['before']!r} → {change['after']!r}"
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Diff two survey analysis reports')
+    parser.add_argument('old', help='Previous report JSON')
+    parser.add_argument('new', help='New report JSON')
+    parser.add_argument('--min-metric-delta', type=float, default=0.0, help='Flag metric changes of at least this much (default: any)')
+    parser.add_argument('--min-share-pp', type=float, default=1.0, help='Flag distribution shifts of at least this many pp (default: 1.0)')
+    parser.add_argument('--min-count-delta', type=float, default=float('inf'), help='Also flag count changes of at least this much')
+    parser.add_argument('--json', action='store_true', help='Print the raw JSON diff')
+    parser.add_argument('--fail-on-flagged', action='store_true', help='Exit with status 1 when any change is flagged')
+    args = parser.parse_args(argv)
+
+    result = diff_reports(args.old, args.new, args.min_metric_delta, args.min_share_pp, args.min_count_delta)
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2, default=str))
+    else:
+        summary = result['summary']
+        print(f"🔍 {summary['sections_changed']} sections changed, {summary['changes']} changes, {summary['flagged']} over thresholds")
+        for key, section in result['sections'].items():
+            if section['status'] == 'unchanged':
+                continue
+            print(f"\n📂 {key} ({section['status']}, {section['changes']} changes)")
+            for change in section['flagged']:
+                print(f"  • {_format_change(change)}")
+
+    if args.fail_on_flagged and result['summary']['flagged']:
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+Survey Validation Metrics
+Declarative metric definitions compiled to bitmap evaluators over SurveyIndex
+
+A metric is a dict:
+
+    {"name": "digital_adoption_rate", "type": "rate",
+     "cohort": {"respondent_type": "citizen"},
+     "numerator": {"question": "q2_online_usage", "any_of": ["Da, frecvent", "Da, uneori"]}}
+
+Types: "count" (cohort size), "rate" (100 * cohort∧numerator / cohort∧denominator,
+denominator defaults to the whole cohort) and "mean" (average rating of "question"
+within the cohort). Predicates: a respondent field ({"county": "Iași"} or a list
+of values), {"question": q, "any_of": [...]}, {"question": q, "min_rating": n} /
+"max_rating", {"question": q, "answered": true}, and {"all": [...]},
+{"any": [...]}, {"not": p}.
+"""
+
+import json
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from survey_query import FILTER_FIELDS, SurveyIndex, to_bitmap
+
+VALIDATION_METRICS: List[Dict] = [
+    {'name': 'citizen_count', 'type': 'count', 'cohort': {'respondent_type': 'citizen'}},
+    {'name': 'official_count', 'type': 'count', 'cohort': {'respondent_type': 'official'}},
+    {'name': 'digital_adoption_rate', 'type': 'rate', 'cohort': {'respondent_type': 'citizen'},
+     'numerator': {'question': 'q2_online_usage', 'any_of': ['Da, frecvent', 'Da, uneori']}},
+    {'name': 'platform_usefulness_score', 'type': 'mean', 'cohort': {'respondent_type': 'citizen'},
+     'question': 'q8_usefulness'},
+    {'name': 'satisfaction_rate', 'type': 'rate', 'cohort': {'respondent_type': 'citizen'},
+     'numerator': {'question': 'q8_usefulness', 'min_rating': 4},
+     'denominator': {'question': 'q8_usefulness', 'answered': True}},
+    {'name': 'recommendation_rate', 'type': 'rate', 'cohort': {'respondent_type': 'citizen'},
+     'numerator': {'question': 'q9_recommend', 'any_of': ['Da']}},
+    {'name': 'official_readiness_score', 'type': 'mean', 'cohort': {'respondent_type': 'official'},
+     'question': 'q10_readiness'},
+    {'name': 'identity_acceptance_rate', 'type': 'rate', 'cohort': {'respondent_type': 'citizen'},
+     'numerator': {'question': 'q7_identity', 'any_of': ['Da, dacă este securizată', 'Da, fără probleme']}},
+]
+
+METRIC_TYPES = ('count', 'rate', 'mean')
+
+Predicate = Callable[[SurveyIndex], int]
+
+def load_metric_definitions(filepath: str) -> List[Dict]:
+    """Load extra metric definitions (JSON list) to evaluate next to VALIDATION_METRICS"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        definitions = json.load(f)
+    if not isinstance(definitions, list):
+        raise ValueError(f"{filepath}: expected a JSON list of metric definitions")
+    try:
+        MetricEvaluator(definitions)  # compile once so a bad definition fails at load, not mid-analysis
+    except ValueError as e:
+        raise ValueError(f"{filepath}: {e}") from None
+    return definitions
+
+def merge_definitions(base: List[Dict], extra: Iterable[Dict]) -> List[Dict]:
+    """Extra definitions replace base ones with the same name and are appended otherwise"""
+    merged = {d['name']: d for d in base}
+    merged.update({d['name']: d for d in extra})
+    return list(merged.values())
+
+def validate_definition(definition: Dict) -> None:
+    """Check the fields a metric type needs, raising ValueError that names the metric"""
+    if not isinstance(definition, dict) or not isinstance(definition.get('name'), str) or not definition['name']:
+        raise ValueError(f"Metric definition needs a non-empty 'name': {definition}")
+    name, kind = definition['name'], definition.get('type')
+    if kind not in METRIC_TYPES:
+        raise ValueError(f"Metric '{name}': type must be one of {METRIC_TYPES}")
+    if kind == 'rate' and not isinstance(definition.get('numerator'), dict):
+        raise ValueError(f"Metric '{name}': a rate needs a 'numerator' predicate")
+    if kind == 'mean' and not isinstance(definition.get('question'), str):
+        raise ValueError(f"Metric '{name}': a mean needs the 'question' whose ratings it averages")
+    for key in ('cohort', 'denominator'):
+        if key in definition and not isinstance(definition[key], dict):
+            raise ValueError(f"Metric '{name}': '{key}' must be a predicate object")
+
+def _ratings(index: SurveyIndex, question: str) -> Dict[int, int]:
+    return {value: bitmap for value, bitmap in index.answers.get(question, {}).items() if isinstance(value, (int, float))}
+
+def compile_predicate(spec: Dict, questions: Set[str]) -> Predicate:
+    """Compile a predicate spec into a function index → bitmap; referenced questions are collected"""
+    if 'all' in spec or 'any' in spec:
+        parts = [compile_predicate(p, questions) for p in spec.get('all', spec.get('any'))]
+        if 'all' in spec:
+            def conjunction(index: SurveyIndex) -> int:
+                bitmap = index.all
+                for part in parts:
+                    bitmap &= part(index)
+                return bitmap
+            return conjunction
+
+        def disjunction(index: SurveyIndex) -> int:
+            bitmap = 0
+            for part in parts:
+                bitmap |= part(index)
+            return bitmap
+        return disjunction
+
+    if 'not' in spec:
+        inner = compile_predicate(spec['not'], questions)
+        return lambda index: index.all & ~inner(index)
+
+    if 'question' in spec:
+        question = spec['question']
+        questions.add(question)
+        if 'any_of' in spec:
+            values = list(spec['any_of'])
+            return lambda index: _union(index.answers.get(question, {}).get(v, 0) for v in values)
+        if 'min_rating' in spec or 'max_rating' in spec:
+            low = spec.get('min_rating', float('-inf'))
+            high = spec.get('max_rating', float('inf'))
+            return lambda index: _union(b for v, b in _ratings(index, question).items() if low <= v <= high)
+        if spec.get('answered'):
+            return lambda index: _union(index.answers.get(question, {}).values())
+        raise ValueError(f"Question predicate needs any_of, min_rating/max_rating or answered: {spec}")
+
+    if len(spec) == 1 and next(iter(spec)) in FILTER_FIELDS:
+        field, values = next(iter(spec.items()))
+        return lambda index: index.select(**{field: values})
+
+    raise ValueError(f"Unknown predicate: {spec}")
+
+def _union(bitmaps: Iterable[int]) -> int:
+    result = 0
+    for bitmap in bitmaps:
+        result |= bitmap
+    return result
+
+class WeightedPopcount:
+    """
+    Weighted size of a bitmap.
+
+    Raked weights are constant per county x age cell, so respondents are
+    grouped by distinct weight into one bitmap each; a weighted count is
+    then a handful of AND + popcount operations.
+    """
+
+    def __init__(self, index: SurveyIndex, weights: Optional[Dict[str, float]]):
+        self.by_weight: Optional[Dict[float, int]] = None
+        if weights is not None:
+            positions: Dict[float, List[int]] = {}
+            for i, respondent_id in enumerate(index.ids):
+                positions.setdefault(weights.get(respondent_id, 1.0), []).append(i)
+            self.by_weight = {w: to_bitmap(p, len(index.ids)) for w, p in positions.items()}
+
+    def __call__(self, bitmap: int) -> float:
+        if self.by_weight is None:
+            return bitmap.bit_count()
+        return sum(w * (bitmap & members).bit_count() for w, members in self.by_weight.items())
+
+class MetricEvaluator:
+    """A batch of compiled metric definitions, evaluated together against one index"""
+
+    def __init__(self, definitions: List[Dict]):
+        self.questions: Set[str] = set()
+        self.compiled = []
+        for definition in definitions:
+            validate_definition(definition)
+            kind = definition['type']
+            try:
+                cohort = compile_predicate(definition.get('cohort', {'all': []}), self.questions)
+                numerator = compile_predicate(definition['numerator'], self.questions) if kind == 'rate' else None
+                denominator = compile_predicate(definition['denominator'], self.questions) if 'denominator' in definition else None
+            except (ValueError, TypeError, KeyError) as e:
+                raise ValueError(f"Metric '{definition['name']}': {e}") from None
+            if kind == 'mean':
+                self.questions.add(definition['question'])
+            self.compiled.append((definition, cohort, numerator, denominator))
+
+    def evaluate(self, index: SurveyIndex, weights: Optional[Dict[str, float]] = None) -> Dict:
+        count = WeightedPopcount(index, weights)
+
+        def weighted(bitmap: int) -> float:
+            value = count(bitmap)
+            return value if weights is None else round(value, 2)
+
+        results = {}
+        for definition, cohort, numerator, denominator in self.compiled:
+            members = cohort(index)
+            if definition['type'] == 'count':
+                results[definition['name']] = weighted(members)
+            elif definition['type'] == 'rate':
+                # Unrounded weighted counts: only the rate itself is rounded
+                base = count(members & denominator(index)) if denominator else count(members)
+                hits = count(members & numerator(index))
+                results[definition['name']] = round(hits / base * 100, definition.get('round', 1)) if base > 0 else 0
+            else:
+                ratings = _ratings(index, definition['question'])
+                total = count(_union(ratings.values()) & members)
+                score = sum(value * count(bitmap & members) for value, bitmap in ratings.items())
+                results[definition['name']] = round(score / total, definition.get('round', 2)) if total else 0
+        return results
+
+def evaluate_metrics(data: Dict, definitions: List[Dict], weights: Optional[Dict[str, float]] = None) -> Dict:
+    """Compile the definitions, index only the questions they reference and evaluate them in one batch"""
+    evaluator = MetricEvaluator(definitions)
+    return evaluator.evaluate(SurveyIndex(data, questions=evaluator.questions), weights)
@@ -0,0 +1,254 @@
+#!/usr/bin/env python3
+"""
+Survey Preview Mode
+Reproducible stratified sample (county x respondent_type) with design
+weights, plus error estimates for every distribution and validation metric
+"""
+
+import hashlib
+import json
+import math
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from survey_batch import partition_dataset
+from survey_query import _private_dir
+from survey_waves import load_export
+
+Z_95 = 1.96
+# Per-user cache (like the query index): the cached sample is loaded back as the dataset that gets analysed
+PREVIEW_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'survey-preview-cache'
+# Bumped when the cached sample format changes (2: design weights)
+PREVIEW_CACHE_VERSION = 2
+
+# Validation rates (percent) and the report path of their (unweighted) denominator
+RATE_METRICS = {
+    'digital_adoption_rate': ('validation_metrics', 'citizen_respondents'),
+    'recommendation_rate': ('validation_metrics', 'citizen_respondents'),
+    'identity_acceptance_rate': ('validation_metrics', 'citizen_respondents'),
+    'satisfaction_rate': ('citizen_insights', 'usefulness_rating', 'total_responses'),
+}
+
+# Respondent cohort of each report section and what every distribution in it counts:
+# a respondent field or the question it tallies. Shares and margins use the respondents
+# with a value / a non-empty answer as base, not the sum of the (top-10, multi-choice) tallies.
+SECTION_COHORTS = {'demographics': None, 'citizen_insights': 'citizen', 'official_insights': 'official'}
+DISTRIBUTION_BASES = {
+    'demographics': {
+        'age_distribution': ('field', 'age_category'),
+        'county_distribution': ('field', 'county'),
+        'locality_distribution': ('field', 'locality'),
+        'respondent_type_distribution': ('field', 'respondent_type'),
+    },
+    'citizen_insights': {
+        'interaction_frequency': ('question', 'q1_frequency'),
+        'online_usage': ('question', 'q2_online_usage'),
+        'pain_point_themes': ('question', 'q3_problems'),
+        'desired_features': ('question', 'q4_features'),
+        'identity_verification_willingness': ('question', 'q7_identity'),
+        'usefulness_rating': ('question', 'q8_usefulness'),
+        'recommendation': ('question', 'q9_recommend'),
+        'feature_requests': ('question', 'q10_suggestions'),
+    },
+    'official_insights': {
+        'citizen_interaction_frequency': ('question', 'q2_citizen_interaction'),
+        'it_system_usage': ('question', 'q5_it_usage'),
+        'digitalization_improvement_belief': ('question', 'q7_digitalization_improvement'),
+        'desired_features': ('question', 'q8_useful_features'),
+        'concerns': ('question', 'q9_concerns'),
+        'readiness_rating': ('question', 'q10_readiness'),
+    },
+}
+
+# Mean scores and the rating summary they come from
+SCORE_METRICS = {
+    'platform_usefulness_score': ('citizen_insights', 'usefulness_rating'),
+    'official_readiness_score': ('official_insights', 'readiness_rating'),
+}
+
+def _sample_key(respondent_id: str, seed: int) -> str:
+    """Stable pseudo-random sort key: same seed + id → same position, across runs and data refreshes"""
+    return hashlib.blake2b(f"{seed}:{respondent_id}".encode('utf-8'), digest_size=8).hexdigest()
+
+def stratified_sample(data: Dict, fraction: float, seed: int = 42) -> Tuple[Dict, Dict]:
+    """
+    Proportional stratified sample by county x respondent_type.
+
+    Each stratum keeps ceil(n_h * fraction) respondents (at least one),
+    chosen by a seeded hash of the respondent id, so the sample is
+    reproducible without a global RNG state. Rounding up oversamples
+    small strata, so every sampled respondent gets a design weight
+    proportional to N_h / n_h (normalised to average 1.0) in
+    sample['design_weights']; the Kish design effect of those weights
+    widens the reported margins.
+    """
+    if not 0 < fraction <= 1:
+        raise ValueError(f"Sample fraction must be in (0, 1], got {fraction}")
+
+    strata: Dict[Tuple, list] = {}
+    for r in data['respondents']:
+        strata.setdefault((r.get('county'), r.get('respondent_type')), []).append(r['id'])
+
+    selected = set()
+    inclusion: Dict[str, float] = {}
+    for ids in strata.values():
+        keep = max(1, math.ceil(len(ids) * fraction))
+        chosen = sorted(ids, key=lambda rid: _sample_key(rid, seed))[:keep]
+        selected.update(chosen)
+        inclusion.update((rid, len(ids) / keep) for rid in chosen)
+
+    sample = partition_dataset(data, lambda r: 'sample' if r['id'] in selected else None).get(
+        'sample', {'respondents': [], 'responses_by_question': {}, 'metadata': {}})
+    sample['metadata'] = {**data.get('metadata', {}), **sample['metadata']}
+    scale = len(inclusion) / sum(inclusion.values()) if inclusion else 1.0
+    sample['design_weights'] = {rid: round(w * scale, 6) for rid, w in inclusion.items()}
+
+    sampling = {
+        'fraction': fraction,
+        'seed': seed,
+        'strata': len(strata),
+        'population_respondents': len(data['respondents']),
+        'sampled_respondents': len(selected),
+        'effective_fraction': len(selected) / len(data['respondents']) if data['respondents'] else 1.0,
+        'design_effect': round(design_effect(sample['design_weights'].values()), 4),
+    }
+    sample['metadata']['sampling'] = sampling
+    return sample, sampling
+
+def load_preview(filepath: str, fraction: float, seed: int = 42, cache_dir: Optional[Path] = PREVIEW_CACHE_DIR) -> Dict:
+    """
+    Load a stratified preview sample of an export.
+
+    The sample is cached on disk keyed by the export's path, size, mtime,
+    fraction and seed: only the first preview of a given export pays for
+    parsing it in full, later iterations load just the sample. The cache
+    directory must be private to the user (0700) or it is not used, and the
+    cached file is replaced atomically.
+    """
+    stat = os.stat(filepath)
+    key = hashlib.sha256(f"{PREVIEW_CACHE_VERSION}|{os.path.abspath(filepath)}|{stat.st_size}|{stat.st_mtime_ns}|{fraction}|{seed}".encode('utf-8')).hexdigest()[:16]
+    cache_path = cache_dir / f"{Path(filepath).stem}-{key}.json" if cache_dir and _private_dir(cache_dir) else None
+
+    if cache_path and cache_path.exists():
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except ValueError:
+            pass  # corrupt copy: sample again
+
+    sample, _ = stratified_sample(load_export(filepath), fraction, seed)
+    if cache_path:
+        temp_path = cache_path.with_suffix(f'.{os.getpid()}.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(sample, f, ensure_ascii=False)
+        os.replace(temp_path, cache_path)
+    return sample
+
+def design_effect(weights) -> float:
+    """Kish design effect of unequal weights: n * sum(w^2) / sum(w)^2 (1.0 for equal weights)"""
+    weights = list(weights)
+    total = sum(weights)
+    return len(weights) * sum(w * w for w in weights) / (total * total) if total else 1.0
+
+def _answered(response: Dict) -> bool:
+    return bool(response.get('answer_choices')) or bool((response.get('answer_text') or '').strip()) \
+        or response.get('answer_rating') is not None
+
+def distribution_bases(data: Dict, weights: Optional[Dict[str, float]] = None) -> Dict[str, Dict[str, Tuple[float, int]]]:
+    """
+    (weighted base, respondents) behind every distribution of DISTRIBUTION_BASES, plus the cohort
+    size under '*': respondents with a value for the field / with a non-empty answer to the question
+    """
+    weight = (lambda rid: weights.get(rid, 1.0)) if weights is not None else (lambda rid: 1.0)
+    cohorts = {section: [r for r in data['respondents'] if cohort is None or r.get('respondent_type') == cohort]
+               for section, cohort in SECTION_COHORTS.items()}
+
+    def base(ids: List[str]) -> Tuple[float, int]:
+        return sum(weight(rid) for rid in ids), len(ids)
+
+    bases = {}
+    for section, sources in DISTRIBUTION_BASES.items():
+        members = cohorts[section]
+        member_ids = {r['id'] for r in members}
+        bases[section] = {'*': base([r['id'] for r in members])}
+        for name, (kind, source) in sources.items():
+            if kind == 'field':
+                ids = [r['id'] for r in members if r.get(source)]
+            else:
+                responses = data['responses_by_question'].get(source, {}).get('responses', [])
+                ids = list({r['respondent_id'] for r in responses if r['respondent_id'] in member_ids and _answered(r)})
+            bases[section][name] = base(ids)
+    return bases
+
+def _lookup(report: Dict, path: Tuple[str, ...]) -> Any:
+    for key in path:
+        report = report.get(key, {}) if isinstance(report, dict) else {}
+    return report
+
+def _fpc(sampling: Dict) -> float:
+    """Finite population correction for the realised sampling fraction, widened by the design effect"""
+    return math.sqrt(max(0.0, 1.0 - sampling['effective_fraction']) * sampling.get('design_effect', 1.0))
+
+def proportion_margin(p: float, n: float, sampling: Dict) -> float:
+    """95% margin of error (percentage points) of a proportion estimated from n sampled respondents"""
+    if n <= 0:
+        return 0.0
+    return round(Z_95 * math.sqrt(p * (1 - p) / n) * _fpc(sampling) * 100, 1)
+
+def mean_margin(distribution: Dict, sampling: Dict) -> float:
+    """95% margin of error of a mean rating, from its rating distribution"""
+    n = sum(distribution.values())
+    if n <= 1:
+        return 0.0
+    mean = sum(float(k) * v for k, v in distribution.items()) / n
+    variance = sum(v * (float(k) - mean) ** 2 for k, v in distribution.items()) / (n - 1)
+    return round(Z_95 * math.sqrt(variance / n) * _fpc(sampling), 2)
+
+def _distribution_errors(value: Any, sampling: Dict, base: Tuple[float, int]) -> Any:
+    """
+    Share of respondents and margin for every category of every (nested) distribution.
+    base is (weighted base, respondents): multi-choice categories are shares of respondents
+    and may add up to more than 100%.
+    """
+    if not isinstance(value, dict) or not value:
+        return None
+    if all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value.values()):
+        weighted_base, n = base
+        if not weighted_base or not n:
+            return None
+        return {
+            str(k): {'share_pct': round(v / weighted_base * 100, 1),
+                     'margin_pp': proportion_margin(min(1.0, v / weighted_base), n, sampling)}
+            for k, v in value.items()
+        }
+    nested = {k: _distribution_errors(v, sampling, base) for k, v in value.items()}
+    return {k: v for k, v in nested.items() if v} or None
+
+def estimate_errors(sections: Dict, data: Dict, weights: Optional[Dict[str, float]] = None) -> Dict:
+    """95% margins of error for validation metrics and every distribution of a preview run over data"""
+    sampling = data['metadata']['sampling']
+    metrics = {}
+    for name, path in RATE_METRICS.items():
+        value = sections['validation_metrics'].get(name)
+        n = _lookup(sections, path) or 0
+        if isinstance(value, (int, float)):
+            metrics[name] = {'value': value, 'margin_pp': proportion_margin(value / 100, n, sampling), 'n': n}
+    for name, path in SCORE_METRICS.items():
+        value = sections['validation_metrics'].get(name)
+        distribution = _lookup(sections, path + ('distribution',)) or {}
+        n = _lookup(sections, path + ('total_responses',)) or 0
+        metrics[name] = {'value': value, 'margin': mean_margin(distribution, sampling), 'n': n}
+
+    bases = distribution_bases(data, weights)
+    distributions = {}
+    for section in SECTION_COHORTS:
+        errors = {}
+        for name, value in (sections[section] or {}).items():
+            error = _distribution_errors(value, sampling, bases[section].get(name, bases[section]['*']))
+            if error:
+                errors[name] = error
+        if errors:
+            distributions[section] = errors
+
+    return {'validation_metrics': metrics, 'distributions': distributions}
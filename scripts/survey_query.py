@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+Survey Ad-hoc Query
+Inverted-index (bitmap) store over respondents and responses, usable as a
+Python API and as a CLI:
+
+    python3 scripts/survey_query.py export.json --type official --county Iași --group-by q9_concerns
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import stat
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Union
+
+from survey_waves import load_export
+
+FILTER_FIELDS = ('respondent_type', 'county', 'locality', 'age_category')
+# Per-user cache (not the shared temp dir): only this user can plant or read index files
+INDEX_CACHE_DIR = Path(os.environ.get('XDG_CACHE_HOME') or Path.home() / '.cache') / 'survey-query-index'
+INDEX_VERSION = 2
+
+def iter_bits(bitmap: int) -> Iterator[int]:
+    """Positions of the set bits of a bitmap, ascending (byte-wise, so sparse bitmaps skip empty bytes)"""
+    for byte_index, byte in enumerate(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')):
+        while byte:
+            low = byte & -byte
+            yield (byte_index << 3) + low.bit_length() - 1
+            byte ^= low
+
+def to_bitmap(positions: Iterable[int], size: int) -> int:
+    """Build a bitmap in one go (OR-ing bit by bit into a big int would copy it on every set)"""
+    buffer = bytearray((size + 7) // 8)
+    for position in positions:
+        buffer[position >> 3] |= 1 << (position & 7)
+    return int.from_bytes(buffer, 'little')
+
+def _private_dir(directory: Path) -> bool:
+    """Create directory with 0700 permissions; False if it exists but belongs to someone else"""
+    directory.mkdir(parents=True, mode=0o700, exist_ok=True)
+    info = directory.stat()
+    if hasattr(os, 'getuid'):
+        if info.st_uid != os.getuid():
+            return False
+        if stat.S_IMODE(info.st_mode) & 0o077:
+            directory.chmod(0o700)
+    return True
+
+class SurveyIndex:
+    """
+    Bitmap index over one survey export.
+
+    Respondents get positions in created_at order, so every filter value,
+    answer choice and rating maps to an int bitmap, and a date range is a
+    contiguous bit range. Queries are bitwise ANDs plus popcounts, with no
+    scan over respondents or responses.
+    """
+
+    def __init__(self, data: Dict, questions: Optional[Iterable[str]] = None):
+        """Index every question, or only `questions` when the caller knows which ones it needs"""
+        respondents = sorted(data['respondents'], key=lambda r: r.get('created_at') or '')
+        self.ids: List[str] = [r['id'] for r in respondents]
+        self.created_at: List[str] = [r.get('created_at') or '' for r in respondents]
+        self.all = (1 << len(respondents)) - 1
+        position = {rid: i for i, rid in enumerate(self.ids)}
+        size = len(respondents)
+
+        field_positions: Dict[str, Dict[str, List[int]]] = {field: {} for field in FILTER_FIELDS}
+        for i, r in enumerate(respondents):
+            for field in FILTER_FIELDS:
+                value = r.get(field)
+                if value is not None:
+                    field_positions[field].setdefault(value, []).append(i)
+        self.fields: Dict[str, Dict[str, int]] = {
+            field: {value: to_bitmap(positions, size) for value, positions in values.items()}
+            for field, values in field_positions.items()
+        }
+
+        # question_id → answer value (choice or rating) → bitmap; free text kept per position
+        self.answers: Dict[str, Dict[Union[str, int], int]] = {}
+        self.texts: Dict[str, Dict[int, str]] = {}
+        wanted = set(questions) if questions is not None else None
+        for question_id, question in data['responses_by_question'].items():
+            if wanted is not None and question_id not in wanted:
+                continue
+            answer_positions: Dict[Union[str, int], List[int]] = {}
+            for response in question['responses']:
+                i = position.get(response['respondent_id'])
+                if i is None:
+                    continue
+                for choice in response.get('answer_choices') or []:
+                    answer_positions.setdefault(choice, []).append(i)
+                if response.get('answer_rating') is not None:
+                    answer_positions.setdefault(response['answer_rating'], []).append(i)
+                if response.get('answer_text'):
+                    self.texts.setdefault(question_id, {})[i] = response['answer_text']
+            self.answers[question_id] = {value: to_bitmap(positions, size) for value, positions in answer_positions.items()}
+
+    def to_json(self) -> Dict:
+        """Plain-JSON form of the index: bitmaps as hex strings, answer values kept with their type"""
+        return {
+            'version': INDEX_VERSION,
+            'ids': self.ids,
+            'created_at': self.created_at,
+            'fields': {field: {value: f"{bitmap:x}" for value, bitmap in values.items()}
+                       for field, values in self.fields.items()},
+            'answers': {question_id: [[value, f"{bitmap:x}"] for value, bitmap in values.items()]
+                        for question_id, values in self.answers.items()},
+            'texts': {question_id: [[i, text] for i, text in texts.items()] for question_id, texts in self.texts.items()},
+        }
+
+    @classmethod
+    def from_json(cls, payload: Dict) -> 'SurveyIndex':
+        """Rebuild an index from to_json() output (plain data only, nothing executable)"""
+        if payload.get('version') != INDEX_VERSION:
+            raise ValueError(f"Index version {payload.get('version')} (expected {INDEX_VERSION})")
+        index = cls.__new__(cls)
+        index.ids = payload['ids']
+        index.created_at = payload['created_at']
+        index.all = (1 << len(index.ids)) - 1
+        index.fields = {field: {value: int(bitmap, 16) for value, bitmap in values.items()}
+                        for field, values in payload['fields'].items()}
+        index.answers = {question_id: {value: int(bitmap, 16) for value, bitmap in values}
+                         for question_id, values in payload['answers'].items()}
+        index.texts = {question_id: {i: text for i, text in texts} for question_id, texts in payload['texts'].items()}
+        return index
+
+    @classmethod
+    def from_export(cls, filepath: str, cache_dir: Optional[Path] = INDEX_CACHE_DIR) -> 'SurveyIndex':
+        """Build the index for an export, reusing an on-disk copy while the export is unchanged"""
+        path = Path(filepath).resolve()
+        info = os.stat(path)
+        cache_path = None
+        if cache_dir and _private_dir(cache_dir):
+            key = hashlib.sha256(f"{path}|{info.st_size}|{info.st_mtime_ns}|{INDEX_VERSION}".encode('utf-8')).hexdigest()[:24]
+            cache_path = cache_dir / f"{path.stem}-{key}.json"
+            if cache_path.exists():
+                try:
+                    with open(cache_path, 'r', encoding='utf-8') as f:
+                        return cls.from_json(json.load(f))
+                except (ValueError, KeyError, TypeError):
+                    pass  # corrupt or stale copy: rebuild the index
+
+        index = cls(load_export(str(path)))
+        if cache_path:
+            temp_path = cache_path.with_suffix('.tmp')
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(index.to_json(), f, ensure_ascii=False)
+            os.replace(temp_path, cache_path)
+        return index
+
+    def _field_bitmap(self, field: str, values: Union[str, Iterable[str]]) -> int:
+        values = [values] if isinstance(values, str) else list(values)
+        bitmap = 0
+        for value in values:
+            bitmap |= self.fields[field].get(value, 0)
+        return bitmap
+
+    def _date_bitmap(self, since: Optional[str], until: Optional[str]) -> int:
+        """Bit range of respondents created in [since, until] (ISO dates/timestamps, inclusive)"""
+        lo = bisect_left(self.created_at, since) if since else 0
+        hi = bisect_right(self.created_at, until + '￿') if until else len(self.created_at)
+        return ((1 << hi) - 1) ^ ((1 << lo) - 1) if hi > lo else 0
+
+    def select(self, since: Optional[str] = None, until: Optional[str] = None, **filters) -> int:
+        """Bitmap of respondents matching every filter (a list of values means any of them)"""
+        bitmap = self.all
+        for field, values in filters.items():
+            if field not in self.fields:
+                raise ValueError(f"Unknown filter '{field}' (expected one of {FILTER_FIELDS})")
+            if values is not None:
+                bitmap &= self._field_bitmap(field, values)
+        if since or until:
+            bitmap &= self._date_bitmap(since, until)
+        return bitmap
+
+    def group_by(self, selection: int, key: str) -> Dict:
+        """Answer distribution of a question (or value distribution of a respondent field) within a selection"""
+        if key in self.fields:
+            source = self.fields[key]
+        elif key in self.answers:
+            source = self.answers[key]
+        else:
+            raise ValueError(f"Unknown group-by '{key}' (not a question id or one of {FILTER_FIELDS})")
+        counts = {value: (bitmap & selection).bit_count() for value, bitmap in source.items()}
+        return dict(sorted(((k, v) for k, v in counts.items() if v), key=lambda x: x[1], reverse=True))
+
+    def query(self, group_by: Optional[List[str]] = None, since: Optional[str] = None,
+              until: Optional[str] = None, **filters) -> Dict:
+        """Filter respondents and group their answers; free-text questions return the matching texts"""
+        selection = self.select(since=since, until=until, **filters)
+        result = {
+            'filters': {**{k: v for k, v in filters.items() if v is not None}, 'since': since, 'until': until},
+            'respondents': selection.bit_count(),
+            'groups': {},
+        }
+        for key in group_by or []:
+            if key in self.texts and not self.answers.get(key):
+                texts = self.texts[key]
+                result['groups'][key] = [texts[i] for i in iter_bits(selection) if i in texts]
+            else:
+                result['groups'][key] = self.group_by(selection, key)
+        return result
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Ad-hoc queries over a survey export')
+    parser.add_argument('input', nargs='?', default='/tmp/survey-full-data.json', help='Survey export JSON')
+    parser.add_argument('--type', dest='respondent_type', action='append', help='citizen / official (repeatable)')
+    parser.add_argument('--county', action='append', help='County filter (repeatable)')
+    parser.add_argument('--locality', action='append', help='Locality filter (repeatable)')
+    parser.add_argument('--age', dest='age_category', action='append', help='Age category filter (repeatable)')
+    parser.add_argument('--since', help='Created at or after (ISO date)')
+    parser.add_argument('--until', help='Created at or before (ISO date, inclusive)')
+    parser.add_argument('--group-by', action='append', default=[], help='Question id or respondent field (repeatable)')
+    parser.add_argument('--json', action='store_true', help='Print the raw JSON result')
+    parser.add_argument('--no-cache', action='store_true', help='Rebuild the index instead of using the on-disk copy')
+    args = parser.parse_args(argv)
+
+    index = SurveyIndex.from_export(args.input, cache_dir=None if args.no_cache else INDEX_CACHE_DIR)
+    try:
+        result = index.query(
+            group_by=args.group_by, since=args.since, until=args.until,
+            respondent_type=args.respondent_type, county=args.county,
+            locality=args.locality, age_category=args.age_category,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+        return
+
+    print(f"🔎 {result['respondents']} respondents match {result['filters']}")
+    for key, groups in result['groups'].items():
+        print(f"\n📊 {key}")
+        if isinstance(groups, list):
+            for text in groups:
+                print(f"  - {text}")
+        else:
+            for value, count in groups.items():
+                print(f"  {count:>8}  {value}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Survey Report PDF
+Renders an in-memory analysis report (full_report) to markdown/HTML sections
+with SVG charts and writes it through the WeasyPrint path of
+generate_raport_pdf.py, without a JSON round trip.
+
+Charts go in like Mermaid diagrams: a ```chart fence naming the chart is
+replaced during the Markdown conversion (htmlStash) by an <img> whose
+diagram: URL is served to WeasyPrint by diagram_url_fetcher.
+
+    python3 scripts/comprehensive-survey-analysis.py export.json --pdf raport-survey.pdf
+    python3 scripts/survey_report_pdf.py /tmp/survey-analysis-report.json --output raport-survey.pdf
+"""
+
+import argparse
+import html
+import json
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from markdown.extensions import Extension
+from markdown.preprocessors import Preprocessor
+
+from generate_raport_pdf import markdown_to_html, write_pdf
+from mermaid_markdown import code_fences
+from mermaid_render import reference_image, release_images
+from survey_charts import report_charts
+
+SURVEY_PDF_TITLE = 'primariaTa❤️_ | Raport Survey | primariata.work'
+DEFAULT_PDF_PATH = '/tmp/survey-analysis-report.pdf'
+
+CHART_CSS = """
+.chart {
+    page-break-inside: avoid;
+    margin: 12pt 0;
+    text-align: center;
+}
+
+.chart img {
+    max-width: 90%;
+    height: auto;
+}
+"""
+
+Charts = Dict[str, Tuple[str, str]]
+
+# Characters with a meaning in Markdown (or in a pipe table) inside a table cell
+MARKDOWN_SPECIAL_PATTERN = re.compile(r'([\\`*_\[\]|])')
+
+def _fmt(value) -> str:
+    if isinstance(value, float):
+        return f"{value:.2f}".rstrip('0').rstrip('.')
+    return str(value)
+
+def _cell(value) -> str:
+    """Table cell text: HTML-escaped, Markdown and pipe characters backslash-escaped"""
+    return MARKDOWN_SPECIAL_PATTERN.sub(r'\\\1', html.escape(_fmt(value), quote=False))
+
+def _table(headers: Sequence[str], rows: List[Sequence]) -> str:
+    lines = ['| ' + ' | '.join(headers) + ' |', '|' + '---|' * len(headers)]
+    lines.extend('| ' + ' | '.join(_cell(v) for v in row) + ' |' for row in rows)
+    return '\n'.join(lines)
+
+def _distribution_table(distribution: Dict, label: str) -> str:
+    total = sum(distribution.values()) or 1
+    rows = [(key, value, f"{value / total * 100:.1f}%")
+            for key, value in sorted(distribution.items(), key=lambda item: item[1], reverse=True)]
+    return _table([label, 'Răspunsuri', 'Pondere'], rows)
+
+def _chart(charts: Charts, name: str) -> str:
+    """A ```chart fence naming the chart, replaced by ChartExtension during the conversion"""
+    return f'```chart\n{name}\n```' if name in charts else ''
+
+def _distribution_block(title: str, distribution: Optional[Dict], label: str, charts: Charts, chart: str) -> List[str]:
+    if not distribution:
+        return []
+    return [f'### {title}', '', _chart(charts, chart), '', _distribution_table(distribution, label), '']
+
+def report_markdown(report: Dict, charts: Charts) -> str:
+    """Markdown for every section of the report, with chart placeholders"""
+    demographics = report.get('demographics', {})
+    citizens = report.get('citizen_insights', {})
+    officials = report.get('official_insights', {})
+    metadata = report.get('analysis_metadata', {})
+
+    # The executive summary keeps its own headings one level below the document title
+    summary = re.sub(r'^(#+) ', r'#\1 ', report.get('executive_summary', '').strip(), flags=re.MULTILINE)
+    parts = ['# Raport Survey primariata.work', '',
+             f"**Data analizei**: {metadata.get('analysis_date', '')[:10]}  ",
+             f"**Respondenți**: {metadata.get('total_respondents_analyzed', 0)}  ",
+             f"**Răspunsuri**: {metadata.get('total_responses_analyzed', 0)}", '',
+             '---', '', summary, '']
+
+    parts += ['<div class="section-break"></div>', '', '## 1. Demografie', '']
+    parts += _distribution_block('Tip respondent', demographics.get('respondent_type_distribution'), 'Tip', charts, 'respondent_types')
+    parts += _distribution_block('Vârstă', demographics.get('age_distribution'), 'Categorie', charts, 'age_distribution')
+    parts += _distribution_block('Județe', demographics.get('county_distribution'), 'Județ', charts, 'county_distribution')
+    if demographics:
+        parts += [f"**Rata de completare**: {demographics.get('completion_rate')} — "
+                  f"**Localități**: {demographics.get('unique_localities')}", '']
+
+    parts += ['<div class="section-break"></div>', '', '## 2. Cetățeni', '']
+    parts += _distribution_block('Utilizare servicii online', citizens.get('online_usage'), 'Răspuns', charts, 'online_usage')
+    parts += _distribution_block('Probleme principale', citizens.get('pain_point_themes'), 'Temă', charts, 'pain_point_themes')
+    parts += _distribution_block('Funcționalități dorite', citizens.get('desired_features'), 'Funcționalitate', charts, 'citizen_features')
+    usefulness = citizens.get('usefulness_rating')
+    if usefulness:
+        parts += ['### Utilitate platformă', '', _chart(charts, 'usefulness_rating'), '',
+                  f"Medie: **{usefulness['average']}** din {usefulness['total_responses']} răspunsuri", '']
+    parts += _distribution_block('Verificare identitate', citizens.get('identity_verification_willingness'), 'Răspuns', charts, 'identity_verification')
+    parts += _distribution_block('Recomandare', citizens.get('recommendation'), 'Răspuns', charts, 'recommendation')
+
+    parts += ['<div class="section-break"></div>', '', '## 3. Funcționari publici', '']
+    parts += _distribution_block('Sisteme IT', officials.get('it_system_usage'), 'Răspuns', charts, 'it_system_usage')
+    parts += _distribution_block('Digitalizarea va îmbunătăți activitatea', officials.get('digitalization_improvement_belief'), 'Răspuns', charts, 'digitalization_belief')
+    parts += _distribution_block('Funcționalități dorite', officials.get('desired_features'), 'Funcționalitate', charts, 'official_features')
+    parts += _distribution_block('Îngrijorări', officials.get('concerns'), 'Îngrijorare', charts, 'official_concerns')
+    readiness = officials.get('readiness_rating')
+    if readiness:
+        parts += ['### Pregătire pentru digitalizare', '', _chart(charts, 'readiness_rating'), '',
+                  f"Medie: **{readiness['average']}** din {readiness['total_responses']} răspunsuri", '']
+
+    metrics = report.get('validation_metrics', {})
+    if metrics:
+        parts += ['## 4. Metrici de validare', '', _table(['Metrică', 'Valoare'], list(metrics.items())), '']
+
+    cooccurrence = report.get('choice_cooccurrence', {})
+    if cooccurrence:
+        parts += ['<div class="section-break"></div>', '', '## 5. Opțiuni alese împreună', '']
+        for question_id, result in cooccurrence.items():
+            rows = [(' + '.join(p['items']), p['count'], f"{p['support_pct']}%", p['lift']) for p in result.get('pairs', [])]
+            if rows:
+                parts += [f'### {question_id}', '', _table(['Opțiuni', 'Respondenți (ponderat)' if result.get('weighted') else 'Respondenți', 'Suport', 'Lift'], rows), '']
+
+    sentiment = report.get('sentiment', {})
+    if sentiment:
+        parts += ['## 6. Sentiment răspunsuri libere', '']
+        for question_id, result in sentiment.items():
+            overall = result['overall']
+            parts += [f'### {question_id}', '', _chart(charts, f'sentiment_{question_id}'), '',
+                      _table(['Pozitiv', 'Neutru', 'Negativ', 'Scor mediu'],
+                             [(overall['positive'], overall['neutral'], overall['negative'], overall['average_score'])]), '']
+
+    parts += ['## 7. Metodologie', '']
+    weighting = metadata.get('weighting')
+    if weighting:
+        parts += [f"Ponderare prin raking pe {', '.join(weighting.get('dimensions', []))}: "
+                  f"{weighting.get('iterations')} iterații, ESS {weighting.get('effective_sample_size')}, "
+                  f"ponderi între {weighting.get('min_weight')} și {weighting.get('max_weight')}.", '']
+    else:
+        parts += ['Rezultate neponderate.', '']
+    preview = report.get('preview')
+    if preview:
+        sampling = preview['sampling']
+        rows = [(name, estimate['value'], f"±{estimate['margin_pp']} pp" if 'margin_pp' in estimate else f"±{estimate['margin']}", estimate['n'])
+                for name, estimate in preview['error_estimates']['validation_metrics'].items()]
+        parts += [f"**Preview**: eșantion stratificat de {sampling['sampled_respondents']} din "
+                  f"{sampling['population_respondents']} respondenți (seed {sampling['seed']}); marje de eroare 95%:", '',
+                  _table(['Metrică', 'Valoare', 'Marjă', 'n'], rows), '']
+    return '\n'.join(parts)
+
+class ChartPreprocessor(Preprocessor):
+    """Replaces every ```chart fence with the chart's <img>, stored in the htmlStash"""
+
+    def __init__(self, md, extension):
+        super().__init__(md)
+        self.extension = extension
+
+    def run(self, lines: List[str]) -> List[str]:
+        charts, temp_dir = self.extension.charts, self.extension.temp_dir
+        output, previous_end = [], -1
+        for start, end, marker, info in code_fences(lines):
+            if marker[0] != '`' or info != 'chart':
+                continue
+            name = '\n'.join(lines[start + 1:end]).strip()
+            if name not in charts:
+                raise ValueError(f"Unknown chart: {name}")
+            if not temp_dir:
+                raise ValueError("ChartExtension needs a temp_dir for the chart files (removed by the caller after the PDF)")
+            title, svg = charts[name]
+            path = os.path.join(temp_dir, f'chart_{name}.svg')
+            Path(path).write_text(svg, encoding='utf-8')
+            figure = f'<div class="chart"><img src="{reference_image(path)}" alt="{html.escape(title)}" /></div>'
+            output.extend(lines[previous_end + 1:start])
+            output.extend(['', self.md.htmlStash.store(figure), ''])
+            previous_end = end
+        output.extend(lines[previous_end + 1:])
+        return output
+
+class ChartExtension(Extension):
+    """Survey charts for the Markdown conversion; charts and temp_dir are set before each convert"""
+
+    def __init__(self, **kwargs):
+        self.charts: Charts = {}
+        self.temp_dir: Optional[str] = None
+        super().__init__(**kwargs)
+
+    def extendMarkdown(self, md):
+        md.registerExtension(self)
+        # Before fenced_code (25) and next to the Mermaid preprocessor (28)
+        md.preprocessors.register(ChartPreprocessor(md, self), 'survey_chart', 27)
+
+# One instance, so the builder keeps reusing the same Markdown object
+chart_extension = ChartExtension()
+
+def render_report_html(report: Dict, temp_dir: str, markdown_path: Optional[str] = None) -> str:
+    """
+    HTML body of the survey report, charts included; optionally keep the generated markdown.
+    Chart and diagram images go to temp_dir, which must outlive the PDF write.
+    """
+    charts = report_charts(report)
+    md_content = report_markdown(report, charts)
+    if markdown_path:
+        Path(markdown_path).write_text(md_content, encoding='utf-8')
+    chart_extension.charts, chart_extension.temp_dir = charts, temp_dir
+    try:
+        return markdown_to_html(md_content, temp_dir, extra_extensions=[chart_extension])
+    finally:
+        chart_extension.charts, chart_extension.temp_dir = {}, None
+
+def write_report_pdf(report: Dict, output_path: str = DEFAULT_PDF_PATH, markdown_path: Optional[str] = None) -> Path:
+    """Render the report and write the PDF in this process (chart/diagram images are released afterwards)"""
+    with tempfile.TemporaryDirectory(prefix='survey-report-') as temp_dir:
+        try:
+            write_pdf(render_report_html(report, temp_dir, markdown_path), output_path,
+                      title=SURVEY_PDF_TITLE, extra_css=CHART_CSS)
+        finally:
+            release_images(temp_dir)
+    return Path(output_path)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description='Render a survey analysis report JSON to PDF')
+    parser.add_argument('report', nargs='?', default='/tmp/survey-analysis-report.json', help='Analysis report JSON')
+    parser.add_argument('--output', default=DEFAULT_PDF_PATH, help=f'PDF path (default: {DEFAULT_PDF_PATH})')
+    parser.add_argument('--markdown', help='Also write the generated markdown here')
+    args = parser.parse_args(argv)
+
+    with open(args.report, 'r', encoding='utf-8') as f:
+        report = json.load(f)
+    print("📄 Generare PDF în curs...")
+    output_path = write_report_pdf(report, args.output, args.markdown)
+    print(f"✅ PDF generat cu succes: {output_path}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Survey Sentiment
+Offline lexicon-based sentiment for Romanian free-text answers, with negation
+handling and per-cohort distributions
+"""
+
+import json
+from collections import defaultdict
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from survey_text import normalize_term, tokenize
+from survey_weighting import weighted_tally
+
+DEFAULT_LEXICON_PATH = Path(__file__).parent / 'data' / 'sentiment-lexicon-ro.json'
+
+# Free-text question → respondent type it is asked to
+TEXT_QUESTIONS = {
+    'q3_problems': 'citizen',
+    'q10_suggestions': 'citizen',
+    'q4_difficulties': 'official',
+}
+
+# A lexicon stem matches tokens that extend it by at most this many letters
+# ('problem' → 'problemele', but 'util' ↛ 'utilizator')
+MAX_SUFFIX = 4
+
+class SentimentLexicon:
+    """Stem lexicon with polarity weights; a negator flips the next `negation_window` tokens"""
+
+    def __init__(self, stems: Dict[str, int], negators: Iterable[str], negation_window: int = 3):
+        # Entries are normalized like the answers (diacritics folded), so 'rău' also matches 'rau'
+        self.stems = {normalize_term(stem): polarity for stem, polarity in stems.items()}
+        self.stem_lengths = sorted({len(s) for s in self.stems}, reverse=True)
+        self.negators = frozenset(normalize_term(n) for n in negators)
+        self.negation_window = negation_window
+        self._polarity_cache: Dict[str, int] = {}
+
+    @classmethod
+    def from_file(cls, filepath: Path = DEFAULT_LEXICON_PATH) -> 'SentimentLexicon':
+        with open(filepath, 'r', encoding='utf-8') as f:
+            lexicon = json.load(f)
+        return cls(lexicon['stems'], lexicon.get('negators', []), lexicon.get('negation_window', 3))
+
+    def polarity(self, token: str) -> int:
+        """Polarity of one token (longest matching stem wins), memoized per token"""
+        cached = self._polarity_cache.get(token)
+        if cached is not None:
+            return cached
+        polarity = 0
+        for length in self.stem_lengths:
+            if length <= len(token) <= length + MAX_SUFFIX and token[:length] in self.stems:
+                polarity = self.stems[token[:length]]
+                break
+        self._polarity_cache[token] = polarity
+        return polarity
+
+    def score(self, text: str) -> float:
+        """Mean polarity of the sentiment-bearing tokens (0.0 when there are none)"""
+        total = 0
+        hits = 0
+        negated_until = -1
+        for i, token in enumerate(tokenize(text)):
+            if token in self.negators:
+                negated_until = i + self.negation_window
+                continue
+            polarity = self.polarity(token)
+            if polarity:
+                total += -polarity if i <= negated_until else polarity
+                hits += 1
+        return total / hits if hits else 0.0
+
+    def score_batch(self, texts: List[str]) -> List[float]:
+        """Score a batch of texts; duplicate answers ('Nu', 'Nimic') are scored once"""
+        unique: Dict[str, float] = {}
+        for text in texts:
+            if text not in unique:
+                unique[text] = self.score(text)
+        return [unique[text] for text in texts]
+
+@lru_cache(maxsize=None)
+def default_lexicon() -> SentimentLexicon:
+    """The bundled lexicon, loaded once per process so its token cache is shared across runs"""
+    return SentimentLexicon.from_file()
+
+def sentiment_label(score: float) -> str:
+    return 'positive' if score > 0 else 'negative' if score < 0 else 'neutral'
+
+def _summarize(scored: List[Tuple[str, float]], weights: Optional[Dict[str, float]]) -> Dict:
+    """Label distribution and (weighted) mean score of (respondent_id, score) pairs"""
+    labels = weighted_tally(((rid, sentiment_label(score)) for rid, score in scored), weights)
+    weight_of = (lambda rid: weights.get(rid, 1.0)) if weights is not None else (lambda rid: 1.0)
+    total_weight = sum(weight_of(rid) for rid, _ in scored)
+    return {
+        'positive': labels.get('positive', 0),
+        'neutral': labels.get('neutral', 0),
+        'negative': labels.get('negative', 0),
+        'average_score': round(sum(weight_of(rid) * score for rid, score in scored) / total_weight, 3) if total_weight else 0,
+        'total_responses': len(scored),
+    }
+
+def analyze_sentiment(responses_by_question: Dict, respondents: List[Dict], weights: Optional[Dict[str, float]] = None,
+                      lexicon: Optional[SentimentLexicon] = None, cohort_field: str = 'age_category',
+                      batch_size: int = 4096) -> Dict:
+    """Sentiment distribution of every free-text question, overall and per cohort"""
+    lexicon = lexicon or default_lexicon()
+    respondent_by_id = {r['id']: r for r in respondents}
+    results = {}
+
+    for question_id, respondent_type in TEXT_QUESTIONS.items():
+        if question_id not in responses_by_question:
+            continue
+        answers = [(r['respondent_id'], r['answer_text']) for r in responses_by_question[question_id]['responses']
+                   if r['answer_text'] and respondent_by_id.get(r['respondent_id'], {}).get('respondent_type') == respondent_type]
+
+        scored: List[Tuple[str, float]] = []
+        for start in range(0, len(answers), batch_size):
+            batch = answers[start:start + batch_size]
+            scores = lexicon.score_batch([text for _, text in batch])
+            scored.extend((rid, score) for (rid, _), score in zip(batch, scores))
+
+        by_cohort: Dict[str, List[Tuple[str, float]]] = defaultdict(list)
+        for rid, score in scored:
+            cohort = respondent_by_id[rid].get(cohort_field)
+            if cohort:
+                by_cohort[cohort].append((rid, score))
+
+        results[question_id] = {
+            'respondent_type': respondent_type,
+            'overall': _summarize(scored, weights),
+            'cohort_field': cohort_field,
+            'cohorts': {cohort: _summarize(items, weights) for cohort, items in sorted(by_cohort.items())},
+        }
+    return results
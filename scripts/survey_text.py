@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Survey Text Processing
+Shared Romanian text normalization for free-text answers: Unicode NFC,
+cedilla → comma-below (ş/ţ → ș/ț), lowercase, whitespace collapse and
+diacritic folding ('așteptare' and 'asteptare' match alike).
+
+Every text consumer (theme matcher, sentiment) goes through normalize(),
+which processes each distinct answer once and keeps the most recent
+NORMALIZE_CACHE_SIZE results (bounded, so batch and watch runs do not
+grow with every answer ever seen).
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+from typing import Iterable, NamedTuple, Pattern, Tuple
+
+TOKEN_PATTERN = re.compile(r"\w+")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Legacy cedilla forms (ISO-8859-2 era keyboards) → correct comma-below forms
+CEDILLA_TO_COMMA = str.maketrans({'ş': 'ș', 'Ş': 'Ș', 'ţ': 'ț', 'Ţ': 'Ț'})
+
+class NormalizedText(NamedTuple):
+    normalized: str             # NFC, comma-below, lowercase, single spaces
+    folded: str                 # normalized without diacritics
+    tokens: Tuple[str, ...]     # word tokens of the folded form
+
+NORMALIZE_CACHE_SIZE = 65536
+
+def fold_diacritics(text: str) -> str:
+    """Strip combining marks: ă/â → a, î → i, ș → s, ț → t (and any other accent)"""
+    if text.isascii():
+        return text
+    decomposed = unicodedata.normalize('NFD', text)
+    return unicodedata.normalize('NFC', ''.join(c for c in decomposed if not unicodedata.combining(c)))
+
+def _normalize(text: str) -> NormalizedText:
+    normalized = unicodedata.normalize('NFC', text).translate(CEDILLA_TO_COMMA).lower()
+    normalized = WHITESPACE_PATTERN.sub(' ', normalized).strip()
+    folded = fold_diacritics(normalized)
+    return NormalizedText(normalized, folded, tuple(TOKEN_PATTERN.findall(folded)))
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
+def normalize(text: str) -> NormalizedText:
+    """Normalized forms of an answer, computed once per distinct text (LRU-bounded)"""
+    return _normalize(text)
+
+def normalize_text(text: str, fold_accents: bool = True) -> str:
+    """Normalized text used for keyword matching (diacritic-folded by default)"""
+    result = normalize(text)
+    return result.folded if fold_accents else result.normalized
+
+def tokenize(text: str) -> Tuple[str, ...]:
+    """Word tokens of the folded text"""
+    return normalize(text).tokens
+
+def normalize_term(term: str) -> str:
+    """Normalize a keyword / lexicon entry the same way answers are normalized (not cached)"""
+    return _normalize(term).folded
+
+@lru_cache(maxsize=None)
+def compile_keywords(keywords: Tuple[str, ...]) -> Pattern:
+    """One alternation regex per keyword set, so a text is scanned once instead of once per keyword"""
+    return re.compile('|'.join(re.escape(normalize_term(k)) for k in keywords))
+
+def matches_any(text: str, keywords: Iterable[str]) -> bool:
+    """True when the folded text contains any of the (folded) keywords"""
+    return compile_keywords(tuple(keywords)).search(normalize_text(text)) is not None
+
+def clear_cache():
+    normalize.cache_clear()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Survey Wave Merge & Comparison
+Loads several survey exports as per-wave datasets (merged only on demand)
+and computes wave-over-wave deltas from the per-wave aggregates
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+def group_responses_by_question(responses: List[Dict]) -> Dict:
+    """Group a flat survey_responses table the same way analyze-survey-data.js does"""
+    grouped: Dict[str, Dict] = {}
+    for response in responses:
+        question_id = response['question_id']
+        if question_id not in grouped:
+            grouped[question_id] = {
+                'question_id': question_id,
+                'question_type': response.get('question_type'),
+                'responses': [],
+            }
+        grouped[question_id]['responses'].append(response)
+    return grouped
+
+def load_export(filepath: str) -> Dict:
+    """Load a survey export (grouped JSON) or a raw DB snapshot (flat respondents + responses)"""
+    with open(filepath, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    if 'responses_by_question' not in data:
+        data['responses_by_question'] = group_responses_by_question(data.get('responses', []))
+    data.pop('responses', None)
+    data.pop('responses_by_respondent', None)
+    metadata = data.setdefault('metadata', {})
+    metadata.setdefault('fetched_at', None)
+    metadata.setdefault('total_respondents', len(data['respondents']))
+    metadata.setdefault('total_responses', sum(len(q['responses']) for q in data['responses_by_question'].values()))
+    return data
+
+def wave_respondent_id(label: str, respondent_id: str) -> str:
+    """Respondent id within the merged dataset: the same person in two waves is two records"""
+    return f"{label}:{respondent_id}"
+
+def load_waves(filepaths: List[str], labels: Optional[List[str]] = None) -> Dict:
+    """
+    Parse the exports into one dataset per wave, kept separate.
+
+    Each wave is analyzed on its own dataset, with its original respondent ids;
+    the number of respondents already seen in an earlier wave is recorded per
+    wave. Use merge_waves() only when a combined view is needed. Exports are
+    parsed in-process: handing a parsed export back from a worker process costs
+    about as much as parsing it.
+    """
+    labels = labels or [Path(p).stem for p in filepaths]
+    if len(labels) != len(filepaths):
+        raise ValueError(f"Got {len(labels)} wave labels for {len(filepaths)} exports")
+    if len(set(labels)) != len(labels):
+        raise ValueError(f"Wave labels must be unique: {labels}")
+
+    waves: Dict[str, Dict] = {}
+    seen = set()
+    for label, filepath in zip(labels, filepaths):
+        data = load_export(filepath)
+        wave_ids = {r['id'] for r in data['respondents']}
+        data['metadata'] = {**data['metadata'], 'total_respondents': len(data['respondents']),
+                            'total_responses': sum(len(q['responses']) for q in data['responses_by_question'].values()),
+                            'new_respondents': len(wave_ids - seen), 'repeat_respondents': len(wave_ids & seen)}
+        seen |= wave_ids
+        waves[label] = data
+
+    wave_metadata = {label: wave['metadata'] for label, wave in waves.items()}
+    return {
+        'metadata': {
+            'fetched_at': max((m['fetched_at'] for m in wave_metadata.values() if m['fetched_at']), default=None),
+            'total_respondents': sum(m['total_respondents'] for m in wave_metadata.values()),
+            'total_responses': sum(m['total_responses'] for m in wave_metadata.values()),
+            'waves': wave_metadata,
+        },
+        'wave_labels': labels,
+        'waves': waves,
+    }
+
+def merge_waves(waves: Dict) -> Dict:
+    """
+    Combined dataset of the waves loaded by load_waves(), for analyses across all waves.
+
+    Every respondent is tagged with its wave label and keyed by (wave, id), so
+    a respondent who answers again in a later wave counts in both waves.
+    """
+    respondents: List[Dict] = []
+    responses_by_question: Dict[str, Dict] = {}
+    for label in waves['wave_labels']:
+        data = waves['waves'][label]
+        wave_ids = {r['id'] for r in data['respondents']}
+        for r in data['respondents']:
+            respondents.append({**r, 'id': wave_respondent_id(label, r['id']), 'wave': label})
+        for question_id, question in data['responses_by_question'].items():
+            merged = responses_by_question.setdefault(question_id, {**question, 'responses': []})
+            merged['responses'].extend({**r, 'respondent_id': wave_respondent_id(label, r['respondent_id'])}
+                                       for r in question['responses'] if r['respondent_id'] in wave_ids)
+    return {
+        'metadata': {**waves['metadata'], 'total_respondents': len(respondents),
+                     'total_responses': sum(len(q['responses']) for q in responses_by_question.values())},
+        'wave_labels': waves['wave_labels'],
+        'respondents': respondents,
+        'responses_by_question': responses_by_question,
+    }
+
+def _is_distribution(value: Any) -> bool:
+    return isinstance(value, dict) and bool(value) and all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in value.values())
+
+def distribution_delta(previous: Dict, current: Dict) -> Dict:
+    """Per-key count delta and share delta (percentage points) between two distributions"""
+    previous_total = sum(previous.values()) or 1
+    current_total = sum(current.values()) or 1
+    delta = {}
+    for key in list(current) + [k for k in previous if k not in current]:
+        before = previous.get(key, 0)
+        after = current.get(key, 0)
+        delta[str(key)] = {
+            'count_delta': round(after - before, 2),
+            'share_delta_pp': round((after / current_total - before / previous_total) * 100, 1),
+        }
+    return delta
+
+def section_delta(previous: Any, current: Any) -> Any:
+    """Recursive delta of two insight sections: numbers → difference, distributions → share shifts"""
+    if isinstance(previous, bool) or isinstance(current, bool):
+        return None
+    if isinstance(previous, (int, float)) and isinstance(current, (int, float)):
+        return round(current - previous, 2)
+    if _is_distribution(previous) or _is_distribution(current):
+        if isinstance(previous, dict) and isinstance(current, dict):
+            return distribution_delta(previous, current)
+        return None
+    if isinstance(previous, dict) and isinstance(current, dict):
+        result = {}
+        for key in list(current) + [k for k in previous if k not in current]:
+            delta = section_delta(previous.get(key), current.get(key))
+            if delta not in (None, {}):
+                result[key] = delta
+        return result
+    if isinstance(previous, list) and isinstance(current, list):
+        return {'count_delta': len(current) - len(previous)}
+    return None
+
+def compute_wave_deltas(wave_reports: Dict[str, Dict], sections: List[str]) -> Dict[str, Dict]:
+    """Deltas between consecutive waves for every distribution and numeric metric"""
+    labels = list(wave_reports)
+    deltas = {}
+    for previous, current in zip(labels, labels[1:]):
+        deltas[f"{previous} → {current}"] = {
+            section: section_delta(wave_reports[previous][section], wave_reports[current][section])
+            for section in sections
+        }
+    return deltas
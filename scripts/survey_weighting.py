@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Survey Post-Stratification Weighting
+Rakes respondent weights against population margins (county / age_category)
+"""
+
+import csv
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+RAKING_DIMENSIONS = ('county', 'age_category')
+
+def load_population_margins(filepath: str) -> Dict[str, Dict[str, float]]:
+    """Load population margins from CSV (columns: dimension, category, population)"""
+    margins: Dict[str, Dict[str, float]] = defaultdict(dict)
+    with open(filepath, 'r', encoding='utf-8', newline='') as f:
+        for row in csv.DictReader(f):
+            dimension = row['dimension'].strip()
+            if dimension not in RAKING_DIMENSIONS:
+                raise ValueError(f"Unknown margin dimension '{dimension}' (expected one of {RAKING_DIMENSIONS})")
+            margins[dimension][row['category'].strip()] = float(row['population'])
+    return dict(margins)
+
+def _collapse_cells(respondents: List[Dict], dimensions: Tuple[str, ...], margins: Dict,
+                    base_weights: Optional[Dict[str, float]] = None) -> Tuple[Dict[Tuple, float], Dict[str, Tuple]]:
+    """Collapse respondents into raking cells (summing base weights); a value missing from the margins becomes None"""
+    cell_counts: Dict[Tuple, float] = defaultdict(float)
+    respondent_cells: Dict[str, Tuple] = {}
+    for r in respondents:
+        cell = tuple(r.get(d) if r.get(d) in margins[d] else None for d in dimensions)
+        cell_counts[cell] += base_weights.get(r['id'], 1.0) if base_weights else 1.0
+        respondent_cells[r['id']] = cell
+    return dict(cell_counts), respondent_cells
+
+def rake_weights(respondents: List[Dict], margins: Dict[str, Dict[str, float]],
+                 max_iterations: int = 100, tolerance: float = 1e-6,
+                 base_weights: Optional[Dict[str, float]] = None) -> Tuple[Dict[str, float], Dict]:
+    """
+    Iterative proportional fitting over (county x age_category) cells.
+
+    Respondents are collapsed into cells first, so each IPF sweep costs
+    O(cells) instead of O(respondents). Each dimension is raked only over
+    the respondents who have a known value for it: their current weighted
+    total is redistributed by population share, while respondents with a
+    missing or unknown value pass through that dimension unchanged. Total
+    weight is preserved, so weights average 1.0 and weighted counts stay
+    comparable to raw counts. Only respondents unknown on every dimension
+    keep their base weight; per-dimension exclusions are reported in the summary.
+
+    base_weights (e.g. preview design weights) are the starting point: the
+    raking factor of a cell multiplies each respondent's base weight.
+    """
+    dimensions = tuple(d for d in RAKING_DIMENSIONS if d in margins)
+    base = {r['id']: base_weights.get(r['id'], 1.0) if base_weights else 1.0 for r in respondents}
+    if not dimensions:
+        return base, {'converged': True, 'iterations': 0, 'dimensions': []}
+
+    cell_counts, respondent_cells = _collapse_cells(respondents, dimensions, margins, base_weights)
+
+    # Population shares per dimension, restricted to the categories present in the sample
+    shares: Dict[str, Dict[str, float]] = {}
+    for axis, d in enumerate(dimensions):
+        observed = {cell[axis] for cell in cell_counts if cell[axis] is not None}
+        population = {k: v for k, v in margins[d].items() if k in observed}
+        population_total = sum(population.values())
+        shares[d] = {k: v / population_total for k, v in population.items()} if population_total else {}
+
+    cell_weights = dict(cell_counts)
+    converged = False
+    iteration = 0
+    for iteration in range(1, max_iterations + 1):
+        max_change = 0.0
+        for axis, d in enumerate(dimensions):
+            current: Dict[str, float] = defaultdict(float)
+            for cell, w in cell_weights.items():
+                if cell[axis] is not None:
+                    current[cell[axis]] += w
+            known_total = sum(current.values())
+            factors = {k: (shares[d][k] * known_total / v if v else 1.0) for k, v in current.items()}
+            for cell in cell_weights:
+                if cell[axis] is not None:
+                    cell_weights[cell] *= factors[cell[axis]]
+            max_change = max(max_change, max((abs(f - 1.0) for f in factors.values()), default=0.0))
+        if max_change < tolerance:
+            converged = True
+            break
+
+    # Per-respondent weight = base weight x raked cell total / base total of the cell
+    cell_factor = {cell: cell_weights[cell] / count if count else 1.0 for cell, count in cell_counts.items()}
+    weights = {r['id']: base[r['id']] * cell_factor[respondent_cells[r['id']]] for r in respondents}
+
+    missing = {d: sum(1 for r in respondents if respondent_cells[r['id']][axis] is None) for axis, d in enumerate(dimensions)}
+    unraked = sum(1 for r in respondents if all(value is None for value in respondent_cells[r['id']]))
+    total = sum(weights.values())
+    effective_n = (total ** 2 / sum(w * w for w in weights.values())) if weights else 0.0
+    summary = {
+        'converged': converged,
+        'iterations': iteration,
+        'dimensions': list(dimensions),
+        'cells': len(cell_counts),
+        'raked_respondents': len(respondents) - unraked,
+        'unraked_respondents': unraked,
+        'missing_by_dimension': missing,
+        'min_weight': round(min(weights.values()), 4) if weights else None,
+        'max_weight': round(max(weights.values()), 4) if weights else None,
+        'effective_sample_size': round(effective_n, 1),
+    }
+    return weights, summary
+
+def weighted_tally(pairs: Iterable[Tuple[str, Any]], weights: Optional[Dict[str, float]] = None) -> Dict[Any, float]:
+    """Count (respondent_id, key) pairs by key, summing respondent weights when provided"""
+    if weights is None:
+        return dict(Counter(key for _, key in pairs))
+    totals: Dict[Any, float] = defaultdict(float)
+    for respondent_id, key in pairs:
+        totals[key] += weights.get(respondent_id, 1.0)
+    return {k: round(v, 2) for k, v in totals.items()}